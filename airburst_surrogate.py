@@ -0,0 +1,174 @@
+"""
+Airburst Surrogate Table
+Precomputed atmospheric entry results with fast interpolated lookup
+
+simulate_atmospheric_entry_advanced her değerlendirmede çağrılamayacak kadar yavaştır.
+Bu modül simülatörü (çap, hız, açı, malzeme) ızgarası üzerinde bir kez çalıştırıp
+sonuçları sıkıştırılmış bir .npz dosyasına yazar; değerlendirme sırasında ise
+çok doğrusal interpolasyonla mikrosaniyeler içinde sonuç verir.
+
+Tablo oluşturma:
+    python airburst_surrogate.py build [--output data/airburst_surrogate.npz]
+"""
+
+import argparse
+import bisect
+import math
+import os
+import time
+
+import numpy as np
+
+DEFAULT_TABLE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'airburst_surrogate.npz')
+
+# Izgara eksenleri (çap logaritmik aralıklı)
+GRID_DIAMETERS_M = np.round(np.logspace(0, 4, 17), 3)        # 1 m - 10 km
+GRID_VELOCITIES_MS = np.array([11000, 15000, 20000, 25000, 30000, 40000, 55000, 72000], dtype=float)
+GRID_ANGLES_DEG = np.arange(10, 91, 10, dtype=float)          # 10° - 90°
+GRID_MATERIALS = ('chondrite', 'iron', 'cometary')
+
+FIELDS = ('airburst_altitude_km', 'energy_fraction', 'ground_mass_fraction')
+
+
+def material_for_density(density_kg_m3):
+    """Yoğunluktan malzeme tipi (frontend ile aynı eşikler)."""
+    if density_kg_m3 > 6000:
+        return 'iron'
+    if density_kg_m3 < 1500:
+        return 'cometary'
+    return 'chondrite'
+
+
+def summarize_entry(results):
+    """Simülasyon çıktısından tabloda saklanan büyüklükleri çıkar."""
+    initial = results['initial_conditions']
+    key = results['key_results']
+    final = results['final_state']
+
+    initial_energy = 0.5 * initial['initial_mass_kg'] * initial['velocity_ms'] ** 2
+    airburst_altitude_km = key.get('peak_deposition_altitude_km')
+    if airburst_altitude_km is None:
+        airburst_altitude_km = key['airburst_altitude_km']
+
+    # Yere ulaşan kütle: yüzeye inen veya karanlık uçuşa geçen (v < 100 m/s) cisim
+    if 'fragment_cloud' in results:
+        ground_mass = results['fragment_cloud']['mass_at_ground_kg']
+    elif final['altitude_km'] <= 0 or final['velocity_ms'] < 100:
+        ground_mass = final['mass_kg']
+    else:
+        ground_mass = 0.0
+
+    return {
+        'airburst_altitude_km': max(0.0, airburst_altitude_km),
+        'energy_fraction': key['total_energy_deposited_joules'] / initial_energy if initial_energy > 0 else 0.0,
+        'ground_mass_fraction': ground_mass / initial['initial_mass_kg'] if initial['initial_mass_kg'] > 0 else 0.0
+    }
+
+
+def build_table(simulate, output_path=DEFAULT_TABLE_PATH, dt=0.01, verbose=True):
+    """
+    Simülatörü tüm ızgara üzerinde çalıştır ve tabloyu kaydet.
+
+    Args:
+        simulate: simulate_atmospheric_entry_advanced ile aynı imzaya sahip fonksiyon
+    """
+    shape = (len(GRID_MATERIALS), len(GRID_DIAMETERS_M), len(GRID_VELOCITIES_MS), len(GRID_ANGLES_DEG))
+    tables = {field: np.zeros(shape, dtype=np.float32) for field in FIELDS}
+
+    started = time.perf_counter()
+    for m, material in enumerate(GRID_MATERIALS):
+        for d, diameter in enumerate(GRID_DIAMETERS_M):
+            for v, velocity in enumerate(GRID_VELOCITIES_MS):
+                for a, angle in enumerate(GRID_ANGLES_DEG):
+                    results = simulate(
+                        diameter_m=float(diameter), velocity_ms=float(velocity),
+                        entry_angle_deg=float(angle), material_type=material,
+                        fragmentation_model='pancake', dt=dt, record_history=False
+                    )
+                    summary = summarize_entry(results)
+                    for field in FIELDS:
+                        tables[field][m, d, v, a] = summary[field]
+            if verbose:
+                print(f"  {material:10s} d={diameter:>9.1f} m  ({time.perf_counter() - started:.0f} s)")
+
+    np.savez_compressed(
+        output_path,
+        materials=np.array(GRID_MATERIALS),
+        diameter_m=GRID_DIAMETERS_M,
+        velocity_ms=GRID_VELOCITIES_MS,
+        angle_deg=GRID_ANGLES_DEG,
+        dt=np.array(dt),
+        **tables
+    )
+    return output_path
+
+
+class AirburstSurrogate:
+    """Tablo üzerinde (log çap, hız, açı) için üç doğrusal interpolasyon."""
+
+    def __init__(self, materials, diameter_m, velocity_ms, angle_deg, tables):
+        self.materials = {name: i for i, name in enumerate(materials)}
+        self.log_diameters = [math.log10(d) for d in diameter_m]
+        self.velocities = [float(v) for v in velocity_ms]
+        self.angles = [float(a) for a in angle_deg]
+        # (alan, malzeme, çap, hız, açı) -> tek dizi; indeksleme düz Python listesi ile hızlı
+        self.values = np.stack([tables[field] for field in FIELDS]).astype(float)
+
+    @classmethod
+    def load(cls, path=DEFAULT_TABLE_PATH):
+        with np.load(path, allow_pickle=False) as data:
+            return cls(
+                [str(m) for m in data['materials']],
+                data['diameter_m'], data['velocity_ms'], data['angle_deg'],
+                {field: data[field] for field in FIELDS}
+            )
+
+    @staticmethod
+    def _locate(axis, value):
+        """Eksende (alt indeks, ağırlık) - aralık dışıysa None."""
+        if value < axis[0] or value > axis[-1]:
+            return None
+        i = min(bisect.bisect_right(axis, value) - 1, len(axis) - 2)
+        return i, (value - axis[i]) / (axis[i + 1] - axis[i])
+
+    def lookup(self, diameter_m, velocity_ms, angle_deg, material='chondrite'):
+        """
+        İnterpolasyonlu giriş sonuçları; tablo aralığı dışında None döner.
+        """
+        m = self.materials.get(material)
+        if m is None or diameter_m <= 0:
+            return None
+        located = [
+            self._locate(self.log_diameters, math.log10(diameter_m)),
+            self._locate(self.velocities, velocity_ms),
+            self._locate(self.angles, angle_deg)
+        ]
+        if any(loc is None for loc in located):
+            return None
+        (i, wi), (j, wj), (k, wk) = located
+
+        cube = self.values[:, m, i:i + 2, j:j + 2, k:k + 2]
+        weights_i = np.array([1 - wi, wi])
+        weights_j = np.array([1 - wj, wj])
+        weights_k = np.array([1 - wk, wk])
+        interpolated = np.einsum('fijk,i,j,k->f', cube, weights_i, weights_j, weights_k)
+        return dict(zip(FIELDS, (float(value) for value in interpolated)))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Airburst surrogate table builder')
+    parser.add_argument('command', choices=['build'])
+    parser.add_argument('--output', default=DEFAULT_TABLE_PATH)
+    parser.add_argument('--dt', type=float, default=0.01)
+    args = parser.parse_args()
+
+    from app import simulate_atmospheric_entry_advanced
+
+    started = time.perf_counter()
+    path = build_table(simulate_atmospheric_entry_advanced, args.output, dt=args.dt)
+    print(f"Surrogate table written to {path} ({os.path.getsize(path) / 1024:.1f} KiB, "
+          f"{time.perf_counter() - started:.0f} s)")
+
+
+if __name__ == '__main__':
+    main()
@@ -5,24 +5,106 @@ NASA Space Apps Challenge 2025
 
 from flask import Flask, render_template, jsonify, request
 from flask_cors import CORS
-import requests
 import random
 import math
 import os
+import time
+import threading
+from functools import lru_cache
+from types import MappingProxyType
 from datetime import datetime, timedelta
 import numpy as np
 
-from data import SOLAR_SYSTEM_ASTEROIDS, COMETS, CHICXULUB_IMPACTOR, MAJOR_CITIES_POPULATION
+from data import (
+    SOLAR_SYSTEM_ASTEROIDS, COMETS, MAJOR_CITIES_POPULATION,
+    DENSITY_CLASSES, RANKABLE_FIELDS, get_catalog
+)
+from logging_config import configure_logging
+from response_encoding import configure_response_encoding, negotiated_response, PrecomputedResponse
+from traffic_capture import configure_traffic_capture
+from airburst_surrogate import AirburstSurrogate, material_for_density, summarize_entry
+from tsunami_engine import TsunamiEngine
+from coastal_segments import CoastalSegmentIndex
+from contours import marching_squares, rings_to_polygons, simplify_to_budget
+from geodesy import haversine_km, destination_points, nearest, wrap_lng
+from grid_pool import band_count, even_bands, map_tasks, pool_enabled_for
+from single_flight import SharedFlightError, SingleFlight
+from stage_cache import byte_bounded_cache
+from upstream_budget import (
+    BudgetExhausted, GEONAMES_LIMIT_CODES, GEONAMES_NO_RESULT_CODE, UpstreamQuotaError, configure_budget
+)
+from hazard_tiles import (
+    FIELD_STYLES, TileCache, classify, empty_tile, encode_indexed_png,
+    scenario_hash, tile_bounds, tile_pixel_centers, valid_tile
+)
 
 app = Flask(__name__)
 CORS(app)
+logger = configure_logging(app)
+configure_traffic_capture(app)  # Sıkıştırmadan önce: after_request ters sırada, son yanıtı görür
+configure_response_encoding(app)
 
 app.config['JSON_AS_ASCII'] = False
 app.config['JSON_SORT_KEYS'] = False
 
 NASA_API_KEY = os.environ.get('NASA_API_KEY', 'DEMO_KEY')
-NASA_NEO_API_URL = 'https://api.nasa.gov/neo/rest/v1'
+NASA_NEO_API_URL = os.environ.get('NASA_NEO_API_URL', 'https://api.nasa.gov/neo/rest/v1').rstrip('/')
 GEONAMES_USERNAME = os.environ.get('GEONAMES_USERNAME', 'demo')
+GEONAMES_API_URL = os.environ.get('GEONAMES_API_URL', 'http://api.geonames.org').rstrip('/')
+
+_http_session = None
+
+
+def get_http_session():
+    """
+    Dış API'ler (NASA, GeoNames) için paylaşılan HTTP oturumu.
+    
+    requests (+ certifi) modülünün yüklenmesi ~60 ms sürer ve yalnızca canlı veri
+    isteklerinde gerekir; bu yüzden ilk çağrıda yüklenir. Oturum bağlantıları yeniden kullanır.
+    """
+    global _http_session
+    if _http_session is None:
+        import requests
+        _http_session = requests.Session()
+    return _http_session
+
+
+_single_flight = SingleFlight()
+_upstream_budget = configure_budget(NASA_API_KEY, GEONAMES_USERNAME)
+
+
+def fetch_json(url, timeout, upstream):
+    """
+    Dış API'den JSON (HTTP hatasında istisna).
+    
+    Aynı URL'ye eşzamanlı istekler tek çağrıda birleştirilir (worker'lar arası dahil); hepsi
+    aynı yanıtı veya hatayı alır. Servisin ('nasa', 'geonames') bütçesi tükenmişse çağrı
+    yapılmadan BudgetExhausted fırlatılır; kota hataları bütçeyi boşaltır.
+    """
+    def fetch():
+        _upstream_budget.acquire(upstream)
+        response = get_http_session().get(url, timeout=timeout)
+        _upstream_budget.observe(upstream, response.status_code, response.headers)
+        response.raise_for_status()
+        data = response.json()
+        # GeoNames hataları HTTP 200 ile {'status': {'message', 'value'}} olarak döner;
+        # 15 (sonuç yok) bir hata değildir - ör. oceanJSON kara noktaları için bunu döndürür
+        status = data.get('status') if upstream == 'geonames' and isinstance(data, dict) else None
+        if status and status.get('value') != GEONAMES_NO_RESULT_CODE:
+            if status.get('value') in GEONAMES_LIMIT_CODES:
+                _upstream_budget.exhausted(upstream)
+            raise UpstreamQuotaError(f"GeoNames: {status.get('message', 'error')}")
+        return data
+    return _single_flight.do('http', url, fetch)
+
+
+def upstream_budget_report():
+    return _upstream_budget.report()
+
+
+def single_flight_info():
+    return _single_flight.info()
+
 
 @app.route('/api/get_asteroid_data', methods=['GET'])
 def get_asteroid_data():
@@ -42,22 +124,44 @@ def get_asteroid_data():
                     if live_data:
                         return jsonify({'success': True, 'asteroid': live_data, 'source': 'NASA API (Live)'})
                 
-                # Return database data
-                return jsonify({'success': True, 'asteroid': asteroid_data, 'source': 'Database'})
+                # Return database data (precomputed, ETag/304)
+                return asteroid_database_response('solar', asteroid_key)
         
         elif source == 'comets':
             object_key = request.args.get('object', 'halley')
             if object_key in COMETS:
-                return jsonify({'success': True, 'asteroid': COMETS[object_key], 'source': 'Database'})
+                return asteroid_database_response('comets', object_key)
         
         elif source == 'chicxulub':
-            return jsonify({'success': True, 'asteroid': CHICXULUB_IMPACTOR, 'source': 'Database'})
+            return asteroid_database_response('chicxulub')
         
-        return jsonify({'success': True, 'asteroid': get_sample_asteroid_data()})
+        return asteroid_database_response('sample')
     
     except Exception as e:
         return jsonify({'success': False, 'error': str(e), 'asteroid': get_sample_asteroid_data()}), 200
 
+def asteroid_database_payload(source, object_key=None):
+    """
+    Veritabanından dönen get_asteroid_data yükü (deploy'lar arasında değişmez).
+    Katalog kayıtları türetilmiş büyüklükleri (kütle, enerji, TNT) de içerir.
+    """
+    catalog = get_catalog()
+    if source == 'solar':
+        return {'success': True, 'asteroid': catalog.get('asteroid', object_key).to_dict(), 'source': 'Database'}
+    if source == 'comets':
+        return {'success': True, 'asteroid': catalog.get('comet', object_key).to_dict(), 'source': 'Database'}
+    if source == 'chicxulub':
+        return {'success': True, 'asteroid': catalog.get('impactor', 'chicxulub').to_dict(), 'source': 'Database'}
+    return {'success': True, 'asteroid': get_sample_asteroid_data()}
+
+
+def asteroid_database_response(source, object_key=None):
+    return precomputed_response(
+        ('asteroid', source, object_key),
+        lambda: asteroid_database_payload(source, object_key)
+    )
+
+
 def try_fetch_live_data_for_asteroid(db_asteroid):
     """Try to fetch live data from NASA API for a known asteroid."""
     try:
@@ -69,11 +173,10 @@ def try_fetch_live_data_for_asteroid(db_asteroid):
         if asteroid_id:
             try:
                 url = f"{NASA_NEO_API_URL}/neo/{asteroid_id}?api_key={NASA_API_KEY}"
-                response = requests.get(url, timeout=5)
-                if response.status_code == 200:
-                    data = response.json()
+                data = fetch_json(url, timeout=5, upstream='nasa')
+                if data:
                     parsed = parse_asteroid_data(data)
-                    print(f"[API] Found live data for {asteroid_name}")
+                    logger.info("NASA API live data found", extra={'fields': {'asteroid': asteroid_name}})
                     return parsed
             except:
                 pass
@@ -83,37 +186,39 @@ def try_fetch_live_data_for_asteroid(db_asteroid):
         start_date = end_date - timedelta(days=7)
         
         url = f"{NASA_NEO_API_URL}/feed?start_date={start_date.strftime('%Y-%m-%d')}&end_date={end_date.strftime('%Y-%m-%d')}&api_key={NASA_API_KEY}"
-        response = requests.get(url, timeout=10)
-        response.raise_for_status()
-        data = response.json()
+        data = fetch_json(url, timeout=10, upstream='nasa')
         
         # Search for matching asteroid in feed
         for date_key in data.get('near_earth_objects', {}):
             for asteroid in data['near_earth_objects'][date_key]:
                 if asteroid.get('id') == asteroid_id or asteroid.get('name', '').lower() in asteroid_name.lower():
                     parsed = parse_asteroid_data(asteroid)
-                    print(f"[API] Found {asteroid_name} in recent feed")
+                    logger.info("NASA API asteroid found in recent feed", extra={'fields': {'asteroid': asteroid_name}})
                     return parsed
         
-        print(f"[API] No live data found for {asteroid_name}, using database")
+        logger.info("NASA API no live data, using database", extra={'fields': {'asteroid': asteroid_name}})
+        return None
+    
+    except BudgetExhausted:
+        logger.info("NASA API budget exhausted, using database", extra={'fields': {'asteroid': asteroid_name}})
         return None
         
     except Exception as e:
-        print(f"[API] Error fetching live data: {e}")
+        logger.warning("NASA API live data error", extra={'fields': {'error': str(e)}})
         return None
 
 
 def fetch_from_nasa_api():
     """Fetch real-time data from NASA NeoWs API."""
+    from requests.exceptions import RequestException
+    
     try:
         end_date = datetime.now()
         start_date = end_date - timedelta(days=7)
         
         url = f"{NASA_NEO_API_URL}/feed?start_date={start_date.strftime('%Y-%m-%d')}&end_date={end_date.strftime('%Y-%m-%d')}&api_key={NASA_API_KEY}"
         
-        response = requests.get(url, timeout=10)
-        response.raise_for_status()
-        data = response.json()
+        data = fetch_json(url, timeout=10, upstream='nasa')
         
         all_asteroids = []
         for date_key in data.get('near_earth_objects', {}):
@@ -125,8 +230,8 @@ def fetch_from_nasa_api():
         
         return jsonify({'success': False, 'error': 'No asteroids found', 'asteroid': get_sample_asteroid_data()})
     
-    except requests.exceptions.RequestException as e:
-        print(f"NASA API Error: {e}")
+    except (RequestException, BudgetExhausted, SharedFlightError) as e:
+        logger.warning("NASA API error", extra={'fields': {'error': str(e)}})
         return jsonify({'success': False, 'error': f'API Error: {str(e)}', 'asteroid': get_sample_asteroid_data()}), 200
 
 
@@ -155,7 +260,7 @@ def parse_asteroid_data(asteroid_data):
             'miss_distance_km': float(close_approach.get('miss_distance', {}).get('kilometers', 1000000))
         }
     except Exception as e:
-        print(f"Parse error: {e}")
+        logger.warning("NASA API parse error", extra={'fields': {'error': str(e)}})
         return get_sample_asteroid_data()
 
 def get_sample_asteroid_data():
@@ -253,15 +358,25 @@ class AsteroidMaterial:
     def get_cometary():
         return AsteroidMaterial("Cometary", 1000, 2e3, 2e6, 0.95, 0.75)
     
+    _registry = None
+    
+    @staticmethod
+    def get_registry():
+        """Malzeme tablosunu bir kez oluştur (simülasyonlar malzemeyi değiştirmez)."""
+        if AsteroidMaterial._registry is None:
+            chondrite = AsteroidMaterial.get_chondrite()
+            AsteroidMaterial._registry = MappingProxyType({
+                'chondrite': chondrite,
+                'stony': chondrite,
+                'iron': AsteroidMaterial.get_iron(),
+                'cometary': AsteroidMaterial.get_cometary()
+            })
+        return AsteroidMaterial._registry
+    
     @staticmethod
     def get_material_by_name(name):
-        materials = {
-            'chondrite': AsteroidMaterial.get_chondrite(),
-            'stony': AsteroidMaterial.get_chondrite(),
-            'iron': AsteroidMaterial.get_iron(),
-            'cometary': AsteroidMaterial.get_cometary()
-        }
-        return materials.get(name.lower(), AsteroidMaterial.get_chondrite())
+        materials = AsteroidMaterial.get_registry()
+        return materials.get(name.lower(), materials['chondrite'])
 
 
 class AtmosphereModel:
@@ -282,6 +397,17 @@ class AtmosphereModel:
         rho_a = rho_0 * math.exp(-altitude_m / H)
         return max(rho_a, 1e-10)
     
+    @staticmethod
+    def density_array(altitude_m):
+        """density() ile aynı model, irtifa dizisi üzerinde vektörel."""
+        altitude_m = np.asarray(altitude_m, dtype=float)
+        H = np.select(
+            [altitude_m < 11000, altitude_m < 25000, altitude_m < 50000],
+            [8500.0, 6000.0, 7500.0],
+            default=9000.0
+        )
+        return np.maximum(1.225 * np.exp(-altitude_m / H), 1e-10)
+    
     @staticmethod
     def speed_of_sound(altitude_m):
         if altitude_m < 11000:
@@ -317,11 +443,210 @@ class FragmentationModel:
         return [fragment_mass] * num_fragments
 
 
+class DepositionProfile:
+    """
+    İrtifa bölmelerine göre enerji birikimi (dE/dh) - entegrasyon sırasında doldurulur.
+    
+    Hava patlaması hasarı için asıl önemli büyüklük km başına biriken enerjidir;
+    zaman serisini saklamadan profil doğrudan biriktirilir.
+    """
+    def __init__(self, max_altitude_m, bin_size_km=1.0):
+        self.bin_size_m = bin_size_km * 1000
+        self.num_bins = max(1, int(math.ceil(max_altitude_m / self.bin_size_m)))
+        self.energy = np.zeros(self.num_bins)
+    
+    def _bin(self, altitude_m):
+        return min(self.num_bins - 1, max(0, int(altitude_m // self.bin_size_m)))
+    
+    def add(self, altitude_m, energy_joules):
+        self.energy[self._bin(altitude_m)] += energy_joules
+    
+    def add_array(self, altitude_m, energy_joules):
+        bins = np.clip((altitude_m // self.bin_size_m).astype(int), 0, self.num_bins - 1)
+        self.energy += np.bincount(bins, weights=energy_joules, minlength=self.num_bins)
+    
+    def peak(self):
+        """Tepe biriktirme irtifası (m) - en yüksek bölme etrafında parabolik interpolasyon."""
+        i = int(np.argmax(self.energy))
+        if self.energy[i] <= 0:
+            return None, 0.0
+        altitude_m = (i + 0.5) * self.bin_size_m
+        if 0 < i < self.num_bins - 1:
+            a, b, c = self.energy[i - 1], self.energy[i], self.energy[i + 1]
+            denominator = a - 2 * b + c
+            if denominator < 0:
+                altitude_m += 0.5 * (a - c) / denominator * self.bin_size_m
+        return altitude_m, self.energy[i] / (self.bin_size_m / 1000)
+    
+    def to_dict(self):
+        bin_size_km = self.bin_size_m / 1000
+        energy_per_km = self.energy / bin_size_km
+        peak_altitude_m, peak_energy_per_km = self.peak()
+        return {
+            'bin_size_km': bin_size_km,
+            'altitude_km': ((np.arange(self.num_bins) + 0.5) * bin_size_km).tolist(),
+            'energy_per_km_joules': energy_per_km.tolist(),
+            'energy_per_km_kt': (energy_per_km / 4.184e12).tolist(),
+            'peak_deposition_altitude_km': float(peak_altitude_m) / 1000 if peak_altitude_m is not None else None,
+            'peak_energy_per_km_kt': float(peak_energy_per_km) / 4.184e12
+        }
+
+
+class FragmentCloud:
+    """
+    Discrete parçalanma sonrası parça bulutu - her parça ayrı bir cisim olarak izlenir.
+    
+    Durum, parça başına Python nesnesi yerine sütun dizilerinde (x, y, vx, vy, kütle,
+    yarıçap, mukavemet) tutulur; her adım tüm parçalar için tek seferde hesaplanır.
+    Parçalar dinamik basınç mukavemetlerini aştığında yeniden bölünür. Küçük parçalar
+    daha dayanıklıdır (Weibull ölçeklemesi: σ_f = σ_p * (m_p / m_f)^α).
+    """
+    WEIBULL_ALPHA = 0.25
+    
+    def __init__(self, x, y, vx, vy, masses, strength, material,
+                 refragment_count=2, max_fragments=1000, min_fragment_mass_kg=1.0):
+        n = len(masses)
+        self.material = material
+        self.x = np.full(n, float(x))
+        self.y = np.full(n, float(y))
+        self.vx = np.full(n, float(vx))
+        self.vy = np.full(n, float(vy))
+        self.mass = np.asarray(masses, dtype=float)
+        self.radius = self._radius_from_mass(self.mass)
+        self.strength = np.full(n, float(strength))
+        self.refragment_count = max(2, int(refragment_count))
+        self.max_fragments = max(n, int(max_fragments))
+        self.min_fragment_mass_kg = min_fragment_mass_kg
+        
+        self.fragmentation_events = 1
+        self.max_fragment_count = n
+        # Yere ulaşan (veya karanlık uçuşa geçen) parçalar: [mass_kg, velocity_ms, downrange_km, time_s]
+        self.arrivals = []
+        self.ablated_count = 0
+    
+    @classmethod
+    def from_body(cls, x, y, vx, vy, mass, material, num_fragments=10, **kwargs):
+        """Tek cismi FragmentationModel.discrete_fragmentation ile eşit parçalara ayır."""
+        masses = FragmentationModel.discrete_fragmentation(mass, num_fragments)
+        strength = material.tensile_strength * num_fragments ** cls.WEIBULL_ALPHA
+        return cls(x, y, vx, vy, masses, strength, material, **kwargs)
+    
+    def _radius_from_mass(self, mass):
+        return np.cbrt((3 * mass) / (4 * math.pi * self.material.density))
+    
+    @property
+    def count(self):
+        return len(self.mass)
+    
+    def _keep(self, mask):
+        for name in ('x', 'y', 'vx', 'vy', 'mass', 'radius', 'strength'):
+            setattr(self, name, getattr(self, name)[mask])
+    
+    def _split(self, idx):
+        """idx parçalarını refragment_count eşit parçaya böl (kapasite sınırına kadar)."""
+        k = self.refragment_count
+        room = (self.max_fragments - self.count) // (k - 1)
+        if room <= 0:
+            return
+        idx = idx[:room]
+        counts = np.ones(self.count, dtype=int)
+        counts[idx] = k
+        self.mass = np.repeat(self.mass / counts, counts)
+        self.strength = np.repeat(self.strength * counts ** self.WEIBULL_ALPHA, counts)
+        for name in ('x', 'y', 'vx', 'vy'):
+            setattr(self, name, np.repeat(getattr(self, name), counts))
+        self.radius = self._radius_from_mass(self.mass)
+        self.fragmentation_events += len(idx)
+        self.max_fragment_count = max(self.max_fragment_count, self.count)
+    
+    def step(self, dt, t, Gamma, Lambda, Zeta, Tau, deposition_profile=None):
+        """
+        Tüm parçaları bir Euler adımı ilerlet (tekli cisim döngüsüyle aynı denklemler).
+        deposition_profile verilirse parça enerjileri irtifa bölmelerine eklenir.
+        
+        Returns:
+            (toplam ışıma W, biriken enerji J, maks. dinamik basınç Pa, ışıma ağırlıklı irtifa m)
+        """
+        velocity = np.hypot(self.vx, self.vy)
+        rho_a = AtmosphereModel.density_array(self.y)
+        dynamic_pressure = 0.5 * rho_a * velocity ** 2
+        
+        # Yeniden parçalanma
+        breaking = np.flatnonzero(
+            (dynamic_pressure > self.strength) &
+            (self.mass / self.refragment_count >= self.min_fragment_mass_kg)
+        )
+        if len(breaking):
+            self._split(breaking[np.argsort(-dynamic_pressure[breaking])])
+            velocity = np.hypot(self.vx, self.vy)
+            rho_a = AtmosphereModel.density_array(self.y)
+            dynamic_pressure = 0.5 * rho_a * velocity ** 2
+        
+        A = math.pi * self.radius ** 2
+        drag_force = Gamma * A * rho_a * velocity ** 2
+        dm_dt = -(Lambda * A * rho_a * velocity ** 3) / (2 * Zeta)
+        luminosity = -0.5 * Tau * dm_dt * velocity ** 2
+        energy = 0.5 * np.abs(dm_dt) * dt * velocity ** 2
+        if deposition_profile is not None:
+            deposition_profile.add_array(self.y, energy)
+        
+        total_luminosity = float(luminosity.sum())
+        luminous_altitude = float((luminosity * self.y).sum() / total_luminosity) if total_luminosity > 0 else float(self.y.mean())
+        
+        ax = -drag_force * self.vx / (self.mass * velocity)
+        ay = -drag_force * self.vy / (self.mass * velocity) - 9.81
+        self.x = self.x + self.vx * dt
+        self.y = self.y + self.vy * dt
+        self.vx = self.vx + ax * dt
+        self.vy = self.vy + ay * dt
+        self.mass = np.maximum(self.mass + dm_dt * dt, 0)
+        self.radius = self._radius_from_mass(self.mass)
+        
+        # Biten parçaları ayır: yere ulaşan / yavaşlayan (karanlık uçuş) / tamamen ablasyona uğrayan
+        speed = np.hypot(self.vx, self.vy)
+        ablated = self.mass <= 0
+        landed = ~ablated & ((self.y <= 0) | (speed < 100))
+        if landed.any():
+            self.arrivals.extend(np.column_stack([
+                self.mass[landed], speed[landed], self.x[landed] / 1000,
+                np.full(int(landed.sum()), t + dt)
+            ]).tolist())
+        self.ablated_count += int(ablated.sum())
+        if ablated.any() or landed.any():
+            self._keep(~(ablated | landed))
+        
+        return total_luminosity, float(energy.sum()), float(dynamic_pressure.max()), luminous_altitude
+    
+    def summary(self):
+        arrivals = sorted(self.arrivals, key=lambda a: -a[0])
+        return {
+            'fragments_in_flight': self.count,
+            'max_fragment_count': self.max_fragment_count,
+            'fragmentation_events': self.fragmentation_events,
+            'fragments_ablated': self.ablated_count,
+            'fragments_arrived': len(arrivals),
+            'mass_at_ground_kg': sum(a[0] for a in arrivals),
+            'ground_arrivals': [
+                {'mass_kg': a[0], 'velocity_ms': a[1], 'downrange_km': a[2], 'time_s': a[3]}
+                for a in arrivals
+            ]
+        }
+
+
 def simulate_atmospheric_entry_advanced(
     diameter_m, velocity_ms, entry_angle_deg, material_type='chondrite',
-    initial_altitude_m=100000, fragmentation_model='pancake', dt=0.01, max_time=300
+    initial_altitude_m=100000, fragmentation_model='pancake', dt=0.01, max_time=300,
+    max_fragments=1000, deposition_bin_km=1.0, record_history=True
 ):
-    """Advanced atmospheric entry simulation with numerical integration."""
+    """
+    Advanced atmospheric entry simulation with numerical integration.
+    
+    fragmentation_model='discrete' ile ilk parçalanmadan sonra her parça FragmentCloud
+    içinde ayrı bir cisim olarak izlenir (en fazla max_fragments parça).
+    
+    Enerji birikimi her zaman deposition_bin_km'lik irtifa bölmelerinde toplanır;
+    record_history=False ile zaman serisi hiç tutulmaz (yalnızca profil ve özet döner).
+    """
     material = AsteroidMaterial.get_material_by_name(material_type)
     
     t = 0.0
@@ -338,7 +663,7 @@ def simulate_atmospheric_entry_advanced(
     y = altitude
     
     fragmented = False
-    fragments = []
+    cloud = None
     
     history = {
         'time': [], 'altitude': [], 'velocity': [], 'mass': [], 'radius': [],
@@ -350,6 +675,7 @@ def simulate_atmospheric_entry_advanced(
     Zeta = material.ablation_heat
     Tau = 0.1
     
+    deposition_profile = DepositionProfile(initial_altitude_m, deposition_bin_km)
     total_energy_deposited = 0.0
     peak_luminosity = 0.0
     airburst_altitude = None
@@ -380,12 +706,11 @@ def simulate_atmospheric_entry_advanced(
                     radius = FragmentationModel.pancake_model(radius, velocity, y, dt)
                     A = math.pi * (radius ** 2)
                 elif fragmentation_model == 'discrete':
-                    # Discrete: Parçalara ayrıl (basitleştirilmiş - ana cismi takip et)
-                    fragments = FragmentationModel.discrete_fragmentation(mass, 10)
-                    # Sadece en büyük parçayı takip et (basitleştirme)
-                    mass = max(fragments)
-                    radius = ((3 * mass) / (4 * math.pi * material.density)) ** (1/3)
-                    A = math.pi * (radius ** 2)
+                    # Discrete: Parçalara ayrıl - her parça bulutta ayrı izlenir
+                    cloud = FragmentCloud.from_body(
+                        x, y, vx, vy, mass, material, num_fragments=10, max_fragments=max_fragments
+                    )
+                    break
         
         # Denklem 1: Aerodinamik yavaşlama (dv/dt)
         # dv/dt = -(Gamma * A * rho_a * v²) / m
@@ -408,6 +733,7 @@ def simulate_atmospheric_entry_advanced(
         # Enerji biriktirme
         energy_deposited_step = 0.5 * abs(dm_dt) * dt * (velocity ** 2)
         total_energy_deposited += energy_deposited_step
+        deposition_profile.add(y, energy_deposited_step)
         
         # Dinamik basınç
         dynamic_pressure = 0.5 * rho_a * (velocity ** 2)
@@ -442,22 +768,63 @@ def simulate_atmospheric_entry_advanced(
         velocity = velocity_new
         
         # Kaydet
-        history['time'].append(t)
-        history['altitude'].append(y / 1000)  # km
-        history['velocity'].append(velocity / 1000)  # km/s
-        history['mass'].append(mass / 1000)  # ton
-        history['radius'].append(radius)  # m
-        history['luminosity'].append(luminosity)  # Watt
-        history['dynamic_pressure'].append(dynamic_pressure / 1e6)  # MPa
-        history['deposition_energy'].append(total_energy_deposited)
+        if record_history:
+            history['time'].append(t)
+            history['altitude'].append(y / 1000)  # km
+            history['velocity'].append(velocity / 1000)  # km/s
+            history['mass'].append(mass / 1000)  # ton
+            history['radius'].append(radius)  # m
+            history['luminosity'].append(luminosity)  # Watt
+            history['dynamic_pressure'].append(dynamic_pressure / 1e6)  # MPa
+            history['deposition_energy'].append(total_energy_deposited)
+        
+        t += dt
+        steps += 1
+    
+    # Parça bulutu: tüm parçalar yere ulaşana / yanana kadar vektörel entegrasyon
+    while cloud is not None and cloud.count > 0 and steps < max_steps:
+        luminosity, energy_step, dynamic_pressure, luminous_altitude = cloud.step(
+            dt, t, Gamma, Lambda, Zeta, Tau, deposition_profile
+        )
+        
+        if luminosity > peak_luminosity:
+            peak_luminosity = luminosity
+            airburst_altitude = luminous_altitude / 1000  # km
+        
+        total_energy_deposited += energy_step
+        max_dynamic_pressure = max(max_dynamic_pressure, dynamic_pressure)
+        
+        if cloud.count > 0:
+            # Kütle ağırlıklı bulut durumu
+            total_mass = cloud.mass.sum()
+            weights = cloud.mass / total_mass if total_mass > 0 else None
+            y = float(np.average(cloud.y, weights=weights))
+            velocity = float(np.average(np.hypot(cloud.vx, cloud.vy), weights=weights))
+            mass = float(total_mass)
+            radius = float(cloud.radius.max())
+        else:
+            y = 0.0
+            mass = sum(a[0] for a in cloud.arrivals)
+            radius = 0.0
+        
+        if record_history:
+            history['time'].append(t)
+            history['altitude'].append(y / 1000)  # km
+            history['velocity'].append(velocity / 1000)  # km/s
+            history['mass'].append(mass / 1000)  # ton
+            history['radius'].append(radius)  # m
+            history['luminosity'].append(luminosity)  # Watt
+            history['dynamic_pressure'].append(dynamic_pressure / 1e6)  # MPa
+            history['deposition_energy'].append(total_energy_deposited)
         
         t += dt
         steps += 1
     
     # TNT eşdeğeri (kiloton)
     tnt_equivalent_kt = total_energy_deposited / (4.184 * 10**12)
+    deposition = deposition_profile.to_dict()
     
-    return {
+    results = {
         'success': True,
         'initial_conditions': {
             'diameter_m': diameter_m,
@@ -479,10 +846,11 @@ def simulate_atmospheric_entry_advanced(
             'total_energy_deposited_joules': total_energy_deposited,
             'tnt_equivalent_kilotons': tnt_equivalent_kt,
             'max_dynamic_pressure_mpa': max_dynamic_pressure / 1e6,
+            'peak_deposition_altitude_km': deposition['peak_deposition_altitude_km'],
             'fragmented': fragmented,
             'fragmentation_model': fragmentation_model if fragmented else 'none'
         },
-        'time_series': history,
+        'energy_deposition_profile': deposition,
         'material_properties': {
             'density': material.density,
             'tensile_strength_mpa': material.tensile_strength / 1e6,
@@ -490,6 +858,13 @@ def simulate_atmospheric_entry_advanced(
             'emissivity': material.emissivity
         }
     }
+    
+    if record_history:
+        results['time_series'] = history
+    if cloud is not None:
+        results['fragment_cloud'] = cloud.summary()
+    
+    return results
 
 
 def calculate_kinetic_energy(diameter_m, density_kg_m3, velocity_ms):
@@ -512,65 +887,68 @@ def calculate_kinetic_energy(diameter_m, density_kg_m3, velocity_ms):
     }
 
 
-def determine_airburst_altitude(diameter_m, density_kg_m3, velocity_ms, angle_deg):
+_airburst_surrogate = None
+_airburst_surrogate_loaded = False
+
+
+def get_airburst_surrogate():
+    """Önceden hesaplanmış giriş tablosu (yoksa None - canlı simülasyona düşülür)."""
+    global _airburst_surrogate, _airburst_surrogate_loaded
+    if not _airburst_surrogate_loaded:
+        _airburst_surrogate_loaded = True
+        try:
+            _airburst_surrogate = AirburstSurrogate.load()
+        except (OSError, KeyError, ValueError) as e:
+            logger.warning("Airburst surrogate table unavailable", extra={'fields': {'error': str(e)}})
+    return _airburst_surrogate
+
+
+def estimate_entry_outcome(diameter_m, density_kg_m3, velocity_ms, angle_deg):
     """
-    Adım 1.2: Havada infilak irtifasını belirle
-    Küçük ve orta boyutlu asteroidler için atmosferde en yüksek enerji salımı irtifası
+    Adım 1.2 (simülasyon kalitesinde): Havada infilak irtifası, biriken enerji oranı ve
+    yere ulaşan kütle oranı.
+    
+    Önce önceden hesaplanmış tabloya bakılır; tablo aralığı dışındaki girdiler için
+    simulate_atmospheric_entry_advanced canlı çalıştırılır.
     """
-    # Giriş açısı faktörü
-    angle_rad = math.radians(angle_deg)
-    sin_angle = math.sin(angle_rad)
-    
-    # Ablasyon parametresi (yoğunluğa bağlı)
-    # Taşlı: yüksek yoğunluk, daha düşük irtifada patlar
-    # Buzlu: düşük yoğunluk, daha yüksek irtifada patlar
-    if density_kg_m3 > 2500:  # Taşlı
-        h0 = 8.0  # km
-        alpha = 0.6
-    elif density_kg_m3 > 1500:  # Orta yoğunluk
-        h0 = 15.0
-        alpha = 0.7
-    else:  # Buzlu
-        h0 = 25.0
-        alpha = 0.8
-    
-    # Boyut faktörü: küçük asteroidler daha yüksekte patlar
-    size_factor = max(0.2, min(1.0, diameter_m / 100))
-    
-    # Hız faktörü: yüksek hız = daha fazla sürtünme = daha yüksek irtifa
-    velocity_factor = velocity_ms / 20000  # Normalize
-    
-    # İrtifa hesabı (km)
-    airburst_altitude_km = h0 * (1 - alpha * size_factor) * (1 + 0.3 * velocity_factor) * sin_angle
-    airburst_altitude_km = max(0, min(50, airburst_altitude_km))  # 0-50 km arası
-    
-    return airburst_altitude_km
-
-
-def determine_impact_type(diameter_m, density_kg_m3, velocity_ms, angle_deg, is_ocean):
-    """
-    Adım 2: Çarpma tipini belirle
-    - Havada İnfilak (Airburst)
-    - Yer Çarpması (Surface Impact)
-    - Su Çarpması (Ocean Impact)
-    """
-    # Atmosferik giriş analizi
-    atm_data = calculate_atmospheric_entry(diameter_m, velocity_ms, density_kg_m3, angle_deg)
-    
-    # Kritik çap eşiği (yoğunluğa göre)
-    # Taşlı asteroidler için ~50-60m eşiği (yoğunluk ~3100 kg/m³)
-    if density_kg_m3 > 2500:  # Taşlı
-        critical_diameter = 55
-    elif density_kg_m3 > 1500:  # Orta
-        critical_diameter = 40
-    else:  # Buzlu
-        critical_diameter = 30
-    
-    # Havada infilak irtifası
-    airburst_alt = determine_airburst_altitude(diameter_m, density_kg_m3, velocity_ms, angle_deg)
-    
-    # Çarpma tipi belirleme
-    if diameter_m < critical_diameter or not atm_data['reaches_ground']:
+    material = material_for_density(density_kg_m3)
+    surrogate = get_airburst_surrogate()
+    outcome = surrogate.lookup(diameter_m, velocity_ms, angle_deg, material) if surrogate else None
+    if outcome is not None:
+        outcome['source'] = 'surrogate'
+    else:
+        results = simulate_atmospheric_entry_advanced(
+            diameter_m=diameter_m, velocity_ms=velocity_ms, entry_angle_deg=angle_deg,
+            material_type=material, fragmentation_model='pancake', record_history=False
+        )
+        outcome = summarize_entry(results)
+        outcome['source'] = 'simulation'
+    outcome['material'] = material
+    return outcome
+
+
+# Kinetik enerjinin bu oranından fazlası atmosferde biriken girişler havada infilak sayılır,
+AIRBURST_ENERGY_FRACTION = 0.5
+# ancak yalnızca infilak irtifası cismin bu kadar çapı üstündeyse. Daha alçakta biriken enerji
+# (ör. 2 km'lik bir kuyruklu yıldızın 8 km'deki infilakı) yere bir bütün olarak aktarılır.
+AIRBURST_MIN_ALTITUDE_DIAMETERS = 5
+# Yere ulaşan kütle veya enerji bu oranın altındaysa irtifadan bağımsız olarak havada infilak
+AIRBURST_RESIDUAL_FRACTION = 0.01
+
+
+def determine_impact_type(diameter_m, entry_outcome, is_ocean):
+    """
+    Adım 2: Çarpma tipini atmosferik giriş sonucundan belirle
+    - Havada İnfilak (Airburst): enerjinin çoğu cismin boyutuna göre yüksekte birikir
+      veya yere neredeyse hiç kütle/enerji ulaşmaz
+    - Yer Çarpması (Surface Impact): aksi halde; krater, sismik ve tsunami tüm enerjiyle
+    - Su Çarpması (Ocean Impact): yer çarpması denizde
+    """
+    burst_above_body = (entry_outcome['airburst_altitude_km'] * 1000
+                        >= AIRBURST_MIN_ALTITUDE_DIAMETERS * diameter_m)
+    nothing_reaches_ground = (entry_outcome['ground_mass_fraction'] < AIRBURST_RESIDUAL_FRACTION
+                              or 1 - entry_outcome['energy_fraction'] < AIRBURST_RESIDUAL_FRACTION)
+    if (entry_outcome['energy_fraction'] >= AIRBURST_ENERGY_FRACTION and burst_above_body) or nothing_reaches_ground:
         impact_type = "Airburst"
         applicable_hazards = ['overpressure', 'wind_blast', 'thermal_radiation']
     elif is_ocean:
@@ -583,9 +961,7 @@ def determine_impact_type(diameter_m, density_kg_m3, velocity_ms, angle_deg, is_
     
     return {
         'impact_type': impact_type,
-        'applicable_hazards': applicable_hazards,
-        'airburst_altitude_km': airburst_alt,
-        'atmospheric_data': atm_data
+        'applicable_hazards': applicable_hazards
     }
 
 
@@ -760,6 +1136,132 @@ def calculate_tsunami_wave_height(distance_km, impact_energy_joules, water_depth
     return max(0, final_height_m)
 
 
+_tsunami_engine = None
+_tsunami_engine_loaded = False
+
+TSUNAMI_MIN_COASTAL_HEIGHT_M = 0.1  # Bunun altındaki kıyı dalgaları etkisiz sayılır
+
+
+def get_tsunami_engine():
+    """Bathimetri rasteri üzerinde yayılım motoru (raster yoksa None - sabit modele düşülür)."""
+    global _tsunami_engine, _tsunami_engine_loaded
+    if not _tsunami_engine_loaded:
+        _tsunami_engine_loaded = True
+        try:
+            _tsunami_engine = TsunamiEngine.load()
+        except (OSError, KeyError, ValueError) as e:
+            logger.warning("Tsunami bathymetry raster unavailable", extra={'fields': {'error': str(e)}})
+    return _tsunami_engine
+
+
+def propagate_tsunami(impact_lat, impact_lng, kinetic_energy_joules, crater_diameter_km, tsunami_range_km):
+    """
+    Adım 3 (ızgara): Kıyı hücresi başına varış süresi ve dalga yüksekliği.
+    
+    Varış süresi ve yol uzunluğu bathimetri rasteri üzerinde eikonal çözümden gelir
+    (kaynak hücresi başına önbellekli); yükseklik, kaynak derinliğiyle
+    calculate_tsunami_wave_height ile aynı H₀ / √r yayılma yasasını izler.
+    
+    Returns:
+        None (raster yok veya kaynak karada) veya dict: kıyı hücresi dizileri ve
+        'reached' maskesi (menzil içinde ve TSUNAMI_MIN_COASTAL_HEIGHT_M üstü)
+    """
+    engine = get_tsunami_engine()
+    if engine is None:
+        return None
+    field = engine.propagate(impact_lat, impact_lng)
+    if field is None or len(field['path_km']) == 0:
+        return None
+    
+    height_at_1km = calculate_tsunami_wave_height(
+        1.0, kinetic_energy_joules, field['source_depth_m'], crater_diameter_km
+    )
+    path_km = field['path_km'].astype(float)
+    height_m = height_at_1km / np.sqrt(np.maximum(path_km, 1.0))
+    field['height_m'] = height_m
+    field['reached'] = (path_km <= tsunami_range_km) & (height_m >= TSUNAMI_MIN_COASTAL_HEIGHT_M)
+    return field
+
+
+def tsunami_propagation_summary(propagation):
+    """Yayılım sonucunun JSON özeti."""
+    if propagation is None:
+        return None
+    reached = propagation['reached']
+    return {
+        'model': 'bathymetry_eikonal',
+        'source_depth_m': round(propagation['source_depth_m'], 0),
+        'nearest_coast_km': round(float(propagation['path_km'].min()), 0),
+        'first_arrival_min': round(float(propagation['arrival_s'].min()) / 60, 1),
+        'coastal_cells_reached': int(reached.sum()),
+        'max_coastal_height_m': round(float(propagation['height_m'][reached].max()), 2) if reached.any() else 0.0
+    }
+
+
+_coastal_segments = None
+_coastal_segments_loaded = False
+
+
+def get_coastal_segments():
+    """Kıyı nüfus segmentleri indeksi (dosya yoksa None - okyanus sabitlerine düşülür)."""
+    global _coastal_segments, _coastal_segments_loaded
+    if not _coastal_segments_loaded:
+        _coastal_segments_loaded = True
+        try:
+            _coastal_segments = CoastalSegmentIndex.load()
+        except (OSError, KeyError, ValueError) as e:
+            logger.warning("Coastal segment index unavailable", extra={'fields': {'error': str(e)}})
+    return _coastal_segments
+
+
+def coastal_tsunami_exposure(segments, impact_lat, impact_lng, tsunami_height_m, tsunami_range_km,
+                             tsunami_propagation=None):
+    """
+    Menzil içindeki kıyı segmentlerinden tsunami maruziyeti ve kayıplar.
+    
+    Segment dalga yüksekliği, yayılım varsa segmentin bathimetri kıyı hücresinden, yoksa
+    büyük daire mesafesiyle sönümlenen başlangıç yüksekliğinden alınır. Su, yüksekliğe
+    göre segmentin iç şeridinin bir kısmını kaplar (en fazla 3 km).
+    """
+    indices, distance_km = segments.query_radius(impact_lat, impact_lng, tsunami_range_km)
+    
+    if tsunami_propagation is not None:
+        reached = tsunami_propagation['reached']
+        reached_cells = tsunami_propagation['coast_cell'][reached]
+        reached_heights = tsunami_propagation['height_m'][reached]
+        heights = np.zeros(len(indices))
+        if len(reached_cells):
+            cells = segments.coast_cell[indices]
+            position = np.minimum(np.searchsorted(reached_cells, cells), len(reached_cells) - 1)
+            matched = reached_cells[position] == cells
+            heights[matched] = reached_heights[position[matched]]
+        nearest_coast_km = float(tsunami_propagation['path_km'].min())
+    else:
+        heights = tsunami_height_m * np.maximum(0.1, np.exp(-distance_km / 2000))
+        if len(distance_km):
+            nearest_coast_km = float(distance_km.min())
+        else:
+            nearest_coast_km = segments.nearest_distance_km(impact_lat, impact_lng)
+    
+    hit = heights >= TSUNAMI_MIN_COASTAL_HEIGHT_M
+    indices, heights = indices[hit], heights[hit]
+    
+    penetration_km = np.minimum(3, heights / 8)
+    affected = segments.population[indices] * np.minimum(1.0, penetration_km / segments.strip_km)
+    casualty_rates = np.select([heights > 30, heights > 15, heights > 5], [0.35, 0.20, 0.10], 0.03)
+    strip_area_km2 = float(segments.length_km[indices].sum()) * segments.strip_km
+    
+    return {
+        'segments_reached': int(len(indices)),
+        'nearest_coast_km': nearest_coast_km,
+        'coastal_height_m': float(heights.max()) if len(heights) else 0.0,
+        'inundated_area_km2': float((segments.length_km[indices] * penetration_km).sum()),
+        'coastal_density': float(segments.population[indices].sum()) / strip_area_km2 if strip_area_km2 > 0 else 0.0,
+        'total_affected': int(affected.sum()),
+        'casualties': int((affected * casualty_rates).sum())
+    }
+
+
 # ============================================================================
 # VULNERABILITY MODELS: RUMPF METHODOLOGY
 # ============================================================================
@@ -955,64 +1457,111 @@ def crater_casualties(crater_radius_m, distance_m, population):
 # GRID-BASED POPULATION EXPOSURE MAPPING
 # ============================================================================
 
-def create_population_grid(center_lat, center_lng, max_radius_km, grid_resolution_km=1):
+GRID_TILE_CELLS = 65536  # Nüfus ızgarası bloklarında en fazla hücre (ızgara hiçbir zaman tamamen oluşturulmaz)
+
+def grid_half_width(max_radius_km, grid_resolution_km):
+    """Merkezden kenara satır/sütun sayısı (yarıçaptaki hücreyi kaçırmamak için bir fazla)."""
+    return int(max_radius_km / grid_resolution_km) + 1
+
+
+def grid_tiles(max_radius_km, grid_resolution_km, row_range=None, tile_cells=GRID_TILE_CELLS):
     """
-    Adım 4: Nüfus yoğunluğu için grid oluştur
+    Adım 4: Çarpma noktası etrafındaki nüfus ızgarasının hücreleri, sabit boyutlu satır
+    blokları halinde (yalnızca maksimum yarıçap içindekiler, satır sırasıyla).
+    
+    Ofsetler azimutal eşit uzaklık düzlemindedir (bkz. geodesy.destination_points), bu yüzden
+    hücre mesafeleri her merkez enleminde gerçek büyük daire mesafesidir. Tüm ızgara hiçbir
+    zaman bellekte tutulmaz; bellek kullanımı tile_cells ile sınırlıdır.
     
     Args:
-        center_lat, center_lng: Çarpma noktası koordinatları
-        max_radius_km: Maksimum etki yarıçapı
-        grid_resolution_km: Grid hücre boyutu (km)
+        row_range: (ilk, son) satır aralığı; None ise tüm satırlar
     
-    Returns:
-        Grid hücreleri listesi: [(lat, lng, distance_km, population_density), ...]
+    Yields:
+        (north_km, east_km, radius_key) - radius_key = i² + j² (hücre indeks ofsetleri);
+        aynı anahtarlı hücreler merkeze eşit uzaklıktadır
     """
-    # Basit grid oluşturma (gerçek projede GeoTIFF/CSV veri kullanılmalı)
-    # Şimdilik GeoNames API veya tahmini yoğunluk kullanıyoruz
-    
-    grid_cells = []
+    half_width = grid_half_width(max_radius_km, grid_resolution_km)
+    index = np.arange(-half_width, half_width + 1)
+    offsets = index * grid_resolution_km
+    rows_per_tile = max(1, tile_cells // len(index))
+    first, last = row_range if row_range is not None else (0, len(index))
+    for start in range(first, last, rows_per_tile):
+        rows = slice(start, min(start + rows_per_tile, last))
+        north_km, east_km = np.meshgrid(offsets[rows], offsets, indexing='ij')
+        inside = np.hypot(north_km, east_km) <= max_radius_km
+        radius_key = index[rows, None] ** 2 + index[None, :] ** 2
+        yield north_km[inside], east_km[inside], radius_key[inside]
+
+
+@lru_cache(maxsize=64)
+def grid_cell_count(max_radius_km, grid_resolution_km):
+    """Yarıçap içindeki hücre sayısı (ızgara oluşturulmadan, bloklar halinde sayılır)."""
+    return sum(len(north_km) for north_km, _, _ in grid_tiles(max_radius_km, grid_resolution_km))
+
+
+def grid_radius_keys(max_radius_km, grid_resolution_km):
+    """
+    Izgaradaki benzersiz mesafe anahtarları (sıralı), karşılık gelen mesafeler (m) ve
+    her anahtardaki hücre sayısı.
     
-    # Enlem/boylam başına km (yaklaşık)
-    km_per_degree_lat = 111.0
-    km_per_degree_lng = 111.0 * math.cos(math.radians(center_lat))
+    Yalnızca bir sekizde birlik dilim (0 <= j <= i) taranır; simetri nedeniyle tüm
+    ızgaranın anahtarları aynıdır. Dilimdeki her (i, j) ızgarada 8 hücreye karşılık gelir;
+    eksenler ve köşegen üzerinde 4, merkezde 1.
+    """
+    half_width = grid_half_width(max_radius_km, grid_resolution_km)
+    i, j = np.meshgrid(np.arange(half_width + 1), np.arange(half_width + 1), indexing='ij')
+    octant = j <= i
+    i, j = i[octant], j[octant]
+    distance_km = np.hypot(i * grid_resolution_km, j * grid_resolution_km)
+    inside = distance_km <= max_radius_km
+    i, j, distance_km = i[inside], j[inside], distance_km[inside]
+    keys, first, inverse = np.unique(i ** 2 + j ** 2, return_index=True, return_inverse=True)
+    multiplicity = np.where((j == 0) | (j == i), 4, 8)
+    multiplicity[i == 0] = 1
+    return keys, distance_km[first] * 1000, np.bincount(inverse.ravel(), weights=multiplicity).astype(np.int64)
+
+
+def grid_population(center_lat, center_lng, north_km, east_km, grid_resolution_km):
+    """Izgara hücrelerinin nüfusu (yoğunluk * hücre alanı)."""
+    cell_lat, cell_lng = destination_points(center_lat, center_lng, north_km, east_km)
+    return estimate_population_density_array(cell_lat, cell_lng) * grid_resolution_km ** 2
+
+
+def _population_by_radius_band(center_lat, center_lng, max_radius_km, grid_resolution_km, row_range):
+    """
+    Satır aralığındaki nüfusun mesafe anahtarlarına göre toplamı (stage_radius_keys sırasıyla).
     
-    # Grid boyutları
-    num_cells = int(max_radius_km / grid_resolution_km) * 2
+    Çok az nüfuslu (< 0.1 kişi) hücreler atlanır.
+    """
+    keys, _, _ = stage_radius_keys(max_radius_km, grid_resolution_km)
+    weights = np.zeros(len(keys))
+    for north_km, east_km, radius_key in grid_tiles(max_radius_km, grid_resolution_km, row_range):
+        population = grid_population(center_lat, center_lng, north_km, east_km, grid_resolution_km)
+        weights += np.bincount(
+            np.searchsorted(keys, radius_key), weights=np.where(population >= 0.1, population, 0.0),
+            minlength=len(keys)
+        )
+    return weights
+
+
+def radius_population(center_lat, center_lng, max_radius_km, grid_resolution_km):
+    """
+    Çarpma noktası etrafındaki nüfusun mesafe anahtarlarına göre toplamı (N_k).
     
-    for i in range(-num_cells, num_cells + 1):
-        for j in range(-num_cells, num_cells + 1):
-            # Grid hücresi koordinatları
-            cell_lat = center_lat + (i * grid_resolution_km / km_per_degree_lat)
-            cell_lng = center_lng + (j * grid_resolution_km / km_per_degree_lng)
-            
-            # Çarpma noktasına mesafe
-            distance_km = math.sqrt(
-                ((cell_lat - center_lat) * km_per_degree_lat) ** 2 +
-                ((cell_lng - center_lng) * km_per_degree_lng) ** 2
-            )
-            
-            # Maksimum yarıçap içindeyse ekle
-            if distance_km <= max_radius_km:
-                # Nüfus yoğunluğu tahmini (gerçek projede GeoTIFF/API'den alınmalı)
-                # Şimdilik mesafeye göre azalan basit model
-                base_density = estimate_population_density_simple(cell_lat, cell_lng)
-                
-                # Alan (km²)
-                cell_area_km2 = grid_resolution_km ** 2
-                
-                # Hücre nüfusu
-                cell_population = base_density * cell_area_km2
-                
-                grid_cells.append({
-                    'lat': cell_lat,
-                    'lng': cell_lng,
-                    'distance_km': distance_km,
-                    'distance_m': distance_km * 1000,
-                    'population': cell_population,
-                    'density': base_density
-                })
+    Tehlike şiddetleri yalnızca mesafeye bağlı olduğundan hücre başına her toplam
+    (Σ oran(d_hücre) * nüfus_hücre, eşik üstü nüfus, maruz nüfus) N_k üzerinden yazılabilir.
+    Nüfus GRID_TILE_CELLS hücrelik bloklarla hesaplanır; ızgara bellekte oluşturulmaz ve
+    sonuç benzersiz mesafe sayısı kadardır (hücre sayısının ~1/8'i, hücre başına 8 bayt).
     
-    return grid_cells
+    Süreç havuzu açıksa satır aralıkları işçilere dağıtılır ve N_k vektörleri toplanır.
+    """
+    row_count = 2 * grid_half_width(max_radius_km, grid_resolution_km) + 1
+    arguments = (center_lat, center_lng, max_radius_km, grid_resolution_km)
+    if pool_enabled_for(grid_cell_count(max_radius_km, grid_resolution_km)):
+        return sum(map_tasks(_population_by_radius_band, [
+            arguments + (row_range,) for row_range in even_bands(row_count, band_count())
+        ]))
+    return _population_by_radius_band(*arguments, (0, row_count))
 
 
 def get_nearest_city_population(lat, lng, max_distance_km=300):
@@ -1026,25 +1575,19 @@ def get_nearest_city_population(lat, lng, max_distance_km=300):
     Returns:
         Dict: Şehir bilgisi ve tahmini yoğunluk
     """
-    nearest_city = None
-    min_distance = float('inf')
-    
-    for city_name, city_data in MAJOR_CITIES_POPULATION.items():
-        # Mesafe hesapla (yaklaşık)
-        lat_diff = lat - city_data['lat']
-        lng_diff = lng - city_data['lng']
-        distance_km = math.sqrt((lat_diff * 111) ** 2 + (lng_diff * 111 * math.cos(math.radians(lat))) ** 2)
-        
-        if distance_km < min_distance:
-            min_distance = distance_km
-            nearest_city = {
-                'name': city_name,
-                'distance_km': distance_km,
-                'population': city_data['population'],
-                'density': city_data['density'],
-                'lat': city_data['lat'],
-                'lng': city_data['lng']
-            }
+    city_lats, city_lngs, _ = major_city_arrays()
+    distances_km = haversine_km(lat, lng, city_lats, city_lngs)
+    index = int(np.argmin(distances_km))
+    city_name = major_city_names()[index]
+    city_data = MAJOR_CITIES_POPULATION[city_name]
+    nearest_city = {
+        'name': city_name,
+        'distance_km': float(distances_km[index]),
+        'population': city_data['population'],
+        'density': city_data['density'],
+        'lat': city_data['lat'],
+        'lng': city_data['lng']
+    }
     
     if nearest_city and nearest_city['distance_km'] <= max_distance_km:
         # Mesafeye göre yoğunluk azalması
@@ -1094,11 +1637,9 @@ def get_population_density_from_geonames(lat, lng, radius_km=50):
     """
     try:
         # GeoNames findNearbyPlaceName endpoint - en yakın yerleşim yerlerini bulur
-        url = f'http://api.geonames.org/findNearbyPlaceNameJSON?lat={lat}&lng={lng}&radius={radius_km}&maxRows=10&username={GEONAMES_USERNAME}'
+        url = f'{GEONAMES_API_URL}/findNearbyPlaceNameJSON?lat={lat}&lng={lng}&radius={radius_km}&maxRows=10&username={GEONAMES_USERNAME}'
         
-        response = requests.get(url, timeout=5)
-        response.raise_for_status()
-        data = response.json()
+        data = fetch_json(url, timeout=5, upstream='geonames')
         
         if 'geonames' in data and len(data['geonames']) > 0:
             # En yakın şehirlerin popülasyonunu al
@@ -1138,13 +1679,21 @@ def get_population_density_from_geonames(lat, lng, radius_km=50):
         # Veri bulunamazsa varsayılan
         return None
         
+    except BudgetExhausted:
+        return None  # Bütçe tükendi: çağrı yapılmadı, şehir tablosuna düşülür
     except Exception as e:
-        print(f"GeoNames API Error: {e}")
+        logger.warning("GeoNames API error", extra={'fields': {'error': str(e)}})
         return None
 
 
-def estimate_population_affected(impact_lat, impact_lng, damage_zones, is_ocean=False, ocean_name='Ocean', tsunami_height_m=0, tsunami_range_km=0):
-    """Estimate affected population and casualties."""
+def estimate_population_affected(impact_lat, impact_lng, damage_zones, is_ocean=False, ocean_name='Ocean', tsunami_height_m=0, tsunami_range_km=0,
+                                 tsunami_propagation=None):
+    """
+    Estimate affected population and casualties.
+    
+    tsunami_propagation: propagate_tsunami sonucu; verilirse okyanus çarpmalarında kıyıya
+    uzaklık ve kıyı dalga yükseklikleri sabit okyanus değerleri yerine kıyı hücrelerinden alınır.
+    """
     
     # GLOBAL EXTINCTION EVENT CHECK (Chicxulub-level impacts)
     light_damage_km = damage_zones.get('light_damage_km', 0)
@@ -1234,15 +1783,37 @@ def estimate_population_affected(impact_lat, impact_lng, damage_zones, is_ocean=
         # Çarpma noktasından kıyıya ortalama mesafe
         max_tsunami_range_km = tsunami_range_km  # Hesaplanan menzil değerini kullan
         
-        # Kıyıya ulaştığında tsunami yüksekliği
-        # Basitleştirilmiş attenuation: her 1000 km'de %70 azalma
-        distance_factor = max(0.1, math.exp(-typical_distance_to_coast / 2000))
-        coastal_tsunami_height = tsunami_height_m * distance_factor
+        if tsunami_propagation is not None:
+            # Izgara yayılımı: en yakın kıyıya gerçek yol uzunluğu ve kıyı hücresi yükseklikleri
+            reached = tsunami_propagation['reached']
+            typical_distance_to_coast = int(round(float(tsunami_propagation['path_km'].min())))
+            cell_heights = tsunami_propagation['height_m'][reached]
+            coastal_tsunami_height = float(cell_heights.max()) if reached.any() else 0.0
+            distance_factor = coastal_tsunami_height / tsunami_height_m if tsunami_height_m > 0 else 0.0
+        else:
+            # Kıyıya ulaştığında tsunami yüksekliği
+            # Basitleştirilmiş attenuation: her 1000 km'de %70 azalma
+            distance_factor = max(0.1, math.exp(-typical_distance_to_coast / 2000))
+            coastal_tsunami_height = tsunami_height_m * distance_factor
         
         # 3. Etkilenen alan hesabı - DÜZELTİLMİŞ VE GERÇEKÇİ
         # Sadece tsunami MENZİLİ içindeki kıyılar etkilenir
         coastal_area = 0  # Varsayılan değer
-        if typical_distance_to_coast > max_tsunami_range_km:
+        coastal_segments = get_coastal_segments()
+        if coastal_segments is not None:
+            # Menzil içindeki kıyı segmentlerinin nüfusu - okyanus sabitleri yalnızca segment verisi yoksa kullanılır
+            exposure = coastal_tsunami_exposure(
+                coastal_segments, impact_lat, impact_lng, tsunami_height_m, max_tsunami_range_km, tsunami_propagation
+            )
+            if exposure['nearest_coast_km'] is not None:
+                typical_distance_to_coast = int(round(exposure['nearest_coast_km']))
+            coastal_tsunami_height = exposure['coastal_height_m']
+            distance_factor = coastal_tsunami_height / tsunami_height_m if tsunami_height_m > 0 else 0.0
+            coastal_area = exposure['inundated_area_km2']
+            coastal_density = round(exposure['coastal_density'], 1)
+            total_affected = exposure['total_affected']
+            casualties = exposure['casualties']
+        elif typical_distance_to_coast > max_tsunami_range_km:
             # Tsunami kıyıya ulaşamaz - çok uzak!
             total_affected = 0
             casualties = 0
@@ -1321,7 +1892,8 @@ def estimate_population_affected(impact_lat, impact_lng, damage_zones, is_ocean=
             'coastal_density': coastal_density,
             'note': f'Ocean impact - Distance to coast: ~{typical_distance_to_coast} km',
             'location_info': f'Tsunami impact zone: {int(coastal_area)} km² of coastline' if coastal_area > 0 else f'Tsunami does NOT reach coast (range: {max_tsunami_range_km} km < distance: {typical_distance_to_coast} km)',
-            'data_source': 'Optimized tsunami propagation model',
+            'data_source': 'Coastal population segments' if coastal_segments is not None else 'Optimized tsunami propagation model',
+            'tsunami_model': 'bathymetry_eikonal' if tsunami_propagation is not None else 'distance_attenuation',
             'coastal_tsunami_height_m': round(coastal_tsunami_height, 1),
             'tsunami_attenuation_info': f'Initial: {tsunami_height_m:.1f}m → Coastal: {coastal_tsunami_height:.1f}m (distance factor: {distance_factor:.2%})'
         }
@@ -1439,17 +2011,17 @@ def check_ocean_with_geonames(lat, lng):
     GeoNames Ocean API kullanarak nokta okyanus/deniz mi kontrol eder
     """
     try:
-        url = f'http://api.geonames.org/oceanJSON?lat={lat}&lng={lng}&username={GEONAMES_USERNAME}'
-        response = requests.get(url, timeout=5)
-        response.raise_for_status()
-        data = response.json()
+        url = f'{GEONAMES_API_URL}/oceanJSON?lat={lat}&lng={lng}&username={GEONAMES_USERNAME}'
+        data = fetch_json(url, timeout=5, upstream='geonames')
         
         if 'ocean' in data and 'name' in data['ocean']:
             return True, data['ocean']['name']
         else:
             return False, "Land"
+    except BudgetExhausted:
+        return None, None  # Bütçe tükendi: çağrı yapılmadı, koordinat tahminine düşülür
     except Exception as e:
-        print(f"GeoNames Ocean API Error: {e}")
+        logger.warning("GeoNames Ocean API error", extra={'fields': {'error': str(e)}})
         # API başarısız olursa fallback kullan
         return None, None
 
@@ -1536,34 +2108,29 @@ def fallback_ocean_check(impact_lat, impact_lng):
     return is_ocean, ocean_name
 
 
-def check_tsunami_risk(impact_lat, impact_lng, crater_diameter_km, kinetic_energy_joules):
+def check_tsunami_risk(impact_lat, impact_lng, crater_diameter_km, kinetic_energy_joules, ocean_check=None):
     """
     Tsunami riskini kontrol eder
     GeoNames API ile gerçek okyanus/deniz tespiti yapar
+    
+    ocean_check: Önceden yapılmış (is_ocean, ocean_name) tespiti varsa API tekrar çağrılmaz
     """
     # Koordinat normalizasyonu: Boylam -180 ile 180 arasında olmalı
-    while impact_lng > 180:
-        impact_lng -= 360
-    while impact_lng < -180:
-        impact_lng += 360
+    impact_lng = float(wrap_lng(impact_lng))
     
     # ÖNCELİKLE: GeoNames API ile gerçek kontrol yap
-    api_is_ocean, api_ocean_name = check_ocean_with_geonames(impact_lat, impact_lng)
+    if ocean_check is not None:
+        api_is_ocean, api_ocean_name = ocean_check
+    else:
+        api_is_ocean, api_ocean_name = check_ocean_with_geonames(impact_lat, impact_lng)
     
     if api_is_ocean is not None:
         # API başarılı - gerçek veriyi kullan
         is_ocean = api_is_ocean
         ocean_name = api_ocean_name
-        try:
-            print(f"[OK] GeoNames API: Lat={impact_lat:.2f}, Lng={impact_lng:.2f} -> {ocean_name} (Ocean: {is_ocean})")
-        except:
-            pass
     else:
         # API başarısız - fallback koordinat kontrolü
-        try:
-            print(f"[WARN] GeoNames API unavailable, using fallback coordinate check")
-        except:
-            pass
+        logger.warning("GeoNames API unavailable, using fallback coordinate check")
         is_ocean, ocean_name = fallback_ocean_check(impact_lat, impact_lng)
     
     tsunami_risk = "None"
@@ -1612,16 +2179,21 @@ def check_tsunami_risk(impact_lat, impact_lng, crater_diameter_km, kinetic_energ
             tsunami_risk = "Low"
             tsunami_height_m = min(10, initial_height * 1.5)  # Max 10m
             tsunami_range_km = 500
+        
+        propagation = propagate_tsunami(
+            impact_lat, impact_lng, kinetic_energy_joules, crater_diameter_km, tsunami_range_km
+        )
+    else:
+        propagation = None
     
     # Eğer hiçbir okyanusa uymuyorsa kara
     if not is_ocean:
         ocean_name = "Land"
     
-    # Debug: Log koordinatları
-    try:
-        print(f"Location check: Lat={impact_lat:.2f}, Lng={impact_lng:.2f} -> {ocean_name} (Ocean: {is_ocean})")
-    except:
-        pass
+    logger.info("Location check", extra={'fields': {
+        'lat': round(impact_lat, 2), 'lng': round(impact_lng, 2),
+        'location_type': ocean_name, 'is_ocean': is_ocean, 'tsunami_risk': tsunami_risk
+    }})
     
     return {
         'is_ocean_impact': is_ocean,
@@ -1634,8 +2206,10 @@ def check_tsunami_risk(impact_lat, impact_lng, crater_diameter_km, kinetic_energ
                    'WARNING: Coastal areas should be alert.' if tsunami_risk == 'Moderate' else
                    'Tsunami risk is minimal.' if tsunami_risk == 'Low' else 'No tsunami risk (land impact).',
         # Popülasyon hesaplaması için ek parametreler
+        'propagation': tsunami_propagation_summary(propagation),
         '_internal_tsunami_height': tsunami_height_m,  # İç kullanım için
-        '_internal_tsunami_range': tsunami_range_km
+        '_internal_tsunami_range': tsunami_range_km,
+        '_internal_propagation': propagation  # Diziler - JSON'a girmeden önce çıkarılır
     }
 
 
@@ -1643,6 +2217,307 @@ def check_tsunami_risk(impact_lat, impact_lng, crater_diameter_km, kinetic_energ
 # MAIN INTEGRATION: RUMPF ADVANCED IMPACT RISK ASSESSMENT
 # ============================================================================
 
+def build_hazard_source(diameter_m, density_kg_m3, velocity_ms, angle_deg, is_ocean=False):
+    """
+    Adım 1-3'ün konumdan bağımsız kısmı: enerji, atmosferik giriş, çarpma tipi, krater,
+    etki yarıçapı ve sismik büyüklük. Aynı asteroid için farklı konumlarda yeniden kullanılabilir.
+    """
+    energy_data = calculate_kinetic_energy(diameter_m, density_kg_m3, velocity_ms)
+    entry_outcome = estimate_entry_outcome(diameter_m, density_kg_m3, velocity_ms, angle_deg)
+    
+    impact_type_data = determine_impact_type(diameter_m, entry_outcome, is_ocean)
+    impact_type = impact_type_data['impact_type']
+    
+    # Krater hesabı (sadece yere ulaşan çarpmalar için). Yer çarpmalarında atmosferde biriken
+    # enerji de yüzeye yakın (birkaç çap içinde) bırakılır; krater tüm cisim ve hızla ölçeklenir
+    if impact_type != "Airburst":
+        angle_rad = math.radians(angle_deg)
+        velocity_factor = (velocity_ms / 12000) ** 0.44
+        angle_factor = (math.sin(angle_rad)) ** 0.33
+        crater_diameter_m = 1.8 * diameter_m * velocity_factor * angle_factor * 13
+    else:
+        crater_diameter_m = 0
+    
+    # Maksimum etki yarıçapı
+    max_radius_km = max(50, (energy_data['kinetic_energy_joules'] ** 0.33) / 5000)
+    max_radius_km = min(max_radius_km, 500)  # Maksimum 500 km
+    
+    return {
+        'energy_data': energy_data,
+        'kinetic_energy_joules': energy_data['kinetic_energy_joules'],
+        'entry_outcome': entry_outcome,
+        'airburst_altitude_km': entry_outcome['airburst_altitude_km'],
+        'impact_type': impact_type,
+        'applicable_hazards': impact_type_data['applicable_hazards'],
+        'crater_diameter_m': crater_diameter_m,
+        'crater_radius_m': crater_diameter_m / 2,
+        'max_radius_km': max_radius_km,
+        'seismic_magnitude': calculate_seismic_magnitude(energy_data['kinetic_energy_joules'])
+    }
+
+
+def combine_hazard_casualties(casualties_by_hazard):
+    """
+    Adım 6: Tehlike kayıplarını birleştir - en yıkıcı tehlike ile toplamın ortası.
+    Not: Gerçek Rumpf metodolojisinde daha karmaşık bir birleştirme yapılır.
+    Skaler veya numpy dizileri (harita) ile çalışır.
+    """
+    values = list(casualties_by_hazard.values())
+    worst = values[0]
+    total = values[0]
+    for value in values[1:]:
+        worst = np.maximum(worst, value)
+        total = total + value
+    return (worst + total) / 3
+
+
+# ============================================================================
+# TEHLİKE KONTURLARI (GeoJSON)
+# ============================================================================
+
+# Alan -> ((eşik, etiket), ...); birimler FIELD_STYLES ile aynı (Pa, J/m², m/s)
+CONTOUR_LEVELS = {
+    'overpressure': (
+        (3000, '3 kPa - cam kırılması'),
+        (20000, '20 kPa - konut yıkımı'),
+        (140000, '140 kPa - betonarme yıkımı')
+    ),
+    'thermal': (
+        (800000, '800 kJ/m² - üçüncü derece yanık'),
+    ),
+    'wind': (
+        (29, 'EF0'), (38, 'EF1'), (49, 'EF2'), (60, 'EF3'), (74, 'EF4'), (90, 'EF5')
+    ),
+}
+DEFAULT_CONTOUR_VERTEX_BUDGET = 2000
+MAX_CONTOUR_VERTEX_BUDGET = 20000
+CONTOUR_COORDINATE_DIGITS = 5  # ~1 m
+
+
+def hazard_contours(asteroid_key, impact_lat, impact_lng, grid_resolution_km,
+                    vertex_budget=DEFAULT_CONTOUR_VERTEX_BUDGET):
+    """
+    Tehlike şiddeti eş değer eğrileri - GeoJSON FeatureCollection.
+    
+    Şiddet alanı, değerlendirme grid'i çözünürlüğünde kare bir ızgarada örneklenir ve
+    CONTOUR_LEVELS eşikleri marching squares ile çıkarılır. Tüm halkaların toplam köşe
+    sayısı vertex_budget'ı aşarsa Douglas-Peucker toleransı büyütülür; böylece büyük
+    yarıçaplı olaylarda da yanıt boyutu sınırlı kalır. Her özelliğin nüfusu ve alanı
+    değerlendirmenin nüfus grid'inden (eşik üstü hücreler) mesafe anahtarları üzerinden
+    hesaplanır; hücre başına nüfus dizisi oluşturulmaz. Şiddet ızgarası alan alan örneklenir,
+    böylece bellekte aynı anda tek bir alan bulunur. Alanlar değerlendirme yarıçapı
+    (max_radius_km) ile sınırlıdır.
+    """
+    profile = stage_hazard_profile(*asteroid_key)
+    max_radius_km = profile.source['max_radius_km']
+    half_cells = grid_half_width(max_radius_km, grid_resolution_km)
+    offsets = np.arange(-half_cells, half_cells + 1) * grid_resolution_km
+    distance_m = np.hypot(offsets[:, None], offsets[None, :]) * 1000
+    rings = {}
+    for field, levels in CONTOUR_LEVELS.items():
+        grid = profile.intensities_at(distance_m, fields=(field,))[field]
+        for level, _ in levels:
+            rings[(field, level)] = marching_squares(grid, level)
+        del grid
+    del distance_m
+    
+    _, key_distance_m, key_cells = stage_radius_keys(max_radius_km, grid_resolution_km)
+    population = stage_radius_population(impact_lat, impact_lng, max_radius_km, grid_resolution_km)
+    key_fields = profile.intensities_at(key_distance_m)
+    
+    simplified, tolerance = simplify_to_budget(rings, vertex_budget)
+    
+    def to_coordinates(ring):
+        lat, lng = destination_points(
+            impact_lat, impact_lng, offsets[0] + ring[:, 0] * grid_resolution_km,
+            offsets[0] + ring[:, 1] * grid_resolution_km
+        )
+        lng = impact_lng + wrap_lng(lng - impact_lng)  # Antimeridyende kopmasın
+        return np.round(np.column_stack((lng, lat)), CONTOUR_COORDINATE_DIGITS).tolist()
+    
+    features = []
+    vertex_count = 0
+    for field, levels in CONTOUR_LEVELS.items():
+        for level, label in levels:
+            polygons = rings_to_polygons(simplified[(field, level)])
+            if not polygons:
+                continue
+            inside = key_fields[field] >= level
+            vertex_count += sum(len(ring) for polygon in polygons for ring in polygon)
+            features.append({
+                'type': 'Feature',
+                'geometry': {
+                    'type': 'MultiPolygon',
+                    'coordinates': [[to_coordinates(ring) for ring in polygon] for polygon in polygons]
+                },
+                'properties': {
+                    'hazard': field,
+                    'level': level,
+                    'unit': FIELD_STYLES[field][0],
+                    'label': label,
+                    'area_km2': round(float(key_cells[inside].sum()) * grid_resolution_km ** 2, 1),
+                    'population': int(population[inside].sum())
+                }
+            })
+    
+    return {
+        'type': 'FeatureCollection',
+        'features': features,
+        'vertex_count': vertex_count,
+        'vertex_budget': vertex_budget,
+        'simplification_tolerance_km': round(tolerance * grid_resolution_km, 3)
+    }
+
+
+# ============================================================================
+# ARTIMLI HESAPLAMA: ÖNBELLEKLİ DEĞERLENDİRME AŞAMALARI
+# ============================================================================
+# Bağımlılık grafiği - her aşama yalnızca kendi girdileriyle anahtarlanır:
+#
+#   konum (lat, lng) ────────────────> okyanus/kara ──┐
+#   asteroid (d, ρ, v, θ) ────────────────────────────┴─> tehlike kaynağı ──> mesafe başına oranlar
+#   konum + yarıçap + çözünürlük ────> mesafe başına nüfus (N_k) ─────────────────┐  (mesafe anahtarları)
+#   oranlar + N_k ───────────────────> maruziyet (korunmasız/korunaklı toplamlar) ┴─> kayıplar
+#                                                                     unsheltered_fraction ──┘
+#
+# Önbelleklenen diziler hücre başına değil benzersiz mesafe başınadır (hücre sayısının ~1/8'i).
+# Sadece çarpma noktası değişirse enerji, giriş ve tehlike oranları önbellekten gelir;
+# sadece unsheltered_fraction değişirse maruziyet toplamları da önbellekten gelir ve
+# yalnızca son birleştirme (tehlike sayısı kadar çarpma) yapılır.
+
+HAZARD_PROFILE_POINTS = 4000  # Radyal profil örnek sayısı (adım = yarıçap / bu değer, en az 50 m)
+
+
+def _readonly(array):
+    """Önbellekte paylaşılan dizileri yanlışlıkla değiştirmeye karşı kilitle."""
+    array.setflags(write=False)
+    return array
+
+
+@lru_cache(maxsize=4096)
+def _stage_location_api(lat, lng):
+    is_ocean, ocean_name = check_ocean_with_geonames(lat, lng)
+    if is_ocean is None:
+        # İstisnalar önbelleğe alınmaz: API hatası bir sonraki istekte yeniden denenir
+        raise LookupError('GeoNames unavailable')
+    return is_ocean, ocean_name
+
+
+def stage_location(lat, lng):
+    """Aşama: okyanus/kara tespiti (GeoNames, başarısızsa koordinat tahmini)."""
+    try:
+        return _stage_location_api(lat, lng)
+    except LookupError:
+        return fallback_ocean_check(lat, lng)
+
+
+@lru_cache(maxsize=256)
+def stage_hazard_source(diameter_m, density_kg_m3, velocity_ms, angle_deg, is_ocean):
+    """Aşama: enerji, atmosferik giriş, çarpma tipi, krater, etki yarıçapı."""
+    return build_hazard_source(diameter_m, density_kg_m3, velocity_ms, angle_deg, is_ocean)
+
+
+@byte_bounded_cache('RADIUS_KEYS_CACHE_MB', 32)
+def stage_radius_keys(max_radius_km, grid_resolution_km):
+    """Aşama: ızgaranın benzersiz mesafe anahtarları, mesafeleri ve hücre sayıları."""
+    return tuple(_readonly(array) for array in grid_radius_keys(max_radius_km, grid_resolution_km))
+
+
+@byte_bounded_cache('RADIUS_RATES_CACHE_MB', 64)
+def stage_radius_rates(diameter_m, density_kg_m3, velocity_ms, angle_deg, is_ocean, grid_resolution_km):
+    """Aşama: benzersiz mesafe başına (korunmasız, korunaklı) kayıp oranları."""
+    source = stage_hazard_source(diameter_m, density_kg_m3, velocity_ms, angle_deg, is_ocean)
+    _, distance_m, _ = stage_radius_keys(source['max_radius_km'], grid_resolution_km)
+    return {
+        hazard: (_readonly(rate_u), _readonly(rate_s))
+        for hazard, (rate_u, rate_s) in hazard_rates(source, distance_m).items()
+    }
+
+
+@byte_bounded_cache('RADIUS_POPULATION_CACHE_MB', 128)
+def stage_radius_population(center_lat, center_lng, max_radius_km, grid_resolution_km):
+    """Aşama: çarpma noktası etrafındaki nüfusun mesafe anahtarlarına göre toplamı."""
+    return _readonly(radius_population(center_lat, center_lng, max_radius_km, grid_resolution_km))
+
+
+@lru_cache(maxsize=1024)
+def stage_exposure(diameter_m, density_kg_m3, velocity_ms, angle_deg, is_ocean,
+                   impact_lat, impact_lng, grid_resolution_km):
+    """
+    Aşama: her tehlike için (Σ oran_k * nüfus, Σ oran_ş * nüfus) toplamları.
+    
+    Oranlar yalnızca mesafeye bağlı olduğundan hücre toplamı Σ oran(d_k) * N_k'dir.
+    """
+    source = stage_hazard_source(diameter_m, density_kg_m3, velocity_ms, angle_deg, is_ocean)
+    rates = stage_radius_rates(diameter_m, density_kg_m3, velocity_ms, angle_deg, is_ocean, grid_resolution_km)
+    weights = stage_radius_population(impact_lat, impact_lng, source['max_radius_km'], grid_resolution_km)
+    return {
+        hazard: (float(rate_u @ weights), float(rate_s @ weights))
+        for hazard, (rate_u, rate_s) in rates.items()
+    }
+
+
+@lru_cache(maxsize=32)
+def stage_hazard_profile(diameter_m, density_kg_m3, velocity_ms, angle_deg, is_ocean):
+    """Aşama: karo ve kontur çizimi için radyal tehlike profili (senaryo başına bir kez)."""
+    source = stage_hazard_source(diameter_m, density_kg_m3, velocity_ms, angle_deg, is_ocean)
+    return HazardProfile(source, step_m=max(50.0, source['max_radius_km'] * 1000 / HAZARD_PROFILE_POINTS))
+
+
+@lru_cache(maxsize=1024)
+def stage_tsunami_casualties(impact_lat, impact_lng, crater_diameter_km, kinetic_energy_joules, ocean_name):
+    """Aşama: okyanus çarpmalarında kıyı tsunami kayıpları."""
+    tsunami_data = check_tsunami_risk(
+        impact_lat, impact_lng, crater_diameter_km, kinetic_energy_joules,
+        ocean_check=(True, ocean_name)
+    )
+    tsunami_casualties = estimate_population_affected(
+        impact_lat, impact_lng,
+        {'total_destruction_km': 0, 'heavy_damage_km': 0, 'moderate_damage_km': 0, 'light_damage_km': 0},
+        True, ocean_name,
+        tsunami_data.get('_internal_tsunami_height', 0),
+        tsunami_data.get('_internal_tsunami_range', 0),
+        tsunami_data.get('_internal_propagation')
+    )
+    return tsunami_casualties.get('estimated_casualties', 0)
+
+
+def shelter_weighted_casualties(exposure, sheltered_fraction):
+    """Son aşama: maruziyet toplamlarını barınma oranıyla kayıplara çevir."""
+    return {
+        hazard: (1 - sheltered_fraction) * unsheltered_total + sheltered_fraction * sheltered_total
+        for hazard, (unsheltered_total, sheltered_total) in exposure.items()
+    }
+
+
+def _assessment_stages():
+    return {
+        'location': _stage_location_api,
+        'hazard_source': stage_hazard_source,
+        'radius_keys': stage_radius_keys,
+        'radius_rates': stage_radius_rates,
+        'radius_population': stage_radius_population,
+        'exposure': stage_exposure,
+        'hazard_profile': stage_hazard_profile,
+        'tsunami': stage_tsunami_casualties
+    }
+
+
+def assessment_cache_info():
+    """Aşama önbelleklerinin isabet/ıskalama istatistikleri."""
+    info = {name: stage.cache_info()._asdict() for name, stage in _assessment_stages().items()}
+    engine = get_tsunami_engine()
+    if engine is not None:
+        info['tsunami_field'] = engine.cache_info()._asdict()
+    return info
+
+
+def clear_assessment_caches():
+    """Aşama önbelleklerini boşalt (soğuk değerlendirme süresini ölçmek için)."""
+    for stage in _assessment_stages().values():
+        stage.cache_clear()
+
+
 def calculate_advanced_impact_assessment(
     diameter_m, 
     density_kg_m3, 
@@ -1652,7 +2527,9 @@ def calculate_advanced_impact_assessment(
     impact_lng,
     water_depth_m=0,
     unsheltered_fraction=0.13,
-    grid_resolution_km=5
+    grid_resolution_km=5,
+    contours=False,
+    contour_vertex_budget=DEFAULT_CONTOUR_VERTEX_BUDGET
 ):
     """
     Rumpf Metodolojisi - Kapsamlı Asteroid Çarpma Risk Değerlendirmesi
@@ -1664,55 +2541,34 @@ def calculate_advanced_impact_assessment(
     4. Maruz Kalma Haritalaması
     5. Hassasiyet ve Kayıp Hesaplaması
     6. Toplama ve Raporlama
-    """
     
-    # ========== ADIM 1: ATMOSFERİK GİRİŞ ANALİZİ ==========
-    energy_data = calculate_kinetic_energy(diameter_m, density_kg_m3, velocity_ms)
-    airburst_altitude_km = determine_airburst_altitude(diameter_m, density_kg_m3, velocity_ms, angle_deg)
+    contours=True ise sonuca tehlike eşiklerinin sadeleştirilmiş GeoJSON
+    konturları ('contours', bkz. hazard_contours) eklenir.
+    """
     
     # ========== ADIM 2: ÇARPMA TİPİ BELİRLEME ==========
-    # Okyanus kontrolü
-    is_ocean, ocean_name = check_ocean_with_geonames(impact_lat, impact_lng)
-    if is_ocean is None:
-        is_ocean, ocean_name = fallback_ocean_check(impact_lat, impact_lng)
-    
-    impact_type_data = determine_impact_type(diameter_m, density_kg_m3, velocity_ms, angle_deg, is_ocean)
-    impact_type = impact_type_data['impact_type']
-    applicable_hazards = impact_type_data['applicable_hazards']
-    
-    # Krater hesabı (sadece yere ulaşan çarpmalar için)
-    if impact_type != "Airburst":
-        atm_data = impact_type_data['atmospheric_data']
-        final_diameter_m = atm_data['final_diameter_m']
-        final_velocity_ms = atm_data['final_velocity_ms']
-        
-        angle_rad = math.radians(angle_deg)
-        velocity_factor = (final_velocity_ms / 12000) ** 0.44
-        angle_factor = (math.sin(angle_rad)) ** 0.33
-        crater_diameter_m = 1.8 * final_diameter_m * velocity_factor * angle_factor * 13
-        crater_radius_m = crater_diameter_m / 2
-    else:
-        crater_diameter_m = 0
-        crater_radius_m = 0
-    
-    # ========== ADIM 3 & 4: TEHLİKE ŞİDDETİ VE MARUZ KALMA HARITALAMASI ==========
-    # Maksimum etki yarıçapını belirle
-    max_radius_km = max(50, (energy_data['kinetic_energy_joules'] ** 0.33) / 5000)
-    max_radius_km = min(max_radius_km, 500)  # Maksimum 500 km
-    
-    # Grid oluştur
-    try:
-        print(f"Creating population grid with {max_radius_km} km radius...")
-    except:
-        pass
-    grid_cells = create_population_grid(impact_lat, impact_lng, max_radius_km, grid_resolution_km)
-    try:
-        print(f"Grid created with {len(grid_cells)} cells")
-    except:
-        pass
+    # Okyanus kontrolü (GeoNames, başarısızsa koordinat tahmini)
+    is_ocean, ocean_name = stage_location(impact_lat, impact_lng)
+    
+    # ========== ADIM 1 & 3: ATMOSFERİK GİRİŞ, ÇARPMA TİPİ, KRATER ==========
+    asteroid_key = (diameter_m, density_kg_m3, velocity_ms, angle_deg, is_ocean)
+    source = stage_hazard_source(*asteroid_key)
+    energy_data = source['energy_data']
+    entry_outcome = source['entry_outcome']
+    airburst_altitude_km = source['airburst_altitude_km']
+    impact_type = source['impact_type']
+    applicable_hazards = source['applicable_hazards']
+    crater_diameter_m = source['crater_diameter_m']
+    max_radius_km = source['max_radius_km']
+    seismic_magnitude = source['seismic_magnitude']
+    
+    # ========== ADIM 4: MARUZ KALMA HARITALAMASI ==========
+    cell_count = grid_cell_count(max_radius_km, grid_resolution_km)
+    logger.debug("Population grid prepared", extra={'fields': {
+        'max_radius_km': round(max_radius_km, 1), 'grid_cells': cell_count
+    }})
     
     # ========== ADIM 5: HASSASİYET VE KAYIP HESAPLAMALARI ==========
-    # Her tehlike için toplam kayıplar
     casualties_by_hazard = {
         'overpressure': 0,
         'wind_blast': 0,
@@ -1723,77 +2579,21 @@ def calculate_advanced_impact_assessment(
         'tsunami': 0
     }
     
-    # Sismik büyüklük (global)
-    seismic_magnitude = calculate_seismic_magnitude(energy_data['kinetic_energy_joules'])
-    
-    # Her grid hücresi için tehlike şiddetini ve kayıpları hesapla
-    sheltered_fraction = 1 - unsheltered_fraction
-    
-    for cell in grid_cells:
-        distance_m = cell['distance_m']
-        population = cell['population']
-        
-        if population < 0.1:  # Çok az nüfus varsa atla
-            continue
-        
-        # Kraterleşme (sadece krater içi)
-        if 'cratering' in applicable_hazards:
-            crater_loss = crater_casualties(crater_radius_m, distance_m, population)
-            casualties_by_hazard['cratering'] += crater_loss
-            
-            # Krater içindeyse diğer tehlikeleri hesaplama (herkes ölmüş)
-            if crater_loss >= population * 0.99:
-                continue
-        
-        # Aşırı Basınç
-        if 'overpressure' in applicable_hazards:
-            overpressure_pa = calculate_overpressure(distance_m, energy_data['kinetic_energy_joules'], airburst_altitude_km)
-            casualties_by_hazard['overpressure'] += overpressure_casualties(overpressure_pa, population, sheltered_fraction)
-        
-        # Rüzgar Patlaması
-        if 'wind_blast' in applicable_hazards:
-            wind_speed_ms = calculate_wind_blast(distance_m, energy_data['kinetic_energy_joules'], airburst_altitude_km)
-            casualties_by_hazard['wind_blast'] += enhanced_fujita_scale_casualties(wind_speed_ms, population, sheltered_fraction)
-        
-        # Termal Radyasyon
-        if 'thermal_radiation' in applicable_hazards:
-            thermal_flux = calculate_thermal_radiation(distance_m, energy_data['kinetic_energy_joules'], airburst_altitude_km)
-            casualties_by_hazard['thermal_radiation'] += thermal_burn_casualties(thermal_flux, population, sheltered_fraction)
-        
-        # Sismik Sarsıntı
-        if 'seismic' in applicable_hazards:
-            casualties_by_hazard['seismic'] += seismic_casualties(seismic_magnitude, population, sheltered_fraction)
-        
-        # Ejekta
-        if 'ejecta' in applicable_hazards and crater_diameter_m > 0:
-            ejecta_thickness = calculate_ejecta_thickness(distance_m, crater_diameter_m)
-            casualties_by_hazard['ejecta'] += ejecta_load_casualties(ejecta_thickness, population, sheltered_fraction)
+    # Her grid hücresinde tehlike oranları * nüfus (önbellekli), barınma oranıyla birleştir
+    exposure = stage_exposure(*asteroid_key, impact_lat, impact_lng, grid_resolution_km)
+    casualties_by_hazard.update(shelter_weighted_casualties(exposure, 1 - unsheltered_fraction))
     
     # Tsunami (ayrı hesaplama - kıyı bölgeleri için)
     if 'tsunami' in applicable_hazards and is_ocean:
-        # Basitleştirilmiş tsunami kayıp tahmini
-        tsunami_data = check_tsunami_risk(impact_lat, impact_lng, crater_diameter_m / 1000, energy_data['kinetic_energy_joules'])
-        tsunami_casualties = estimate_population_affected(
-            impact_lat, impact_lng, 
-            {'total_destruction_km': 0, 'heavy_damage_km': 0, 'moderate_damage_km': 0, 'light_damage_km': 0},
-            is_ocean, ocean_name,
-            tsunami_data.get('_internal_tsunami_height', 0),
-            tsunami_data.get('_internal_tsunami_range', 0)
+        casualties_by_hazard['tsunami'] = stage_tsunami_casualties(
+            impact_lat, impact_lng, crater_diameter_m / 1000,
+            energy_data['kinetic_energy_joules'], ocean_name
         )
-        casualties_by_hazard['tsunami'] = tsunami_casualties.get('estimated_casualties', 0)
     
     # ========== ADIM 6: TOPLAMA VE RAPORLAMA ==========
-    # Her tehlikeden en yüksek kayıp sayısını al (çakışmaları önlemek için)
-    # Not: Gerçek Rumpf metodolojisinde daha karmaşık bir birleştirme yapılır
-    total_casualties = max(casualties_by_hazard.values())  # En yıkıcı tehlike
-    
-    # Alternatif: Tüm tehlikelerin toplamı (üst sınır tahmini)
-    total_casualties_sum = sum(casualties_by_hazard.values())
-    
-    # Ortalama olarak en yüksek ve toplamın ortasını alalım
-    total_casualties = (total_casualties + total_casualties_sum) / 3
+    total_casualties = combine_hazard_casualties(casualties_by_hazard)
     
-    return {
+    results = {
         'impact_type': impact_type,
         'kinetic_energy_mt': energy_data['tnt_megatons'],
         'total_casualties': int(total_casualties),
@@ -1806,11 +2606,19 @@ def calculate_advanced_impact_assessment(
             'impact_location': f"{impact_lat:.2f}°, {impact_lng:.2f}°",
             'crater_diameter_m': crater_diameter_m,
             'airburst_altitude_km': airburst_altitude_km,
+            'entry_energy_fraction': round(entry_outcome['energy_fraction'], 4),
+            'entry_ground_mass_fraction': round(entry_outcome['ground_mass_fraction'], 4),
+            'entry_model': entry_outcome['source'],
             'seismic_magnitude': round(seismic_magnitude, 2),
             'unsheltered_fraction': unsheltered_fraction,
-            'grid_cells_analyzed': len(grid_cells)
+            'grid_cells_analyzed': cell_count
         }
     }
+    if contours:
+        results['contours'] = hazard_contours(
+            asteroid_key, impact_lat, impact_lng, grid_resolution_km, contour_vertex_budget
+        )
+    return results
 
 
 def format_results_as_markdown(results):
@@ -1855,6 +2663,392 @@ def format_results_as_markdown(results):
     return markdown
 
 
+# ============================================================================
+# RADYAL TEHLİKE PROFİLİ VE BÖLGESEL RİSK HARİTASI (FFT KONVOLÜSYON)
+# ============================================================================
+
+def applicable_grid_hazards(source):
+    """Grid üzerinde hücre bazında değerlendirilen tehlikeler (tsunami ayrı hesaplanır)."""
+    hazards = [h for h in source['applicable_hazards'] if h != 'tsunami']
+    if source['crater_diameter_m'] <= 0 and 'ejecta' in hazards:
+        hazards.remove('ejecta')
+    return hazards
+
+
+def _cell_hazard_rates(source, hazards, distance_m):
+    """
+    Tek bir hücre için assessment döngüsüyle aynı kurallar, birim nüfus başına.
+    
+    Tüm hassasiyet modelleri korunmasız ve korunaklı nüfusta doğrusaldır; bu yüzden her
+    tehlike için (korunmasız oran, korunaklı oran) ikilisi döner ve herhangi bir
+    unsheltered_fraction için kayıp = (1-s) * oran_k + s * oran_ş olarak birleştirilir.
+    """
+    energy = source['kinetic_energy_joules']
+    altitude_km = source['airburst_altitude_km']
+    rates = {}
+    
+    if 'cratering' in hazards:
+        crater_rate = crater_casualties(source['crater_radius_m'], distance_m, 1.0)
+        rates['cratering'] = (crater_rate, crater_rate)
+        if crater_rate >= 0.99:  # Krater içi - diğer tehlikeler hesaplanmaz
+            return rates
+    if 'overpressure' in hazards:
+        overpressure_pa = calculate_overpressure(distance_m, energy, altitude_km)
+        rates['overpressure'] = (overpressure_casualties(overpressure_pa, 1.0, 0.0),
+                                 overpressure_casualties(overpressure_pa, 1.0, 1.0))
+    if 'wind_blast' in hazards:
+        wind_speed_ms = calculate_wind_blast(distance_m, energy, altitude_km)
+        rates['wind_blast'] = (enhanced_fujita_scale_casualties(wind_speed_ms, 1.0, 0.0),
+                               enhanced_fujita_scale_casualties(wind_speed_ms, 1.0, 1.0))
+    if 'thermal_radiation' in hazards:
+        thermal_flux = calculate_thermal_radiation(distance_m, energy, altitude_km)
+        rates['thermal_radiation'] = (thermal_burn_casualties(thermal_flux, 1.0, 0.0),
+                                      thermal_burn_casualties(thermal_flux, 1.0, 1.0))
+    if 'seismic' in hazards:
+        seismic_rate = seismic_casualties(source['seismic_magnitude'], 1.0)
+        rates['seismic'] = (seismic_rate, seismic_rate)
+    if 'ejecta' in hazards:
+        ejecta_thickness = calculate_ejecta_thickness(distance_m, source['crater_diameter_m'])
+        rates['ejecta'] = (ejecta_load_casualties(ejecta_thickness, 1.0, 0.0),
+                           ejecta_load_casualties(ejecta_thickness, 1.0, 1.0))
+    return rates
+
+
+def hazard_rates(source, distance_m):
+    """
+    Mesafe dizisi -> {tehlike: (korunmasız oran dizisi, korunaklı oran dizisi)}.
+    
+    Skaler fonksiyonlar yalnızca benzersiz mesafelerde çağrılır (simetrik ızgaralarda
+    hücre sayısının ~1/8'i), sonuçlar dizinin şekline geri dağıtılır.
+    """
+    distance_m = np.asarray(distance_m, dtype=float)
+    unique_distances, inverse = np.unique(distance_m, return_inverse=True)
+    hazards = applicable_grid_hazards(source)
+    unsheltered = {h: np.zeros(len(unique_distances)) for h in hazards}
+    sheltered = {h: np.zeros(len(unique_distances)) for h in hazards}
+    for k, d in enumerate(unique_distances):
+        for hazard, (rate_u, rate_s) in _cell_hazard_rates(source, hazards, float(d)).items():
+            unsheltered[hazard][k] = rate_u
+            sheltered[hazard][k] = rate_s
+    inverse = inverse.reshape(distance_m.shape)
+    return {h: (unsheltered[h][inverse], sheltered[h][inverse]) for h in hazards}
+
+
+def hazard_intensities(source, distance_m):
+    """
+    Mesafe dizisi -> fiziksel şiddetler: aşırı basınç (Pa), termal akı (J/m²), rüzgar (m/s).
+    
+    hazard_rates gibi skaler fonksiyonlar yalnızca benzersiz mesafelerde çağrılır.
+    """
+    distance_m = np.asarray(distance_m, dtype=float)
+    unique_distances, inverse = np.unique(distance_m, return_inverse=True)
+    energy = source['kinetic_energy_joules']
+    altitude_km = source['airburst_altitude_km']
+    values = np.array([
+        (calculate_overpressure(d, energy, altitude_km),
+         calculate_thermal_radiation(d, energy, altitude_km),
+         calculate_wind_blast(d, energy, altitude_km))
+        for d in unique_distances.tolist()
+    ]).reshape(-1, 3)
+    inverse = inverse.reshape(distance_m.shape)
+    return {
+        'overpressure': values[:, 0][inverse],
+        'thermal': values[:, 1][inverse],
+        'wind': values[:, 2][inverse]
+    }
+
+
+def blend_shelter(rates, sheltered_fraction):
+    """(korunmasız, korunaklı) oran ikililerini verilen barınma oranıyla birleştir."""
+    return {
+        hazard: (1 - sheltered_fraction) * rate_u + sheltered_fraction * rate_s
+        for hazard, (rate_u, rate_s) in rates.items()
+    }
+
+
+class HazardProfile:
+    """
+    Birim nüfus başına kayıp oranlarının mesafeye göre radyal profili.
+    
+    Tehlike şiddetleri yalnızca çarpma noktasına olan mesafeye bağlıdır; bu yüzden oranlar
+    ince bir yarıçap ızgarasında bir kez örneklenir ve herhangi bir mesafe dizisi için
+    vektörel olarak okunur (hassasiyet: step_m).
+    """
+    def __init__(self, source, step_m=100.0):
+        self.source = source
+        self.step_m = step_m
+        self.max_distance_m = source['max_radius_km'] * 1000
+        self.radii = np.arange(0, self.max_distance_m + step_m, step_m)
+        self.rates = hazard_rates(source, self.radii)
+        self._intensities = None
+        self._intensities_lock = threading.Lock()
+    
+    def intensities(self):
+        """
+        Profil yarıçaplarında fiziksel şiddetler; ilk kullanımda bir kez örneklenir.
+        
+        Profil aşama önbelleğinde thread'ler arasında paylaşılır: örnekleme kilit altında
+        yapılır ve sözlük ancak tamamlandığında yayımlanır.
+        """
+        if self._intensities is None:
+            with self._intensities_lock:
+                if self._intensities is None:
+                    self._intensities = hazard_intensities(self.source, self.radii)
+        return self._intensities
+    
+    def intensities_at(self, distance_m, fields=None):
+        """Mesafe dizisi -> {alan: fiziksel şiddet}; fields verilirse yalnızca o alanlar."""
+        intensities = self.intensities()
+        distance_m = np.asarray(distance_m, dtype=float)
+        return {
+            field: np.interp(distance_m, self.radii, intensities[field], right=0.0)
+            for field in (fields or intensities)
+        }
+    
+    def fractions_at(self, distance_m, sheltered_fraction=0.87):
+        """Mesafe dizisi -> {tehlike: kayıp oranı dizisi}; maksimum yarıçap dışı sıfır."""
+        distance_m = np.asarray(distance_m, dtype=float)
+        index = np.clip(np.rint(distance_m / self.step_m).astype(np.int64), 0, len(self.radii) - 1)
+        inside = distance_m <= self.max_distance_m
+        return {
+            hazard: np.where(inside, fraction[index], 0.0)
+            for hazard, fraction in blend_shelter(self.rates, sheltered_fraction).items()
+        }
+
+
+@lru_cache(maxsize=1)
+def major_city_arrays():
+    """MAJOR_CITIES_POPULATION'ın salt okunur (lat, lng, yoğunluk) dizileri - bir kez oluşturulur."""
+    cities = MAJOR_CITIES_POPULATION.values()
+    arrays = (
+        np.array([c['lat'] for c in cities], dtype=float),
+        np.array([c['lng'] for c in cities], dtype=float),
+        np.array([c['density'] for c in cities], dtype=float)
+    )
+    for array in arrays:
+        array.setflags(write=False)
+    return arrays
+
+
+@lru_cache(maxsize=1)
+def major_city_names():
+    """major_city_arrays ile aynı sıradaki şehir adları."""
+    return tuple(MAJOR_CITIES_POPULATION)
+
+
+def estimate_population_density_array(lats, lngs):
+    """
+    estimate_population_density_simple'ın vektörel karşılığı (kişi/km²).
+    
+    En yakın büyük şehir 300 km içindeyse mesafeyle azalan şehir yoğunluğu,
+    değilse enleme göre kaba tahmin kullanılır.
+    """
+    lats = np.asarray(lats, dtype=float)
+    lngs = np.asarray(lngs, dtype=float)
+    city_lats, city_lngs, city_density = major_city_arrays()
+    
+    nearest_index, nearest_distance = nearest(lats, lngs, city_lats, city_lngs)
+    
+    distance_factor = np.maximum(0.1, 1 - nearest_distance / 300)
+    city_estimate = np.maximum(10, np.floor(city_density[nearest_index] * distance_factor))
+    
+    abs_lat = np.abs(lats)
+    latitude_estimate = np.select([abs_lat < 10, abs_lat < 30, abs_lat < 50], [50, 100, 150], default=5)
+    
+    return np.where(nearest_distance <= 300, city_estimate, latitude_estimate)
+
+
+def fft_convolve_valid(image_fft, fft_shape, kernel, image_shape):
+    """Önceden dönüştürülmüş görüntü ile çekirdeğin FFT konvolüsyonu ('valid' bölge)."""
+    full = np.fft.irfft2(image_fft * np.fft.rfft2(kernel, fft_shape), fft_shape)
+    kh, kw = kernel.shape
+    return full[kh - 1:image_shape[0], kw - 1:image_shape[1]]
+
+
+def calculate_regional_risk_map(
+    diameter_m, density_kg_m3, velocity_ms, angle_deg,
+    lat_min, lat_max, lng_min, lng_max,
+    resolution_km=5, unsheltered_fraction=0.13
+):
+    """
+    Bölgedeki her olası çarpma noktası için beklenen kayıp haritası.
+    
+    Kayıplar, nüfus alanına uygulanan radyal simetrik bir tehlike çekirdeğidir. Çekirdek
+    asteroid için bir kez oluşturulur ve bölgesel nüfus rasterıyla FFT üzerinden konvolüsyon
+    yapılır: her tehlike için bir çarpım, toplamda birkaç FFT.
+    
+    Varsayımlar: kara çarpması (tsunami dahil değil); enlem/boylam ızgarası bölge merkezindeki
+    cos(enlem) ile km'ye çevrilir.
+    """
+    source = build_hazard_source(diameter_m, density_kg_m3, velocity_ms, angle_deg, is_ocean=False)
+    profile = HazardProfile(source, step_m=min(100.0, resolution_km * 250))
+    
+    center_lat = (lat_min + lat_max) / 2
+    km_per_degree_lat = 111.0
+    km_per_degree_lng = 111.0 * max(0.01, math.cos(math.radians(center_lat)))
+    dlat = resolution_km / km_per_degree_lat
+    dlng = resolution_km / km_per_degree_lng
+    
+    # Çekirdek: (2R+1) x (2R+1) hücre, mesafe km ızgarasında
+    radius_cells = int(math.ceil(source['max_radius_km'] / resolution_km))
+    offsets_km = np.arange(-radius_cells, radius_cells + 1) * resolution_km
+    kernel_distance_m = np.hypot(offsets_km[:, None], offsets_km[None, :]) * 1000
+    kernels = profile.fractions_at(kernel_distance_m, 1 - unsheltered_fraction)
+    
+    # Çıktı ızgarası (çarpma noktaları) ve çekirdek yarıçapı kadar dolgulu nüfus rasterı
+    out_lats = np.arange(lat_min, lat_max + dlat / 2, dlat)
+    out_lngs = np.arange(lng_min, lng_max + dlng / 2, dlng)
+    pop_lats = lat_min + np.arange(-radius_cells, len(out_lats) + radius_cells) * dlat
+    pop_lngs = lng_min + np.arange(-radius_cells, len(out_lngs) + radius_cells) * dlng
+    pop_lngs = wrap_lng(pop_lngs)
+    density = estimate_population_density_array(
+        np.clip(pop_lats, -90, 90)[:, None].repeat(len(pop_lngs), axis=1),
+        np.broadcast_to(pop_lngs, (len(pop_lats), len(pop_lngs)))
+    )
+    population = density * resolution_km ** 2
+    
+    fft_shape = (population.shape[0] + kernel_distance_m.shape[0] - 1,
+                 population.shape[1] + kernel_distance_m.shape[1] - 1)
+    population_fft = np.fft.rfft2(population, fft_shape)
+    casualties_by_hazard = {
+        hazard: np.maximum(fft_convolve_valid(population_fft, fft_shape, kernel, population.shape), 0)
+        for hazard, kernel in kernels.items()
+    }
+    total = combine_hazard_casualties(casualties_by_hazard)
+    
+    worst_index = np.unravel_index(int(np.argmax(total)), total.shape)
+    return {
+        'impact_type': source['impact_type'],
+        'kinetic_energy_mt': source['energy_data']['tnt_megatons'],
+        'kernel_radius_km': source['max_radius_km'],
+        'resolution_km': resolution_km,
+        'lats': out_lats.round(4).tolist(),
+        'lngs': out_lngs.round(4).tolist(),
+        'expected_casualties': total.round().astype(np.int64).tolist(),
+        'worst_case': {
+            'lat': round(float(out_lats[worst_index[0]]), 4),
+            'lng': round(float(out_lngs[worst_index[1]]), 4),
+            'casualties': int(total[worst_index]),
+            'casualties_by_hazard': {h: int(c[worst_index]) for h, c in casualties_by_hazard.items()}
+        },
+        'impact_points_evaluated': int(total.size),
+        'note': 'Land impact assumed everywhere; tsunami casualties are not included.'
+    }
+
+
+def rank_impact_locations(
+    diameter_m, density_kg_m3, velocity_ms, angle_deg, locations=None,
+    unsheltered_fraction=0.13, grid_resolution_km=5
+):
+    """
+    Tek asteroid, çok sayıda çarpma noktası: en çok etkilenen konumları sırala.
+    
+    Enerji, atmosferik giriş, çarpma tipi ve tehlike oranları önbellekli aşamalardan gelir
+    (kara/okyanus için en fazla birer kez hesaplanır); her konum için yalnızca nüfus
+    ızgarası ve maruziyet toplamları değerlendirilir.
+    
+    Args:
+        locations: [{'name', 'lat', 'lng', 'is_ocean' (ops.)}, ...]; None ise MAJOR_CITIES_POPULATION
+    """
+    if locations is None:
+        locations = [
+            {'name': name, 'lat': city['lat'], 'lng': city['lng']}
+            for name, city in MAJOR_CITIES_POPULATION.items()
+        ]
+    
+    sheltered_fraction = 1 - unsheltered_fraction
+    sources = {}
+    ranking = []
+    for location in locations:
+        is_ocean = bool(location.get('is_ocean', False))
+        asteroid_key = (diameter_m, density_kg_m3, velocity_ms, angle_deg, is_ocean)
+        source = sources[is_ocean] = stage_hazard_source(*asteroid_key)
+        
+        population = stage_radius_population(location['lat'], location['lng'], source['max_radius_km'], grid_resolution_km)
+        exposure = stage_exposure(*asteroid_key, location['lat'], location['lng'], grid_resolution_km)
+        casualties_by_hazard = shelter_weighted_casualties(exposure, sheltered_fraction)
+        ranking.append({
+            'name': location.get('name', f"{location['lat']:.2f}°, {location['lng']:.2f}°"),
+            'lat': location['lat'],
+            'lng': location['lng'],
+            'impact_type': source['impact_type'],
+            'total_casualties': int(combine_hazard_casualties(casualties_by_hazard)),
+            'casualties_by_hazard': {h: int(c) for h, c in casualties_by_hazard.items()},
+            'population_exposed': int(population.sum())
+        })
+    
+    ranking.sort(key=lambda row: row['total_casualties'], reverse=True)
+    for rank, row in enumerate(ranking, start=1):
+        row['rank'] = rank
+    
+    any_source = next(iter(sources.values())) if sources else None
+    return {
+        'kinetic_energy_mt': any_source['energy_data']['tnt_megatons'] if any_source else 0,
+        'max_radius_km': any_source['max_radius_km'] if any_source else 0,
+        'locations_evaluated': len(ranking),
+        'ranking': ranking,
+        'note': 'Tsunami casualties are not included in the batch ranking.'
+    }
+
+
+# ============================================================================
+# TEHLİKE ALANI KAROLARI (XYZ PNG)
+# ============================================================================
+
+_tile_cache = TileCache()
+
+
+@lru_cache(maxsize=len(FIELD_STYLES))
+def _empty_tile(field):
+    return empty_tile(field)
+
+
+def render_hazard_tile(scenario, field, z, x, y):
+    """
+    Tek karo: piksel merkezlerinin çarpma noktasına mesafesi -> alan değeri -> sınıf -> PNG.
+    
+    Etki yarıçapı dışında kalan karolar hesaplanmadan ortak şeffaf karo ile döner.
+    """
+    profile = stage_hazard_profile(
+        scenario['diameter_m'], scenario['density_kg_m3'], scenario['velocity_ms'],
+        scenario['angle_deg'], scenario['is_ocean']
+    )
+    impact_lat, impact_lng = scenario['impact_lat'], scenario['impact_lng']
+    
+    # Karonun çarpma noktasına en yakın noktası (boylam sarmalı dikkate alınarak)
+    lat_min, lat_max, lng_min, lng_max = tile_bounds(z, x, y)
+    lng_center = (lng_min + lng_max) / 2
+    nearest_lng = lng_center + float(np.clip(wrap_lng(impact_lng - lng_center), lng_min - lng_center, lng_max - lng_center))
+    nearest_lat = min(max(impact_lat, lat_min), lat_max)
+    if haversine_km(impact_lat, impact_lng, nearest_lat, nearest_lng) * 1000 > profile.max_distance_m * 1.01:
+        return _empty_tile(field)
+    
+    lats, lngs = tile_pixel_centers(z, x, y)
+    distance_m = haversine_km(impact_lat, impact_lng, lats, lngs) * 1000
+    if field == 'casualty':
+        fractions = profile.fractions_at(distance_m, 1 - scenario['unsheltered_fraction'])
+        if not fractions:
+            return _empty_tile(field)
+        values = combine_hazard_casualties(fractions) * estimate_population_density_array(lats, lngs)
+    else:
+        values = profile.intensities_at(distance_m, fields=(field,))[field]
+    return encode_indexed_png(classify(values, field), field)
+
+
+def hazard_tile(scenario, field, z, x, y):
+    """Önbellekli karo: anahtar (senaryo özeti, alan, z, x, y)."""
+    key = (scenario_hash(scenario), field, z, x, y)
+    tile = _tile_cache.get(key)
+    if tile is None:
+        tile = render_hazard_tile(scenario, field, z, x, y)
+        _tile_cache.put(key, tile)
+    return key[0], tile
+
+
+def tile_cache_info():
+    return _tile_cache.info()
+
+
 @app.route('/api/calculate_impact', methods=['POST'])
 def calculate_impact():
     """Calculate impact energy and crater size."""
@@ -1932,6 +3126,7 @@ def calculate_impact():
         
         # Tsunami riski kontrolü (önce bunu yap çünkü is_ocean bilgisi gerekli)
         tsunami_data = check_tsunami_risk(impact_lat, impact_lng, crater_diameter_m / 1000, kinetic_energy_joules)
+        tsunami_propagation = tsunami_data.pop('_internal_propagation', None)
         
         # Popülasyon etkisi tahmini (okyanus bilgisi ve tsunami parametreleri ile)
         population_impact = estimate_population_affected(
@@ -1941,7 +3136,8 @@ def calculate_impact():
             tsunami_data['is_ocean_impact'],
             tsunami_data.get('location_type', 'Ocean'),
             tsunami_data.get('_internal_tsunami_height', 0),
-            tsunami_data.get('_internal_tsunami_range', 0)
+            tsunami_data.get('_internal_tsunami_range', 0),
+            tsunami_propagation
         )
         
         return jsonify({
@@ -2038,8 +3234,17 @@ def simulate_entry():
         initial_altitude_m = float(data.get('initial_altitude_m', 100000))
         fragmentation_model = data.get('fragmentation_model', 'pancake').lower()
         time_step = float(data.get('time_step', 0.01))
+        deposition_bin_km = float(data.get('deposition_bin_km', 1.0))
+        profile_only = data.get('profile_only', False)
         
         # Validasyon
+        if not isinstance(profile_only, bool):
+            # bool("false") True olurdu; yalnızca gerçek JSON boolean kabul edilir
+            return jsonify({
+                'success': False,
+                'error': 'profile_only true veya false olmalıdır'
+            }), 400
+        
         if diameter_m <= 0 or diameter_m > 10000:
             return jsonify({
                 'success': False,
@@ -2064,40 +3269,40 @@ def simulate_entry():
                 'error': 'Geçersiz malzeme tipi'
             }), 400
         
-        # Simülasyonu çalıştır
-        try:
-            print(f"\n{'='*60}")
-            print(f"ATMOSPHERIC ENTRY SIMULATION")
-            print(f"{'='*60}")
-            print(f"Diameter: {diameter_m} m")
-            print(f"Velocity: {velocity_ms} m/s ({velocity_ms/1000:.1f} km/s)")
-            print(f"Angle: {entry_angle_deg} deg")
-            print(f"Material: {material_type}")
-            print(f"Fragmentation: {fragmentation_model}")
-            print(f"{'='*60}\n")
-        except:
-            pass
+        if deposition_bin_km < 0.1 or deposition_bin_km > 10:
+            return jsonify({
+                'success': False,
+                'error': 'İrtifa bölmesi 0.1-10 km arasında olmalıdır'
+            }), 400
         
-        results = simulate_atmospheric_entry_advanced(
+        # Simülasyonu çalıştır (aynı anda gelen özdeş istekler tek simülasyonu paylaşır)
+        params = dict(
             diameter_m=diameter_m,
             velocity_ms=velocity_ms,
             entry_angle_deg=entry_angle_deg,
             material_type=material_type,
             initial_altitude_m=initial_altitude_m,
             fragmentation_model=fragmentation_model,
-            dt=time_step
+            dt=time_step,
+            deposition_bin_km=deposition_bin_km,
+            record_history=not profile_only
+        )
+        results = _single_flight.do(
+            'atmospheric_entry', params, lambda: simulate_atmospheric_entry_advanced(**params)
         )
         
-        try:
-            print(f"\nRESULTS:")
-            print(f"  Airburst Altitude: {results['key_results']['airburst_altitude_km']:.1f} km")
-            print(f"  Energy: {results['key_results']['tnt_equivalent_kilotons']:.1f} kt")
-            print(f"  Fragmented: {results['key_results']['fragmented']}")
-            print(f"{'='*60}\n")
-        except:
-            pass
+        logger.info("Atmospheric entry simulation", extra={'fields': {
+            'diameter_m': diameter_m,
+            'velocity_ms': velocity_ms,
+            'entry_angle_deg': entry_angle_deg,
+            'material_type': material_type,
+            'fragmentation_model': fragmentation_model,
+            'airburst_altitude_km': round(results['key_results']['airburst_altitude_km'], 2),
+            'tnt_equivalent_kilotons': round(results['key_results']['tnt_equivalent_kilotons'], 2),
+            'fragmented': results['key_results']['fragmented']
+        }})
         
-        return jsonify(results)
+        return negotiated_response(results)
     
     except KeyError as e:
         return jsonify({
@@ -2106,78 +3311,84 @@ def simulate_entry():
         }), 400
     
     except Exception as e:
-        import traceback
-        traceback.print_exc()
+        logger.exception("Simulation failed")
         return jsonify({
             'success': False,
             'error': f'Simülasyon hatası: {str(e)}'
         }), 500
 
 
+def chelyabinsk_validation_payload():
+    """
+    Çelyabinsk doğrulama yanıtı. Girdiler sabit olduğundan sonuç deterministiktir;
+    başlangıçta bir kez hesaplanıp serileştirilir (precomputed_response).
+    """
+    # Çelyabinsk parametreleri
+    # Kaynak: Brown et al. (2013), Popova et al. (2013)
+    results = simulate_atmospheric_entry_advanced(
+        diameter_m=19,  # 18-20 m
+        velocity_ms=19000,  # ~19 km/s
+        entry_angle_deg=18,  # ~18 derece
+        material_type='chondrite',  # LL kondrit
+        initial_altitude_m=100000,
+        fragmentation_model='pancake',  # Sürekli parçalanma gözlemlendi
+        dt=0.01
+    )
+    
+    # Gözlemsel verilerle karşılaştırma
+    observed = {
+        'airburst_altitude_km': 27.5,  # 27-30 km arası
+        'energy_kilotons': 450,  # 400-500 kt arası
+        'initial_mass_tons': 11000,  # 9,000-13,000 ton
+        'entry_velocity_km_s': 19.0
+    }
+    
+    simulated = {
+        'airburst_altitude_km': results['key_results']['airburst_altitude_km'],
+        'energy_kilotons': results['key_results']['tnt_equivalent_kilotons'],
+        'initial_mass_tons': results['initial_conditions']['initial_mass_kg'] / 1000,
+        'entry_velocity_km_s': results['initial_conditions']['velocity_ms'] / 1000
+    }
+    
+    # Hata hesaplama
+    altitude_error = abs(simulated['airburst_altitude_km'] - observed['airburst_altitude_km']) / observed['airburst_altitude_km'] * 100
+    energy_error = abs(simulated['energy_kilotons'] - observed['energy_kilotons']) / observed['energy_kilotons'] * 100
+    
+    comparison = {
+        'observed': observed,
+        'simulated': simulated,
+        'errors': {
+            'altitude_error_percent': altitude_error,
+            'energy_error_percent': energy_error
+        },
+        'validation': {
+            'altitude_match': altitude_error < 15,  # %15 içinde
+            'energy_match': energy_error < 20,  # %20 içinde
+            'overall_valid': altitude_error < 15 and energy_error < 20
+        }
+    }
+    
+    return {
+        'success': True,
+        'event_name': 'Chelyabinsk Superbolide (2013)',
+        'simulation_results': results,
+        'comparison': comparison,
+        'references': [
+            'Brown et al. (2013) - The Flux of Small Near-Earth Objects Colliding with the Earth',
+            'Popova et al. (2013) - Chelyabinsk Airburst, Damage Assessment, Meteorite Recovery',
+            'Borovička et al. (2013) - The Trajectory, Structure and Origin of the Chelyabinsk Asteroidal Impactor'
+        ]
+    }
+
+
 @app.route('/api/simulate_chelyabinsk', methods=['GET'])
 def simulate_chelyabinsk():
     """Chelyabinsk 2013 event simulation for validation."""
     try:
-        # Çelyabinsk parametreleri
-        # Kaynak: Brown et al. (2013), Popova et al. (2013)
-        results = simulate_atmospheric_entry_advanced(
-            diameter_m=19,  # 18-20 m
-            velocity_ms=19000,  # ~19 km/s
-            entry_angle_deg=18,  # ~18 derece
-            material_type='chondrite',  # LL kondrit
-            initial_altitude_m=100000,
-            fragmentation_model='pancake',  # Sürekli parçalanma gözlemlendi
-            dt=0.01
-        )
-        
-        # Gözlemsel verilerle karşılaştırma
-        observed = {
-            'airburst_altitude_km': 27.5,  # 27-30 km arası
-            'energy_kilotons': 450,  # 400-500 kt arası
-            'initial_mass_tons': 11000,  # 9,000-13,000 ton
-            'entry_velocity_km_s': 19.0
-        }
-        
-        simulated = {
-            'airburst_altitude_km': results['key_results']['airburst_altitude_km'],
-            'energy_kilotons': results['key_results']['tnt_equivalent_kilotons'],
-            'initial_mass_tons': results['initial_conditions']['initial_mass_kg'] / 1000,
-            'entry_velocity_km_s': results['initial_conditions']['velocity_ms'] / 1000
-        }
-        
-        # Hata hesaplama
-        altitude_error = abs(simulated['airburst_altitude_km'] - observed['airburst_altitude_km']) / observed['airburst_altitude_km'] * 100
-        energy_error = abs(simulated['energy_kilotons'] - observed['energy_kilotons']) / observed['energy_kilotons'] * 100
-        
-        comparison = {
-            'observed': observed,
-            'simulated': simulated,
-            'errors': {
-                'altitude_error_percent': altitude_error,
-                'energy_error_percent': energy_error
-            },
-            'validation': {
-                'altitude_match': altitude_error < 15,  # %15 içinde
-                'energy_match': energy_error < 20,  # %20 içinde
-                'overall_valid': altitude_error < 15 and energy_error < 20
-            }
-        }
-        
-        return jsonify({
-            'success': True,
-            'event_name': 'Chelyabinsk Superbolide (2013)',
-            'simulation_results': results,
-            'comparison': comparison,
-            'references': [
-                'Brown et al. (2013) - The Flux of Small Near-Earth Objects Colliding with the Earth',
-                'Popova et al. (2013) - Chelyabinsk Airburst, Damage Assessment, Meteorite Recovery',
-                'Borovička et al. (2013) - The Trajectory, Structure and Origin of the Chelyabinsk Asteroidal Impactor'
-            ]
-        })
+        return precomputed_response(('chelyabinsk',), chelyabinsk_validation_payload)
     
     except Exception as e:
-        import traceback
-        traceback.print_exc()
+        logger.exception("Simulation failed")
         return jsonify({
             'success': False,
             'error': f'Simülasyon hatası: {str(e)}'
@@ -2203,6 +3414,20 @@ def calculate_advanced_impact():
         unsheltered_fraction = float(data.get('unsheltered_fraction', 0.13))
         grid_resolution_km = float(data.get('grid_resolution_km', 5))
         return_markdown = data.get('return_markdown', False)
+        include_contours = data.get('include_contours', False)
+        if not isinstance(include_contours, bool):
+            # bool("false") True olurdu; yalnızca gerçek JSON boolean kabul edilir
+            return jsonify({
+                'success': False,
+                'error': 'include_contours true veya false olmalıdır'
+            }), 400
+        try:
+            contour_vertex_budget = int(data.get('contour_vertex_budget', DEFAULT_CONTOUR_VERTEX_BUDGET))
+        except (TypeError, ValueError):
+            return jsonify({
+                'success': False,
+                'error': 'Kontur köşe bütçesi bir tam sayı olmalıdır'
+            }), 400
         
         # Parametre validasyonu
         if diameter_m <= 0 or diameter_m > 10000:
@@ -2229,21 +3454,14 @@ def calculate_advanced_impact():
                 'error': 'Geçersiz koordinatlar'
             }), 400
         
-        # Gelişmiş impact assessment hesapla
-        try:
-            print(f"\n{'='*60}")
-            print(f"RUMPF METHODOLOGY - ADVANCED IMPACT ASSESSMENT")
-            print(f"{'='*60}")
-            print(f"Diameter: {diameter_m} m")
-            print(f"Density: {density_kg_m3} kg/m3")
-            print(f"Velocity: {velocity_ms} m/s")
-            print(f"Angle: {angle_deg} deg")
-            print(f"Location: {impact_lat:.2f}, {impact_lng:.2f}")
-            print(f"{'='*60}\n")
-        except:
-            pass  # Windows encoding hatalarını yoksay
-        
-        results = calculate_advanced_impact_assessment(
+        if not 50 <= contour_vertex_budget <= MAX_CONTOUR_VERTEX_BUDGET:
+            return jsonify({
+                'success': False,
+                'error': f'Kontur köşe bütçesi 50-{MAX_CONTOUR_VERTEX_BUDGET:,} arasında olmalıdır'
+            }), 400
+        
+        # Gelişmiş impact assessment hesapla (aynı anda gelen özdeş istekler tek hesaplamayı paylaşır)
+        params = dict(
             diameter_m=diameter_m,
             density_kg_m3=density_kg_m3,
             velocity_ms=velocity_ms,
@@ -2252,29 +3470,37 @@ def calculate_advanced_impact():
             impact_lng=impact_lng,
             water_depth_m=water_depth_m,
             unsheltered_fraction=unsheltered_fraction,
-            grid_resolution_km=grid_resolution_km
+            grid_resolution_km=grid_resolution_km,
+            contours=include_contours,
+            contour_vertex_budget=contour_vertex_budget
+        )
+        results = _single_flight.do(
+            'advanced_impact', params, lambda: calculate_advanced_impact_assessment(**params)
         )
         
-        try:
-            print(f"\nRESULTS:")
-            print(f"  Impact Type: {results['impact_type']}")
-            print(f"  Energy: {results['kinetic_energy_mt']:.2f} MT")
-            print(f"  Total Casualties: {results['total_casualties']:,}")
-            print(f"{'='*60}\n")
-        except:
-            pass  # Windows encoding hatalarını yoksay
+        logger.info("Advanced impact assessment", extra={'fields': {
+            'diameter_m': diameter_m,
+            'density_kg_m3': density_kg_m3,
+            'velocity_ms': velocity_ms,
+            'angle_deg': angle_deg,
+            'impact_lat': round(impact_lat, 2),
+            'impact_lng': round(impact_lng, 2),
+            'impact_type': results['impact_type'],
+            'kinetic_energy_mt': round(results['kinetic_energy_mt'], 2),
+            'total_casualties': results['total_casualties']
+        }})
         
         if return_markdown:
             # Markdown formatında döndür
             markdown_output = format_results_as_markdown(results)
-            return jsonify({
+            return negotiated_response({
                 'success': True,
                 'markdown': markdown_output,
                 'results': results
             })
         else:
-            # JSON formatında döndür
-            return jsonify({
+            # JSON (veya istemci isterse MessagePack) formatında döndür
+            return negotiated_response({
                 'success': True,
                 'results': results
             })
@@ -2286,14 +3512,554 @@ def calculate_advanced_impact():
         }), 400
     
     except Exception as e:
-        import traceback
-        traceback.print_exc()
+        logger.exception("Advanced impact assessment failed")
         return jsonify({
             'success': False,
             'error': f'Hesaplama hatası: {str(e)}'
         }), 500
 
 
+@app.route('/api/regional_risk_map', methods=['POST'])
+def regional_risk_map():
+    """Expected casualties for every impact point in a region (FFT convolution)."""
+    try:
+        data = request.get_json()
+        
+        diameter_m = float(data.get('diameter_m'))
+        density_kg_m3 = float(data.get('density_kg_m3', 3000))
+        velocity_ms = float(data.get('velocity_ms'))
+        angle_deg = float(data.get('angle_deg', 45))
+        lat_min = float(data.get('lat_min'))
+        lat_max = float(data.get('lat_max'))
+        lng_min = float(data.get('lng_min'))
+        lng_max = float(data.get('lng_max'))
+        resolution_km = float(data.get('resolution_km', 5))
+        unsheltered_fraction = float(data.get('unsheltered_fraction', 0.13))
+        
+        if diameter_m <= 0 or diameter_m > 10000:
+            return jsonify({
+                'success': False,
+                'error': 'Asteroid çapı 0-10,000 metre arasında olmalıdır'
+            }), 400
+        
+        if velocity_ms <= 0 or velocity_ms > 100000:
+            return jsonify({
+                'success': False,
+                'error': 'Çarpma hızı 0-100,000 m/s arasında olmalıdır'
+            }), 400
+        
+        if not (-90 <= lat_min < lat_max <= 90) or not (-180 <= lng_min < lng_max <= 180):
+            return jsonify({
+                'success': False,
+                'error': 'Geçersiz bölge sınırları'
+            }), 400
+        
+        if resolution_km < 1 or resolution_km > 50:
+            return jsonify({
+                'success': False,
+                'error': 'Çözünürlük 1-50 km arasında olmalıdır'
+            }), 400
+        
+        rows = (lat_max - lat_min) * 111.0 / resolution_km
+        cols = (lng_max - lng_min) * 111.0 * math.cos(math.radians((lat_min + lat_max) / 2)) / resolution_km
+        if rows * cols > 250000:
+            return jsonify({
+                'success': False,
+                'error': 'Bölge çok büyük: en fazla 250,000 çarpma noktası (çözünürlüğü düşürün)'
+            }), 400
+        
+        results = calculate_regional_risk_map(
+            diameter_m, density_kg_m3, velocity_ms, angle_deg,
+            lat_min, lat_max, lng_min, lng_max,
+            resolution_km=resolution_km,
+            unsheltered_fraction=unsheltered_fraction
+        )
+        
+        logger.info("Regional risk map", extra={'fields': {
+            'diameter_m': diameter_m,
+            'velocity_ms': velocity_ms,
+            'resolution_km': resolution_km,
+            'impact_points': results['impact_points_evaluated'],
+            'worst_casualties': results['worst_case']['casualties']
+        }})
+        
+        return negotiated_response({
+            'success': True,
+            'results': results
+        })
+    
+    except (KeyError, TypeError, ValueError) as e:
+        return jsonify({
+            'success': False,
+            'error': f'Eksik veya geçersiz parametre: {str(e)}'
+        }), 400
+    
+    except Exception as e:
+        logger.exception("Regional risk map failed")
+        return jsonify({
+            'success': False,
+            'error': f'Hesaplama hatası: {str(e)}'
+        }), 500
+
+
+@app.route('/api/rank_impact_locations', methods=['POST'])
+def rank_locations():
+    """Rank impact locations (default: all major cities) by expected casualties."""
+    try:
+        data = request.get_json()
+        
+        diameter_m = float(data.get('diameter_m'))
+        density_kg_m3 = float(data.get('density_kg_m3', 3000))
+        velocity_ms = float(data.get('velocity_ms'))
+        angle_deg = float(data.get('angle_deg', 45))
+        unsheltered_fraction = float(data.get('unsheltered_fraction', 0.13))
+        grid_resolution_km = float(data.get('grid_resolution_km', 5))
+        locations = data.get('locations')
+        
+        if diameter_m <= 0 or diameter_m > 10000:
+            return jsonify({
+                'success': False,
+                'error': 'Asteroid çapı 0-10,000 metre arasında olmalıdır'
+            }), 400
+        
+        if velocity_ms <= 0 or velocity_ms > 100000:
+            return jsonify({
+                'success': False,
+                'error': 'Çarpma hızı 0-100,000 m/s arasında olmalıdır'
+            }), 400
+        
+        if grid_resolution_km < 1 or grid_resolution_km > 50:
+            return jsonify({
+                'success': False,
+                'error': 'Grid çözünürlüğü 1-50 km arasında olmalıdır'
+            }), 400
+        
+        if locations is not None:
+            if not isinstance(locations, list) or not 0 < len(locations) <= 500:
+                return jsonify({
+                    'success': False,
+                    'error': 'locations 1-500 konumluk bir liste olmalıdır'
+                }), 400
+            locations = [
+                {
+                    'name': loc.get('name') or f"{float(loc['lat']):.2f}°, {float(loc['lng']):.2f}°",
+                    'lat': float(loc['lat']),
+                    'lng': float(loc['lng']),
+                    'is_ocean': bool(loc.get('is_ocean', False))
+                }
+                for loc in locations
+            ]
+            if any(abs(loc['lat']) > 90 or abs(loc['lng']) > 180 for loc in locations):
+                return jsonify({
+                    'success': False,
+                    'error': 'Geçersiz koordinatlar'
+                }), 400
+        
+        results = rank_impact_locations(
+            diameter_m, density_kg_m3, velocity_ms, angle_deg, locations,
+            unsheltered_fraction=unsheltered_fraction,
+            grid_resolution_km=grid_resolution_km
+        )
+        
+        logger.info("Impact location ranking", extra={'fields': {
+            'diameter_m': diameter_m,
+            'velocity_ms': velocity_ms,
+            'locations': results['locations_evaluated'],
+            'top_location': results['ranking'][0]['name'] if results['ranking'] else None
+        }})
+        
+        return negotiated_response({
+            'success': True,
+            'results': results
+        })
+    
+    except (KeyError, TypeError, ValueError) as e:
+        return jsonify({
+            'success': False,
+            'error': f'Eksik veya geçersiz parametre: {str(e)}'
+        }), 400
+    
+    except Exception as e:
+        logger.exception("Impact location ranking failed")
+        return jsonify({
+            'success': False,
+            'error': f'Hesaplama hatası: {str(e)}'
+        }), 500
+
+
+@app.route('/api/tsunami_propagation', methods=['POST'])
+def tsunami_propagation():
+    """
+    Okyanus çarpması için kıyı hücresi başına tsunami varış süresi ve dalga yüksekliği.
+    
+    Yanıt: özet + ulaşılan kıyı hücreleri için paralel diziler (lat, lng, arrival_min, height_m)
+    """
+    try:
+        data = request.get_json()
+        
+        diameter_m = float(data.get('diameter_m'))
+        density_kg_m3 = float(data.get('density_kg_m3', 3000))
+        velocity_ms = float(data.get('velocity_ms'))
+        angle_deg = float(data.get('angle_deg', 45))
+        impact_lat = float(data.get('impact_lat'))
+        impact_lng = float(data.get('impact_lng'))
+        
+        if diameter_m <= 0 or diameter_m > 10000:
+            return jsonify({
+                'success': False,
+                'error': 'Asteroid çapı 0-10,000 metre arasında olmalıdır'
+            }), 400
+        
+        if velocity_ms <= 0 or velocity_ms > 100000:
+            return jsonify({
+                'success': False,
+                'error': 'Çarpma hızı 0-100,000 m/s arasında olmalıdır'
+            }), 400
+        
+        if abs(impact_lat) > 90 or abs(impact_lng) > 180:
+            return jsonify({
+                'success': False,
+                'error': 'Geçersiz koordinatlar'
+            }), 400
+        
+        if get_tsunami_engine() is None:
+            return jsonify({
+                'success': False,
+                'error': 'Bathimetri rasteri yüklenemedi'
+            }), 500
+        
+        is_ocean, ocean_name = stage_location(impact_lat, impact_lng)
+        source = stage_hazard_source(diameter_m, density_kg_m3, velocity_ms, angle_deg, is_ocean)
+        tsunami_data = check_tsunami_risk(
+            impact_lat, impact_lng, source['crater_diameter_m'] / 1000, source['kinetic_energy_joules'],
+            ocean_check=(is_ocean, ocean_name)
+        )
+        propagation = tsunami_data.pop('_internal_propagation', None)
+        
+        coastal_cells = {'lat': [], 'lng': [], 'arrival_min': [], 'height_m': []}
+        if propagation is not None:
+            reached = propagation['reached']
+            order = np.argsort(propagation['arrival_s'][reached], kind='stable')
+            coastal_cells = {
+                'lat': propagation['coast_lat'][reached][order].tolist(),
+                'lng': propagation['coast_lng'][reached][order].tolist(),
+                'arrival_min': np.round(propagation['arrival_s'][reached][order].astype(float) / 60, 1).tolist(),
+                'height_m': np.round(propagation['height_m'][reached][order], 2).tolist()
+            }
+        
+        logger.info("Tsunami propagation", extra={'fields': {
+            'lat': round(impact_lat, 2), 'lng': round(impact_lng, 2),
+            'is_ocean': is_ocean,
+            'coastal_cells': len(coastal_cells['lat'])
+        }})
+        
+        return negotiated_response({
+            'success': True,
+            'tsunami_data': {
+                key: value for key, value in tsunami_data.items() if not key.startswith('_internal')
+            },
+            'coastal_cells': coastal_cells
+        })
+    
+    except (KeyError, TypeError) as e:
+        return jsonify({
+            'success': False,
+            'error': f'Eksik parametre: {str(e)}'
+        }), 400
+    
+    except Exception as e:
+        logger.exception("Tsunami propagation failed")
+        return jsonify({
+            'success': False,
+            'error': f'Hesaplama hatası: {str(e)}'
+        }), 500
+
+
+@app.route('/api/hazard_tiles/<field>/<int:z>/<int:x>/<int:y>.png', methods=['GET'])
+def hazard_tiles(field, z, x, y):
+    """
+    Senaryo tehlike alanının XYZ PNG karosu (Leaflet L.tileLayer ile kullanılır).
+    
+    Alanlar: overpressure, thermal, wind, casualty
+    Query: diameter_m, velocity_ms, density_kg_m3, angle_deg, impact_lat, impact_lng,
+           is_ocean (true|false), unsheltered_fraction
+    """
+    try:
+        if field not in FIELD_STYLES:
+            return jsonify({
+                'success': False,
+                'error': f"Geçersiz alan: {field} (geçerli: {', '.join(FIELD_STYLES)})"
+            }), 400
+        
+        if not valid_tile(z, x, y):
+            return jsonify({
+                'success': False,
+                'error': 'Geçersiz karo koordinatları'
+            }), 400
+        
+        args = request.args
+        scenario = {
+            'diameter_m': float(args.get('diameter_m')),
+            'velocity_ms': float(args.get('velocity_ms')),
+            'density_kg_m3': float(args.get('density_kg_m3', 3000)),
+            'angle_deg': float(args.get('angle_deg', 45)),
+            'impact_lat': float(args.get('impact_lat')),
+            'impact_lng': float(args.get('impact_lng')),
+            'is_ocean': args.get('is_ocean', 'false').lower() == 'true',
+            'unsheltered_fraction': float(args.get('unsheltered_fraction', 0.13))
+        }
+        
+        # float() 'nan' ve 'inf' metinlerini kabul eder; aralık karşılaştırmaları NaN'ı yakalamaz
+        if not all(math.isfinite(value) for value in scenario.values() if isinstance(value, float)):
+            return jsonify({
+                'success': False,
+                'error': 'Sayısal parametreler sonlu olmalıdır'
+            }), 400
+        
+        if scenario['diameter_m'] <= 0 or scenario['diameter_m'] > 10000:
+            return jsonify({
+                'success': False,
+                'error': 'Asteroid çapı 0-10,000 metre arasında olmalıdır'
+            }), 400
+        
+        if scenario['velocity_ms'] <= 0 or scenario['velocity_ms'] > 100000:
+            return jsonify({
+                'success': False,
+                'error': 'Çarpma hızı 0-100,000 m/s arasında olmalıdır'
+            }), 400
+        
+        if abs(scenario['impact_lat']) > 90 or abs(scenario['impact_lng']) > 180:
+            return jsonify({
+                'success': False,
+                'error': 'Geçersiz koordinatlar'
+            }), 400
+        
+        if not 0 <= scenario['unsheltered_fraction'] <= 1:
+            return jsonify({
+                'success': False,
+                'error': 'Korunmasız nüfus oranı 0-1 arasında olmalıdır'
+            }), 400
+        
+        digest, tile = hazard_tile(scenario, field, z, x, y)
+        etag = f"{digest}-{field}-{z}-{x}-{y}"
+        if request.if_none_match.contains(etag):
+            response = app.response_class(status=304)
+        else:
+            response = app.response_class(tile, mimetype='image/png')
+        response.set_etag(etag)
+        response.headers['Cache-Control'] = f"public, max-age={app.config['PRECOMPUTED_MAX_AGE']}"
+        return response
+    
+    except (KeyError, TypeError, ValueError) as e:
+        return jsonify({
+            'success': False,
+            'error': f'Eksik veya geçersiz parametre: {str(e)}'
+        }), 400
+    
+    except Exception as e:
+        logger.exception("Hazard tile rendering failed")
+        return jsonify({
+            'success': False,
+            'error': f'Hesaplama hatası: {str(e)}'
+        }), 500
+
+
+@app.route('/api/catalog', methods=['GET'])
+def catalog_query():
+    """
+    Asteroit/kuyruklu yıldız kataloğunu filtrele ve sırala (vektörel, sütun görünümü üzerinde).
+    
+    Query: kind (asteroid|comet|impactor, virgülle birden fazla), hazardous (true|false),
+           min_diameter_m, max_diameter_m, sort, density_class, order (desc|asc), limit
+    """
+    try:
+        kinds = [k for k in request.args.get('kind', '').split(',') if k]
+        hazardous = request.args.get('hazardous')
+        sort = request.args.get('sort', 'tnt_megatons')
+        density_class = request.args.get('density_class') or None
+        limit = int(request.args.get('limit', 20))
+        min_diameter_m = request.args.get('min_diameter_m', type=float)
+        max_diameter_m = request.args.get('max_diameter_m', type=float)
+        
+        if sort not in RANKABLE_FIELDS:
+            return jsonify({
+                'success': False,
+                'error': f"Geçersiz sıralama alanı. Geçerli: {', '.join(RANKABLE_FIELDS)}"
+            }), 400
+        
+        if density_class is not None and density_class not in DENSITY_CLASSES:
+            return jsonify({
+                'success': False,
+                'error': f"Geçersiz yoğunluk sınıfı. Geçerli: {', '.join(DENSITY_CLASSES)}"
+            }), 400
+        
+        if not 1 <= limit <= 100:
+            return jsonify({
+                'success': False,
+                'error': 'limit 1-100 arasında olmalı'
+            }), 400
+        
+        catalog = get_catalog()
+        objects = catalog.query(
+            sort=sort,
+            density_class=density_class,
+            descending=request.args.get('order', 'desc') != 'asc',
+            limit=limit,
+            kinds=kinds or None,
+            hazardous=None if hazardous is None else hazardous.lower() == 'true',
+            min_diameter_m=min_diameter_m,
+            max_diameter_m=max_diameter_m
+        )
+        
+        return jsonify({
+            'success': True,
+            'count': len(objects),
+            'catalog_size': len(catalog),
+            'objects': [dict(obj.to_dict(), key=obj.key, kind=obj.kind) for obj in objects]
+        })
+    
+    except ValueError as e:
+        return jsonify({
+            'success': False,
+            'error': f'Geçersiz parametre: {str(e)}'
+        }), 400
+    
+    except Exception as e:
+        logger.exception("Catalog query failed")
+        return jsonify({
+            'success': False,
+            'error': f'Katalog hatası: {str(e)}'
+        }), 500
+
+
+@app.route('/api/upstream_budget', methods=['GET'])
+def upstream_budget():
+    """NASA ve GeoNames için kalan istek bütçesi (tükendiğinde çağrılar yapılmaz, yedek veri kullanılır)."""
+    return jsonify({
+        'success': True,
+        'budgets': upstream_budget_report()
+    })
+
+
+# ============================================================================
+# ÖNCEDEN HESAPLANMIŞ YANITLAR (ETag / Cache-Control / 304)
+# ============================================================================
+
+_PRECOMPUTED = {}
+_PRECOMPUTED_LOCK = threading.Lock()
+
+
+def get_precomputed(key, build):
+    """Anahtar için PrecomputedResponse; yoksa bir kez oluştur (uygulama bağlamı gerekir)."""
+    precomputed = _PRECOMPUTED.get(key)
+    if precomputed is None:
+        with _PRECOMPUTED_LOCK:
+            precomputed = _PRECOMPUTED.get(key)
+            if precomputed is None:
+                precomputed = _PRECOMPUTED[key] = PrecomputedResponse(build())
+    return precomputed
+
+
+def precomputed_response(key, build):
+    """
+    Deterministik bir endpoint yanıtını ilk kullanımda (veya warm-up'ta) bir kez oluştur,
+    sonra tüm istekler için serileştirilmiş/sıkıştırılmış gövdeyi ETag ile sun.
+    """
+    return get_precomputed(key, build).serve()
+
+
+def precomputed_entries():
+    """Warm-up sırasında hazırlanan tüm sabit yanıtlar: (anahtar, oluşturucu)."""
+    entries = [(('chelyabinsk',), chelyabinsk_validation_payload)]
+    database_keys = (
+        [('solar', key) for key in SOLAR_SYSTEM_ASTEROIDS]
+        + [('comets', key) for key in COMETS]
+        + [('chicxulub', None), ('sample', None)]
+    )
+    for source, object_key in database_keys:
+        entries.append((
+            ('asteroid', source, object_key),
+            lambda source=source, object_key=object_key: asteroid_database_payload(source, object_key)
+        ))
+    return entries
+
+
+# ============================================================================
+# WARM-UP: FORK ÖNCESİ ÖNBELLEK HAZIRLAMA
+# ============================================================================
+
+_WARMUP_TASKS = []
+
+
+def warmup_task(func):
+    """warm_up() sırasında çalıştırılacak bir hazırlık adımı kaydet."""
+    _WARMUP_TASKS.append(func)
+    return func
+
+
+@warmup_task
+def _warm_templates():
+    for template_name in ('index.html', 'formulas.html'):
+        app.jinja_env.get_template(template_name)
+
+
+@warmup_task
+def _warm_materials():
+    AsteroidMaterial.get_registry()
+
+
+@warmup_task
+def _warm_city_arrays():
+    major_city_arrays()
+
+
+@warmup_task
+def _warm_catalog():
+    get_catalog()
+
+
+@warmup_task
+def _warm_airburst_surrogate():
+    get_airburst_surrogate()
+
+
+@warmup_task
+def _warm_tsunami_engine():
+    get_tsunami_engine()
+
+
+@warmup_task
+def _warm_coastal_segments():
+    get_coastal_segments()
+
+
+@warmup_task
+def _warm_precomputed_responses():
+    with app.app_context():
+        for key, build in precomputed_entries():
+            get_precomputed(key, build)
+
+
+def warm_up():
+    """
+    Soğuk başlangıç maliyetlerini ilk istekten önce öde.
+    
+    gunicorn preload_app ile master süreçte fork'tan önce çağrılır; böylece
+    oluşturulan tablolar ve önbellekler worker'lar arasında copy-on-write paylaşılır.
+    """
+    timings = {}
+    for task in _WARMUP_TASKS:
+        started = time.perf_counter()
+        try:
+            task()
+        except Exception as e:
+            logger.warning("Warm-up task failed", extra={'fields': {'task': task.__name__, 'error': str(e)}})
+            continue
+        timings[task.__name__] = round((time.perf_counter() - started) * 1000, 1)
+    logger.info("Warm-up complete", extra={'fields': {'timings_ms': timings}})
+    return timings
+
+
 @app.route('/')
 def index():
     return render_template('index.html')
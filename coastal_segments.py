@@ -0,0 +1,223 @@
+"""
+Coastal Population Segments
+Preprocessed coastline segments with inland population, queried through a lat/lng bucket index
+
+Kıyı şeridi 0.1° hücrelere bölünür: denize komşu her kara hücresi bir segmenttir.
+Her segment için kıyı uzunluğu (denize bakan hücre kenarları), COASTAL_STRIP_KM
+iç şerit içindeki nüfus ve tsunami yayılımında kullanılan en yakın bathimetri kıyı
+hücresi saklanır. Segmentler INDEX_CELL_DEG boyutlu enlem/boylam kovalarına göre sıralı
+tutulur; bir sorgu yalnızca yarıçapın enlem ve boylam sınırları içindeki kovaların
+segmentleri için mesafe hesaplar.
+
+Segment dosyası oluşturma (global_land_mask yalnızca oluşturma sırasında gerekir):
+    python coastal_segments.py build [--resolution 0.1] [--output data/coastal_segments.npz]
+"""
+
+import argparse
+import math
+import os
+import time
+
+import numpy as np
+
+from geodesy import EARTH_RADIUS_KM, haversine_km
+
+DEFAULT_SEGMENTS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'coastal_segments.npz')
+
+KM_PER_DEG_LAT = math.pi * EARTH_RADIUS_KM / 180
+COASTAL_STRIP_KM = 5.0           # Segment nüfusu kıyıdan bu kadar içeriye kadar sayılır
+COAST_CELL_SEARCH = 2            # Bathimetri kıyı hücresi arama yarıçapı (raster hücresi)
+INDEX_CELL_DEG = 1.0             # Uzamsal indeks kovası (derece)
+
+
+class CoastalSegmentIndex:
+    """
+    Enlem/boylam kovalarına göre sıralı segment dizileri üzerinde yarıçap sorgusu.
+
+    Segmentler satır öncelikli kova numarasına göre sıralanır; cell_start[k]:cell_start[k + 1]
+    k. kovanın segmentleridir. Bir kova satırındaki ardışık kovalar dizide de ardışık olduğu
+    için sorgu her satır için en fazla iki dilim (antimeridyen sarması) okur.
+    """
+
+    def __init__(self, lat, lng, length_km, population, coast_cell, strip_km=COASTAL_STRIP_KM,
+                 cell_deg=INDEX_CELL_DEG):
+        lat = np.asarray(lat, dtype=float)
+        lng = (np.asarray(lng, dtype=float) + 180) % 360 - 180
+        self.cell_deg = float(cell_deg)
+        self.rows = int(math.ceil(180 / self.cell_deg))
+        self.cols = int(math.ceil(360 / self.cell_deg))
+        cell = self._row(lat) * self.cols + self._col(lng)
+        order = np.argsort(cell, kind='stable')
+        self.cell_start = np.concatenate(([0], np.cumsum(np.bincount(cell, minlength=self.rows * self.cols))))
+        self.lat = lat[order]
+        self.lng = np.asarray(lng, dtype=float)[order]
+        self.length_km = np.asarray(length_km, dtype=float)[order]
+        self.population = np.asarray(population, dtype=float)[order]
+        self.coast_cell = np.asarray(coast_cell, dtype=np.int64)[order]
+        self.strip_km = float(strip_km)
+        for array in (self.lat, self.lng, self.length_km, self.population, self.coast_cell, self.cell_start):
+            array.setflags(write=False)
+
+    def _row(self, lat):
+        return np.clip(np.floor((np.asarray(lat) + 90) / self.cell_deg).astype(np.int64), 0, self.rows - 1)
+
+    def _col(self, lng):
+        return np.floor((np.asarray(lng) + 180) / self.cell_deg).astype(np.int64) % self.cols
+
+    def _candidates(self, lat, lng, radius_km):
+        """Yarıçapı kapsayan kovalardaki segment indeksleri."""
+        delta = radius_km / EARTH_RADIUS_KM  # Açısal yarıçap (radyan)
+        row_range = np.arange(self._row(lat - math.degrees(delta)), self._row(lat + math.degrees(delta)) + 1)
+        if abs(lat) + math.degrees(delta) >= 90 or delta >= math.pi / 2:
+            col_ranges = [(0, self.cols - 1)]  # Kutbu içeren başlık: tüm boylamlar
+        else:
+            # Küresel başlığın boylam genişliği: asin(sin δ / cos φ)
+            dlng = math.degrees(math.asin(min(1.0, math.sin(delta) / math.cos(math.radians(lat)))))
+            first = int(self._col(lng - dlng))
+            span = int(math.floor((lng + dlng + 180) / self.cell_deg)) - int(math.floor((lng - dlng + 180) / self.cell_deg))
+            if span >= self.cols - 1:
+                col_ranges = [(0, self.cols - 1)]
+            elif first + span < self.cols:
+                col_ranges = [(first, first + span)]
+            else:
+                col_ranges = [(first, self.cols - 1), (0, first + span - self.cols)]
+        starts = np.concatenate([self.cell_start[row_range * self.cols + c0] for c0, _ in col_ranges])
+        stops = np.concatenate([self.cell_start[row_range * self.cols + c1 + 1] for _, c1 in col_ranges])
+        lengths = stops - starts
+        if not lengths.sum():
+            return np.zeros(0, dtype=np.int64)
+        # Dilimleri tek bir indeks dizisine aç: her dilimin başlangıcından ardışık sayılar
+        offsets = np.repeat(starts - np.concatenate(([0], np.cumsum(lengths)[:-1])), lengths)
+        return np.arange(int(lengths.sum())) + offsets
+
+    @classmethod
+    def load(cls, path=DEFAULT_SEGMENTS_PATH):
+        with np.load(path, allow_pickle=False) as data:
+            return cls(
+                data['lat'], data['lng'], data['length_km'], data['population'],
+                data['coast_cell'], float(data['strip_km'])
+            )
+
+    def __len__(self):
+        return len(self.lat)
+
+    def query_radius(self, lat, lng, radius_km):
+        """
+        Yarıçap içindeki segmentler.
+
+        Returns:
+            (indeksler, mesafeler_km) - indeksler bu nesnenin dizilerine işaret eder
+        """
+        candidates = self._candidates(lat, lng, radius_km)
+        distance_km = haversine_km(lat, lng, self.lat[candidates], self.lng[candidates])
+        inside = distance_km <= radius_km
+        return candidates[inside], distance_km[inside]
+
+    def nearest_distance_km(self, lat, lng, initial_radius_km=100.0):
+        """En yakın segmente büyük daire mesafesi (yarıçap ikiye katlanarak aranır)."""
+        radius_km = initial_radius_km
+        while radius_km < 2 * math.pi * EARTH_RADIUS_KM:
+            _, distance_km = self.query_radius(lat, lng, radius_km)
+            if len(distance_km):
+                return float(distance_km.min())
+            radius_km *= 2
+        return None
+
+
+# ============================================================================
+# SEGMENT OLUŞTURMA
+# ============================================================================
+
+def _coastline_cells(ocean_fraction, lat, resolution_deg):
+    """Denize komşu kara hücreleri ve denize bakan kenar uzunluğu (km)."""
+    from tsunami_engine import OCEAN_FRACTION_THRESHOLD
+
+    ocean = ocean_fraction >= OCEAN_FRACTION_THRESHOLD
+    north = np.zeros_like(ocean)
+    south = np.zeros_like(ocean)
+    north[:-1] = ocean[1:]
+    south[1:] = ocean[:-1]
+    east = np.roll(ocean, -1, axis=1)
+    west = np.roll(ocean, 1, axis=1)
+
+    ns_km = resolution_deg * KM_PER_DEG_LAT
+    ew_km = ns_km * np.cos(np.radians(lat))[:, None]
+    length_km = (north.astype(float) + south) * ns_km + (east.astype(float) + west) * ew_km
+    coastline = ~ocean & (length_km > 0)
+    rows, cols = np.nonzero(coastline)
+    return rows, cols, length_km[coastline]
+
+
+def _nearest_coast_cells(seg_lat, seg_lng, engine):
+    """Her segment için en yakın bathimetri kıyı hücresinin düz indeksi (yoksa -1)."""
+    nlat, nlng = engine.ocean.shape
+    coast = np.zeros(nlat * nlng, dtype=bool)
+    coast[engine.coast_index] = True
+
+    base_i = np.clip(np.round((seg_lat - engine.lat[0]) / engine.lat_step).astype(int), 0, nlat - 1)
+    base_j = np.round((seg_lng - engine.lng[0]) / engine.lng_step).astype(int) % nlng
+    best_cell = np.full(len(seg_lat), -1, dtype=np.int64)
+    best_distance = np.full(len(seg_lat), np.inf)
+    for di in range(-COAST_CELL_SEARCH, COAST_CELL_SEARCH + 1):
+        for dj in range(-COAST_CELL_SEARCH, COAST_CELL_SEARCH + 1):
+            i = base_i + di
+            j = (base_j + dj) % nlng
+            valid = (i >= 0) & (i < nlat)
+            cell = np.where(valid, np.clip(i, 0, nlat - 1) * nlng + j, 0)
+            candidate = valid & coast[cell]
+            distance = haversine_km(seg_lat, seg_lng, engine.lat[np.clip(i, 0, nlat - 1)], engine.lng[j])
+            distance = np.where(candidate, distance, np.inf)
+            better = distance < best_distance
+            best_distance = np.where(better, distance, best_distance)
+            best_cell = np.where(better, cell, best_cell)
+    return best_cell
+
+
+def build_segments(density, resolution_deg=0.1, output_path=DEFAULT_SEGMENTS_PATH):
+    """
+    Kıyı segmentlerini oluştur ve kaydet.
+
+    Args:
+        density: (lats, lngs) -> kişi/km² dizisi döndüren fonksiyon
+                 (estimate_population_density_array ile aynı imza)
+    """
+    from tsunami_engine import TsunamiEngine, land_mask_ocean_fraction
+
+    ocean_fraction = land_mask_ocean_fraction(resolution_deg)
+    lat = -90 + resolution_deg * (np.arange(ocean_fraction.shape[0]) + 0.5)
+    lng = -180 + resolution_deg * (np.arange(ocean_fraction.shape[1]) + 0.5)
+    rows, cols, length_km = _coastline_cells(ocean_fraction, lat, resolution_deg)
+    seg_lat, seg_lng = lat[rows], lng[cols]
+
+    population = density(seg_lat, seg_lng) * length_km * COASTAL_STRIP_KM
+    coast_cell = _nearest_coast_cells(seg_lat, seg_lng, TsunamiEngine.load())
+
+    np.savez_compressed(
+        output_path,
+        lat=seg_lat.astype(np.float32), lng=seg_lng.astype(np.float32),
+        length_km=length_km.astype(np.float32),
+        population=population.astype(np.float32),
+        coast_cell=coast_cell.astype(np.int32),
+        strip_km=np.array(COASTAL_STRIP_KM),
+        resolution_deg=np.array(resolution_deg)
+    )
+    return output_path
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Coastal population segment builder')
+    parser.add_argument('command', choices=['build'])
+    parser.add_argument('--resolution', type=float, default=0.1, help='Segment cell size in degrees')
+    parser.add_argument('--output', default=DEFAULT_SEGMENTS_PATH)
+    args = parser.parse_args()
+
+    from app import estimate_population_density_array
+
+    started = time.perf_counter()
+    path = build_segments(estimate_population_density_array, args.resolution, args.output)
+    print(f"Coastal segments written to {path} ({os.path.getsize(path) / 1024:.1f} KiB, "
+          f"{time.perf_counter() - started:.0f} s)")
+
+
+if __name__ == '__main__':
+    main()
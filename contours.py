@@ -0,0 +1,222 @@
+"""
+Contours for Asteroid Impact Visualizer
+Vectorized marching squares, ring stitching and vertex-budgeted Douglas-Peucker simplification
+
+Tehlike şiddeti ızgarasından (satır = kuzey, sütun = doğu) belirli eşik seviyelerinin
+kapalı halkaları çıkarılır. Hücre durumları numpy ile tek geçişte hesaplanır; yalnızca
+kenar parçalarının halkalara birleştirilmesi Python döngüsüdür (parça sayısı çevre
+uzunluğuyla orantılı). Izgara eşik altı bir kenarlıkla çevrildiği için tüm halkalar kapanır.
+
+Koordinatlar kesirli ızgara indeksidir (satır, sütun); coğrafi dönüşüm çağırana aittir.
+"""
+
+import numpy as np
+
+# Hücre durumu: sol üst*8 + sağ üst*4 + sağ alt*2 + sol alt*1 (köşe >= seviye ise 1).
+# Kenarlar: 0 = üst, 1 = sağ, 2 = alt, 3 = sol. Eyer durumları (5, 10) ayrıca çözülür.
+_CASE_SEGMENTS = {
+    1: ((3, 2),), 2: ((2, 1),), 3: ((3, 1),), 4: ((0, 1),), 6: ((0, 2),), 7: ((3, 0),),
+    8: ((3, 0),), 9: ((0, 2),), 11: ((0, 1),), 12: ((3, 1),), 13: ((2, 1),), 14: ((3, 2),),
+}
+# Eyer: merkez ortalaması seviyenin üstündeyse yüksek köşeler birbirine bağlı sayılır
+_SADDLE_SEGMENTS = {
+    (5, True): ((3, 0), (2, 1)), (5, False): ((3, 2), (0, 1)),
+    (10, True): ((3, 2), (0, 1)), (10, False): ((3, 0), (2, 1)),
+}
+
+MIN_RING_VERTICES = 4  # Kapanış noktası dahil: üçgen
+
+
+def marching_squares(values, level):
+    """
+    Eşik seviyesinin kapalı halkaları.
+
+    Returns:
+        (N, 2) dizilerinden oluşan liste - (satır, sütun), ilk nokta sonda tekrarlanır
+    """
+    values = np.asarray(values, dtype=float)
+    floor = min(float(np.nanmin(values)) if values.size else level, level) - 1.0
+    grid = np.pad(np.nan_to_num(values, nan=floor), 1, constant_values=floor)
+    height, width = grid.shape
+    above = grid >= level
+
+    cases = (above[:-1, :-1] * 8 + above[:-1, 1:] * 4 + above[1:, 1:] * 2 + above[1:, :-1]).astype(np.uint8)
+    horizontal_count = height * (width - 1)
+
+    def edge_key(rows, cols, edge):
+        # Yatay kenar (i, j)-(i, j+1): i * (w-1) + j; dikey kenar (i, j)-(i+1, j): ofset + i * w + j
+        if edge == 0:
+            return rows * (width - 1) + cols
+        if edge == 2:
+            return (rows + 1) * (width - 1) + cols
+        if edge == 3:
+            return horizontal_count + rows * width + cols
+        return horizontal_count + rows * width + cols + 1
+
+    starts, ends = [], []
+    for case, segments in _CASE_SEGMENTS.items():
+        rows, cols = np.nonzero(cases == case)
+        for a, b in segments:
+            starts.append(edge_key(rows, cols, a))
+            ends.append(edge_key(rows, cols, b))
+    for case in (5, 10):
+        rows, cols = np.nonzero(cases == case)
+        center = (grid[rows, cols] + grid[rows, cols + 1] + grid[rows + 1, cols] + grid[rows + 1, cols + 1]) / 4
+        for high in (True, False):
+            pick = (center >= level) == high
+            for a, b in _SADDLE_SEGMENTS[(case, high)]:
+                starts.append(edge_key(rows[pick], cols[pick], a))
+                ends.append(edge_key(rows[pick], cols[pick], b))
+    if not starts:
+        return []
+    starts = np.concatenate(starts)
+    ends = np.concatenate(ends)
+
+    # Kenar noktası konumları (yalnızca kullanılan anahtarlar için, doğrusal enterpolasyon)
+    keys = np.unique(np.concatenate((starts, ends)))
+    is_vertical = keys >= horizontal_count
+    local = np.where(is_vertical, keys - horizontal_count, keys)
+    row0 = np.where(is_vertical, local // width, local // (width - 1))
+    col0 = np.where(is_vertical, local % width, local % (width - 1))
+    row1 = row0 + is_vertical
+    col1 = col0 + ~is_vertical
+    v0, v1 = grid[row0, col0], grid[row1, col1]
+    t = np.clip((level - v0) / (v1 - v0), 0.0, 1.0)
+    points = np.column_stack((row0 + t * (row1 - row0), col0 + t * (col1 - col0))) - 1.0  # Kenarlık çıkarılır
+    point_of = dict(zip(keys.tolist(), range(len(keys))))
+
+    # Her kenar noktası tam iki parçaya aittir -> komşuluk listesi üzerinden halka yürüyüşü
+    neighbours = {}
+    for a, b in zip(starts.tolist(), ends.tolist()):
+        neighbours.setdefault(a, []).append(b)
+        neighbours.setdefault(b, []).append(a)
+    rings = []
+    while neighbours:
+        first, links = neighbours.popitem()
+        ring = [first]
+        previous, current = first, links[0]
+        while current != first:
+            ring.append(current)
+            following = neighbours.pop(current)
+            nxt = following[0] if following[0] != previous else following[1]
+            previous, current = current, nxt
+        ring.append(first)
+        rings.append(points[[point_of[key] for key in ring]])
+    return rings
+
+
+def _douglas_peucker(line, tolerance):
+    """Açık çoklu çizgi için tutulacak noktaların maskesi (yinelemeli, yığın tabanlı)."""
+    keep = np.zeros(len(line), dtype=bool)
+    keep[0] = keep[-1] = True
+    stack = [(0, len(line) - 1)]
+    while stack:
+        start, stop = stack.pop()
+        if stop - start < 2:
+            continue
+        segment = line[stop] - line[start]
+        offsets = line[start + 1:stop] - line[start]
+        norm = np.hypot(*segment)
+        if norm == 0:
+            distance = np.hypot(offsets[:, 0], offsets[:, 1])
+        else:
+            distance = np.abs(segment[0] * offsets[:, 1] - segment[1] * offsets[:, 0]) / norm
+        worst = int(np.argmax(distance))
+        if distance[worst] > tolerance:
+            split = start + 1 + worst
+            keep[split] = True
+            stack.append((start, split))
+            stack.append((split, stop))
+    return keep
+
+
+def simplify_ring(ring, tolerance):
+    """Kapalı halkayı sadeleştir; halka ilk noktaya ve ona en uzak noktaya bölünür."""
+    if len(ring) <= MIN_RING_VERTICES or tolerance <= 0:
+        return ring
+    far = int(np.argmax(np.hypot(*(ring[:-1] - ring[0]).T)))
+    keep = np.zeros(len(ring), dtype=bool)
+    keep[:far + 1] = _douglas_peucker(ring[:far + 1], tolerance)
+    keep[far:] |= _douglas_peucker(ring[far:], tolerance)
+    simplified = ring[keep]
+    return simplified if len(simplified) >= MIN_RING_VERTICES else ring[np.linspace(0, len(ring) - 1, MIN_RING_VERTICES).astype(int)]
+
+
+def ring_area(ring):
+    """İşaretli alan (ayakkabı bağı formülü); pozitif = (sütun, satır) düzleminde saat yönü tersi."""
+    return 0.5 * float(np.dot(ring[:-1, 1], ring[1:, 0]) - np.dot(ring[1:, 1], ring[:-1, 0]))
+
+
+def simplify_to_budget(rings_by_key, vertex_budget, initial_tolerance=0.25):
+    """
+    Tüm halkaları toplam köşe sayısı bütçeye sığana kadar sadeleştir.
+
+    Tolerans (ızgara hücresi biriminde) her turda ikiye katlanır. En düşük toleransta bile
+    sığmayan halkalar (çok sayıda küçük ada) alanı küçükten büyüğe atılır.
+
+    Returns:
+        (aynı anahtarlarla halka listeleri, kullanılan tolerans)
+    """
+    total = sum(len(ring) for rings in rings_by_key.values() for ring in rings)
+    tolerance = 0.0
+    simplified = rings_by_key
+    while total > vertex_budget:
+        tolerance = initial_tolerance if tolerance == 0 else tolerance * 2
+        simplified = {
+            key: [simplify_ring(ring, tolerance) for ring in rings]
+            for key, rings in rings_by_key.items()
+        }
+        total = sum(len(ring) for rings in simplified.values() for ring in rings)
+        if all(len(ring) <= MIN_RING_VERTICES for rings in simplified.values() for ring in rings):
+            break
+
+    if total > vertex_budget:
+        candidates = sorted(
+            ((abs(ring_area(ring)), key, index) for key, rings in simplified.items() for index, ring in enumerate(rings)),
+            key=lambda item: item[0]
+        )
+        dropped = set()
+        for _, key, index in candidates:
+            if total <= vertex_budget:
+                break
+            dropped.add((key, index))
+            total -= len(simplified[key][index])
+        simplified = {
+            key: [ring for index, ring in enumerate(rings) if (key, index) not in dropped]
+            for key, rings in simplified.items()
+        }
+    return simplified, tolerance
+
+
+def _contains(ring, point):
+    """Işın atma ile nokta-halka içerme testi."""
+    y, x = point
+    y0, x0 = ring[:-1, 0], ring[:-1, 1]
+    y1, x1 = ring[1:, 0], ring[1:, 1]
+    crosses = (y0 > y) != (y1 > y)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        x_cross = x0 + (y - y0) * (x1 - x0) / (y1 - y0)
+    return bool(np.count_nonzero(crosses & (x < x_cross)) % 2)
+
+
+def rings_to_polygons(rings):
+    """
+    Halkaları çokgenlere grupla: çift derinlikteki halkalar dış sınır (saat yönü tersi),
+    tek derinliktekiler onları içeren en küçük dış sınırın deliği (saat yönü).
+
+    Returns:
+        [[dış, delik, ...], ...]
+    """
+    rings = sorted(rings, key=lambda ring: -abs(ring_area(ring)))
+    polygons = []
+    exteriors = []  # (halka, polygons indeksi) - alanı büyükten küçüğe
+    for ring in rings:
+        containing = [index for outer, index in exteriors if _contains(outer, ring[0])]
+        depth = sum(_contains(other, ring[0]) for other in rings if other is not ring and abs(ring_area(other)) > abs(ring_area(ring)))
+        clockwise = ring_area(ring) < 0
+        if depth % 2 == 0:
+            polygons.append([ring[::-1] if clockwise else ring])
+            exteriors.append((ring, len(polygons) - 1))
+        elif containing:
+            polygons[containing[-1]].append(ring if clockwise else ring[::-1])
+    return polygons
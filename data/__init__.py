@@ -5,11 +5,18 @@ Contains asteroid and city population databases
 
 from .asteroid_data import SOLAR_SYSTEM_ASTEROIDS, COMETS, CHICXULUB_IMPACTOR
 from .city_data import MAJOR_CITIES_POPULATION
+from .catalog import Catalog, CatalogObject, CatalogColumns, DENSITY_CLASSES, RANKABLE_FIELDS, get_catalog
 
 __all__ = [
     'SOLAR_SYSTEM_ASTEROIDS',
     'COMETS',
     'CHICXULUB_IMPACTOR',
-    'MAJOR_CITIES_POPULATION'
+    'MAJOR_CITIES_POPULATION',
+    'Catalog',
+    'CatalogObject',
+    'CatalogColumns',
+    'DENSITY_CLASSES',
+    'RANKABLE_FIELDS',
+    'get_catalog'
 ]
 
@@ -0,0 +1,182 @@
+"""
+Asteroid and Comet Catalog Model
+Immutable slotted records with derived physics computed once at load, plus a columnar view
+
+Kayıtlar SOLAR_SYSTEM_ASTEROIDS, COMETS ve CHICXULUB_IMPACTOR sözlüklerinden bir kez
+oluşturulur. Hacim, her yoğunluk sınıfı için kütle, kinetik enerji ve TNT eşdeğeri
+yüklemede hesaplanır; CatalogColumns aynı değerleri numpy sütunları olarak tutar, böylece
+filtreleme ve sıralama istek başına Python döngüsü olmadan yapılır.
+"""
+
+import math
+from functools import lru_cache
+from types import MappingProxyType
+
+import numpy as np
+
+from .asteroid_data import SOLAR_SYSTEM_ASTEROIDS, COMETS, CHICXULUB_IMPACTOR
+
+# Yoğunluk sınıfları (kg/m³) - AsteroidMaterial ile aynı değerler
+DENSITY_CLASSES = ('cometary', 'chondrite', 'iron')
+DENSITY_KG_M3 = {'cometary': 1000, 'chondrite': 3000, 'iron': 7500}
+
+JOULES_PER_MEGATON_TNT = 4.184e15
+
+RECORD_FIELDS = (
+    'id', 'name', 'diameter_m', 'velocity_ms', 'velocity_kmh', 'is_hazardous',
+    'absolute_magnitude', 'orbital_period', 'miss_distance_km', 'description'
+)
+
+RANKABLE_FIELDS = (
+    'diameter_m', 'velocity_ms', 'absolute_magnitude', 'miss_distance_km',
+    'mass_kg', 'kinetic_energy_joules', 'tnt_megatons'
+)
+
+
+class CatalogObject:
+    """Katalogdaki tek bir cisim; oluşturulduktan sonra değiştirilemez."""
+
+    __slots__ = RECORD_FIELDS + (
+        'key', 'kind', 'nominal_class', 'volume_m3', 'mass_kg', 'kinetic_energy_joules', 'tnt_megatons'
+    )
+
+    def __init__(self, key, kind, record):
+        set_field = object.__setattr__
+        set_field(self, 'key', key)
+        set_field(self, 'kind', kind)
+        for field in RECORD_FIELDS:
+            set_field(self, field, record.get(field))
+        # Kuyruklu yıldızlar buzlu/gözenekli, diğerleri taşlı kabul edilir
+        set_field(self, 'nominal_class', 'cometary' if kind == 'comet' else 'chondrite')
+
+        radius_m = self.diameter_m / 2
+        volume_m3 = (4 / 3) * math.pi * radius_m ** 3
+        mass_kg = {name: volume_m3 * DENSITY_KG_M3[name] for name in DENSITY_CLASSES}
+        energy_j = {name: 0.5 * mass_kg[name] * self.velocity_ms ** 2 for name in DENSITY_CLASSES}
+        set_field(self, 'volume_m3', volume_m3)
+        set_field(self, 'mass_kg', MappingProxyType(mass_kg))
+        set_field(self, 'kinetic_energy_joules', MappingProxyType(energy_j))
+        set_field(self, 'tnt_megatons', MappingProxyType(
+            {name: energy_j[name] / JOULES_PER_MEGATON_TNT for name in DENSITY_CLASSES}
+        ))
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def __repr__(self):
+        return f"CatalogObject({self.kind}:{self.key})"
+
+    def derived(self):
+        """Türetilmiş büyüklükler (yoğunluk sınıfı başına)."""
+        return {
+            'nominal_class': self.nominal_class,
+            'volume_m3': self.volume_m3,
+            'mass_kg': dict(self.mass_kg),
+            'kinetic_energy_joules': dict(self.kinetic_energy_joules),
+            'tnt_megatons': dict(self.tnt_megatons)
+        }
+
+    def to_dict(self, include_derived=True):
+        """API yanıtı için sözlük: kaynak kayıt alanları (+ türetilmiş büyüklükler)."""
+        record = {field: getattr(self, field) for field in RECORD_FIELDS if getattr(self, field) is not None}
+        if include_derived:
+            record['derived'] = self.derived()
+        return record
+
+
+class CatalogColumns:
+    """
+    Katalog üzerinde sütun görünümü: her alan bir numpy dizisi, türetilmiş büyüklükler
+    (n, yoğunluk sınıfı) boyutunda. Tüm diziler salt okunurdur.
+    """
+
+    def __init__(self, objects):
+        self.keys = np.array([obj.key for obj in objects], dtype=object)
+        self.kinds = np.array([obj.kind for obj in objects], dtype=object)
+        self.diameter_m = np.array([obj.diameter_m for obj in objects], dtype=float)
+        self.velocity_ms = np.array([obj.velocity_ms for obj in objects], dtype=float)
+        self.is_hazardous = np.array([bool(obj.is_hazardous) for obj in objects], dtype=bool)
+        self.absolute_magnitude = np.array([obj.absolute_magnitude for obj in objects], dtype=float)
+        self.miss_distance_km = np.array([obj.miss_distance_km for obj in objects], dtype=float)
+        self.nominal_class_index = np.array(
+            [DENSITY_CLASSES.index(obj.nominal_class) for obj in objects], dtype=np.intp
+        )
+
+        volume_m3 = (4 / 3) * np.pi * (self.diameter_m / 2) ** 3
+        density = np.array([DENSITY_KG_M3[name] for name in DENSITY_CLASSES], dtype=float)
+        self.mass_kg = volume_m3[:, None] * density
+        self.kinetic_energy_joules = 0.5 * self.mass_kg * self.velocity_ms[:, None] ** 2
+        self.tnt_megatons = self.kinetic_energy_joules / JOULES_PER_MEGATON_TNT
+
+        for value in vars(self).values():
+            value.setflags(write=False)
+
+    def __len__(self):
+        return len(self.keys)
+
+    def values(self, field, density_class=None):
+        """
+        Tek boyutlu sütun. Türetilmiş alanlar için density_class verilmezse her cismin
+        nominal sınıfı (kuyruklu yıldız: cometary, diğerleri: chondrite) kullanılır.
+        """
+        column = getattr(self, field)
+        if column.ndim == 1:
+            return column
+        if density_class is None:
+            return column[np.arange(len(self)), self.nominal_class_index]
+        return column[:, DENSITY_CLASSES.index(density_class)]
+
+    def select(self, kinds=None, hazardous=None, min_diameter_m=None, max_diameter_m=None):
+        """Vektörel filtre maskesi."""
+        mask = np.ones(len(self), dtype=bool)
+        if kinds:
+            mask &= np.isin(self.kinds, list(kinds))
+        if hazardous is not None:
+            mask &= self.is_hazardous == hazardous
+        if min_diameter_m is not None:
+            mask &= self.diameter_m >= min_diameter_m
+        if max_diameter_m is not None:
+            mask &= self.diameter_m <= max_diameter_m
+        return mask
+
+    def rank(self, field, mask=None, density_class=None, descending=True, limit=None):
+        """Maskeye uyan satırların indeksleri, alana göre sıralı."""
+        values = self.values(field, density_class)
+        indices = np.arange(len(self)) if mask is None else np.flatnonzero(mask)
+        order = np.argsort(values[indices], kind='stable')
+        if descending:
+            order = order[::-1]
+        return indices[order[:limit] if limit else order]
+
+
+class Catalog:
+    """Tüm asteroit, kuyruklu yıldız ve çarpıcı kayıtları: anahtar erişimi + sütun görünümü."""
+
+    def __init__(self, objects):
+        self.objects = tuple(objects)
+        self._by_key = MappingProxyType({(obj.kind, obj.key): obj for obj in self.objects})
+        self.columns = CatalogColumns(self.objects)
+
+    def __len__(self):
+        return len(self.objects)
+
+    def __iter__(self):
+        return iter(self.objects)
+
+    def get(self, kind, key):
+        return self._by_key.get((kind, key))
+
+    def query(self, sort='tnt_megatons', density_class=None, descending=True, limit=None, **filters):
+        """Filtrele ve sırala; CatalogObject listesi döner."""
+        mask = self.columns.select(**filters)
+        indices = self.columns.rank(sort, mask, density_class, descending, limit)
+        return [self.objects[i] for i in indices]
+
+
+@lru_cache(maxsize=1)
+def get_catalog():
+    """Katalog ilk erişimde bir kez oluşturulur (warm-up sırasında hazırlanır)."""
+    objects = [CatalogObject(key, 'asteroid', record) for key, record in SOLAR_SYSTEM_ASTEROIDS.items()]
+    objects += [CatalogObject(key, 'comet', record) for key, record in COMETS.items()]
+    objects.append(CatalogObject('chicxulub', 'impactor', CHICXULUB_IMPACTOR))
+    return Catalog(objects)
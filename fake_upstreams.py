@@ -0,0 +1,324 @@
+"""
+Local stand-in for the NASA NeoWs and GeoNames APIs
+Offline fake upstream server with latency, error and throttling injection
+
+Yük testleri ve ölçümler api.nasa.gov / api.geonames.org'a erişemez. Bu sunucu uygulamanın
+kullandığı dört rotayı yerel veriden yanıtlar; yedek veriye düşme, bütçe ve önbellek
+davranışı çevrimdışı sınanabilir:
+
+    /neo/rest/v1/neo/<id>              SOLAR_SYSTEM_ASTEROIDS kayıtlarından NeoWs nesnesi
+    /neo/rest/v1/feed                  start_date..end_date (en fazla 7 gün) yakın geçiş akışı
+    /oceanJSON                         bathimetri rasteri üzerinden okyanus/deniz adı
+    /findNearbyPlaceNameJSON           MAJOR_CITIES_POPULATION içinden yarıçaptaki şehirler
+
+Her servis için arıza profili: gecikme (+ rastgele sapma), hata oranı (HTTP 503), kısıtlama
+oranı ve saatlik kota. Kısıtlama gerçek servislerin biçimindedir: NASA için HTTP 429 ve
+X-RateLimit-Remaining: 0, GeoNames için HTTP 200 ve {'status': {'value': 19}}.
+Profiller çalışırken /_fake/config ile değiştirilebilir, sayaçlar /_fake/stats'tadır.
+
+Kullanım:
+    python fake_upstreams.py [--port 8900] [--latency-ms 150] [--jitter-ms 50]
+                             [--error-rate 0.05] [--throttle-rate 0.02] [--quota-per-hour 0]
+
+    NASA_NEO_API_URL=http://127.0.0.1:8900/neo/rest/v1 GEONAMES_API_URL=http://127.0.0.1:8900 \\
+        NASA_QUOTA_PER_HOUR=0 NASA_QUOTA_PER_DAY=0 GEONAMES_QUOTA_PER_HOUR=0 GEONAMES_QUOTA_PER_DAY=0 python app.py
+
+    curl -X POST localhost:8900/_fake/config -d '{"geonames": {"throttle_rate": 1}}'
+"""
+
+import argparse
+import random
+import threading
+import time
+from collections import deque
+from datetime import date, timedelta
+
+import numpy as np
+from flask import Flask, jsonify, request
+
+from data import MAJOR_CITIES_POPULATION, SOLAR_SYSTEM_ASTEROIDS
+from geodesy import haversine_km
+
+NASA_PREFIX = '/neo/rest/v1'
+FEED_MAX_DAYS = 7
+UPSTREAMS = ('nasa', 'geonames')
+PROFILE_FIELDS = ('latency_ms', 'jitter_ms', 'error_rate', 'throttle_rate', 'quota_per_hour')
+
+GEONAMES_HOURLY_LIMIT_CODE = 19
+GEONAMES_NO_RESULT_CODE = 15
+
+
+class FaultProfile:
+    """Bir servisin gecikme / hata / kısıtlama ayarları ve kayan saatlik kota penceresi."""
+
+    def __init__(self, latency_ms=0.0, jitter_ms=0.0, error_rate=0.0, throttle_rate=0.0, quota_per_hour=0):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.throttle_rate = throttle_rate
+        self.quota_per_hour = quota_per_hour
+        self.counts = {'requests': 0, 'ok': 0, 'errors': 0, 'throttled': 0}
+        self._window = deque()
+        self._lock = threading.Lock()
+
+    def update(self, values):
+        for field in PROFILE_FIELDS:
+            if field in values:
+                setattr(self, field, type(getattr(self, field))(values[field]))
+
+    def settings(self):
+        return {field: getattr(self, field) for field in PROFILE_FIELDS}
+
+    def delay_s(self, rng):
+        return max(0.0, self.latency_ms + rng.uniform(-self.jitter_ms, self.jitter_ms)) / 1000
+
+    def decide(self, rng):
+        """İstek sonucu: ('ok' | 'errors' | 'throttled', kalan kota veya None)."""
+        now = time.monotonic()
+        with self._lock:
+            self.counts['requests'] += 1
+            while self._window and now - self._window[0] > 3600:
+                self._window.popleft()
+            remaining = None
+            over_quota = False
+            if self.quota_per_hour > 0:
+                over_quota = len(self._window) >= self.quota_per_hour
+                if not over_quota:
+                    self._window.append(now)
+                remaining = max(0, self.quota_per_hour - len(self._window))
+            if over_quota or rng.random() < self.throttle_rate:
+                outcome = 'throttled'
+            elif rng.random() < self.error_rate:
+                outcome = 'errors'
+            else:
+                outcome = 'ok'
+            self.counts[outcome] += 1
+            return outcome, (0 if outcome == 'throttled' else remaining)
+
+
+# ============================================================================
+# YANIT VERİSİ
+# ============================================================================
+
+def neo_object(asteroid, approach_date):
+    """Veritabanı kaydını NeoWs nesne biçimine çevir (çap ±%10 aralık, hızlar metin)."""
+    diameter = asteroid['diameter_m']
+    return {
+        'id': asteroid['id'],
+        'neo_reference_id': asteroid['id'],
+        'name': asteroid['name'],
+        'absolute_magnitude_h': asteroid.get('absolute_magnitude', 20),
+        'estimated_diameter': {
+            'meters': {'estimated_diameter_min': diameter * 0.9, 'estimated_diameter_max': diameter * 1.1}
+        },
+        'is_potentially_hazardous_asteroid': asteroid.get('is_hazardous', False),
+        'close_approach_data': [{
+            'close_approach_date': approach_date.isoformat(),
+            'relative_velocity': {
+                'kilometers_per_second': str(asteroid['velocity_ms'] / 1000),
+                'kilometers_per_hour': str(asteroid['velocity_ms'] * 3.6)
+            },
+            'miss_distance': {'kilometers': str(asteroid.get('miss_distance_km', 1000000))},
+            'orbiting_body': 'Earth'
+        }],
+        'orbital_data': {'orbital_period': str(asteroid.get('orbital_period', 365))}
+    }
+
+
+ASTEROIDS_BY_ID = {asteroid['id']: asteroid for asteroid in SOLAR_SYSTEM_ASTEROIDS.values() if asteroid.get('id')}
+_FEED_ORDER = sorted(ASTEROIDS_BY_ID)
+
+
+def feed_objects(start, end):
+    """Her güne kararlı bir kayıt alt kümesi (gün sırasına göre döngüsel)."""
+    days = {}
+    for offset in range((end - start).days + 1):
+        day = start + timedelta(days=offset)
+        ids = [_FEED_ORDER[(day.toordinal() * 3 + k) % len(_FEED_ORDER)] for k in range(3)]
+        days[day.isoformat()] = [neo_object(ASTEROIDS_BY_ID[asteroid_id], day) for asteroid_id in ids]
+    return days
+
+
+_ocean_mask = None
+
+
+def ocean_name(lat, lng):
+    """Bathimetri rasterine göre okyanus adı; karada None. Havza adları kaba enlem/boylam kutularıdır."""
+    global _ocean_mask
+    if _ocean_mask is None:
+        from tsunami_engine import TsunamiEngine
+        _ocean_mask = TsunamiEngine.load()
+    i, j = _ocean_mask.cell_of(lat, lng)
+    if not _ocean_mask.ocean[i, j]:
+        return None
+    if lat > 66:
+        return 'Arctic Ocean'
+    if lat < -60:
+        return 'Southern Ocean'
+    if 40.5 <= lat <= 47 and 27.5 <= lng <= 42:
+        return 'Black Sea'
+    if 30 <= lat <= 46 and -6 <= lng <= 36:
+        return 'Mediterranean Sea'
+    if 20 <= lng <= 120 and lat < 30:
+        return 'Indian Ocean'
+    if -70 <= lng < 20:
+        return 'North Atlantic Ocean' if lat >= 0 else 'South Atlantic Ocean'
+    return 'North Pacific Ocean' if lat >= 0 else 'South Pacific Ocean'
+
+
+_CITY_NAMES = list(MAJOR_CITIES_POPULATION)
+_CITY_LAT = np.array([MAJOR_CITIES_POPULATION[name]['lat'] for name in _CITY_NAMES])
+_CITY_LNG = np.array([MAJOR_CITIES_POPULATION[name]['lng'] for name in _CITY_NAMES])
+
+
+def nearby_places(lat, lng, radius_km, max_rows):
+    distances = haversine_km(lat, lng, _CITY_LAT, _CITY_LNG)
+    order = [int(index) for index in np.argsort(distances) if distances[index] <= radius_km][:max_rows]
+    return [
+        {
+            'name': _CITY_NAMES[index],
+            'lat': str(float(_CITY_LAT[index])),
+            'lng': str(float(_CITY_LNG[index])),
+            'population': MAJOR_CITIES_POPULATION[_CITY_NAMES[index]]['population'],
+            'distance': f'{float(distances[index]):.5f}',
+            'countryName': 'Unknown'
+        }
+        for index in order
+    ]
+
+
+# ============================================================================
+# SUNUCU
+# ============================================================================
+
+def create_app(profiles=None, seed=None):
+    """profiles: {'nasa': FaultProfile, 'geonames': FaultProfile} (verilmeyenler arızasız)."""
+    fake = Flask(__name__)
+    profiles = dict({upstream: FaultProfile() for upstream in UPSTREAMS}, **(profiles or {}))
+    rng = random.Random(seed)
+    rng_lock = threading.Lock()
+
+    def inject(upstream):
+        """Gecikmeyi uygula; arıza veya kısıtlama yanıtı gerekiyorsa onu döndür."""
+        profile = profiles[upstream]
+        with rng_lock:
+            delay = profile.delay_s(rng)
+            outcome, remaining = profile.decide(rng)
+        if delay:
+            time.sleep(delay)
+        headers = {}
+        if upstream == 'nasa' and remaining is not None:
+            headers = {'X-RateLimit-Limit': str(profile.quota_per_hour), 'X-RateLimit-Remaining': str(remaining)}
+        if outcome == 'errors':
+            return (jsonify({'error': 'injected upstream error'}), 503, headers), headers
+        if outcome == 'throttled':
+            if upstream == 'nasa':
+                headers['X-RateLimit-Remaining'] = '0'
+                body = {'error': {'code': 'OVER_RATE_LIMIT', 'message': 'You have exceeded your rate limit.'}}
+                return (jsonify(body), 429, headers), headers
+            body = {'status': {'message': 'the hourly limit of credits has been exceeded', 'value': GEONAMES_HOURLY_LIMIT_CODE}}
+            return (jsonify(body), 200, headers), headers
+        return None, headers
+
+    def number_arg(name, default=None):
+        value = request.args.get(name, type=float)
+        if value is None:
+            if default is None:
+                raise KeyError(name)
+            return default
+        return value
+
+    @fake.route(f'{NASA_PREFIX}/neo/<asteroid_id>')
+    def neo_lookup(asteroid_id):
+        fault, headers = inject('nasa')
+        if fault:
+            return fault
+        asteroid = ASTEROIDS_BY_ID.get(asteroid_id)
+        if asteroid is None:
+            return jsonify({'code': 404, 'http_error': 'NOT_FOUND', 'error_message': 'Object not found'}), 404, headers
+        return jsonify(neo_object(asteroid, date.today())), 200, headers
+
+    @fake.route(f'{NASA_PREFIX}/feed')
+    def neo_feed():
+        fault, headers = inject('nasa')
+        if fault:
+            return fault
+        try:
+            start = date.fromisoformat(request.args.get('start_date', date.today().isoformat()))
+            end = date.fromisoformat(request.args.get('end_date', (start + timedelta(days=FEED_MAX_DAYS)).isoformat()))
+        except ValueError as e:
+            return jsonify({'code': 400, 'http_error': 'BAD_REQUEST', 'error_message': str(e)}), 400, headers
+        if not 0 <= (end - start).days <= FEED_MAX_DAYS:
+            return jsonify({'code': 400, 'http_error': 'BAD_REQUEST',
+                            'error_message': f'Date Format Exception - Expected format (yyyy-mm-dd) - The Feed date limit is only {FEED_MAX_DAYS} Days'}), 400, headers
+        objects = feed_objects(start, end)
+        return jsonify({
+            'element_count': sum(len(day) for day in objects.values()),
+            'near_earth_objects': objects
+        }), 200, headers
+
+    @fake.route('/oceanJSON')
+    def ocean():
+        fault, headers = inject('geonames')
+        if fault:
+            return fault
+        try:
+            name = ocean_name(number_arg('lat'), number_arg('lng'))
+        except KeyError as e:
+            return jsonify({'status': {'message': f'missing parameter {e.args[0]}', 'value': 14}}), 200, headers
+        if name is None:
+            return jsonify({'status': {'message': 'we are afraid we could not find an ocean for latitude and longitude',
+                                       'value': GEONAMES_NO_RESULT_CODE}}), 200, headers
+        return jsonify({'ocean': {'distance': '0', 'name': name}}), 200, headers
+
+    @fake.route('/findNearbyPlaceNameJSON')
+    def nearby():
+        fault, headers = inject('geonames')
+        if fault:
+            return fault
+        try:
+            places = nearby_places(
+                number_arg('lat'), number_arg('lng'),
+                number_arg('radius', 20.0), int(number_arg('maxRows', 10))
+            )
+        except KeyError as e:
+            return jsonify({'status': {'message': f'missing parameter {e.args[0]}', 'value': 14}}), 200, headers
+        return jsonify({'geonames': places}), 200, headers
+
+    @fake.route('/_fake/config', methods=['GET', 'POST'])
+    def config():
+        """POST {'nasa': {...}, 'geonames': {...}} ile profilleri değiştir (yalnızca verilen alanlar)."""
+        if request.method == 'POST':
+            changes = request.get_json(force=True)
+            for upstream, values in changes.items():
+                if upstream not in profiles:
+                    return jsonify({'success': False, 'error': f'Bilinmeyen servis: {upstream}'}), 400
+                profiles[upstream].update(values)
+        return jsonify({'success': True, 'profiles': {name: profile.settings() for name, profile in profiles.items()}})
+
+    @fake.route('/_fake/stats')
+    def stats():
+        return jsonify({'success': True, 'stats': {name: dict(profile.counts) for name, profile in profiles.items()}})
+
+    return fake
+
+
+def main():
+    parser = argparse.ArgumentParser(description='NASA NeoWs ve GeoNames için yerel sahte sunucu')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8900)
+    parser.add_argument('--latency-ms', type=float, default=0.0, help='Her yanıta eklenen gecikme')
+    parser.add_argument('--jitter-ms', type=float, default=0.0, help='Gecikmeye ± rastgele sapma')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='HTTP 503 döndürülen isteklerin oranı')
+    parser.add_argument('--throttle-rate', type=float, default=0.0, help='Kota aşımı döndürülen isteklerin oranı')
+    parser.add_argument('--quota-per-hour', type=int, default=0, help='Servis başına saatlik kota (0 = sınırsız)')
+    parser.add_argument('--seed', type=int, default=None)
+    args = parser.parse_args()
+
+    settings = {field: getattr(args, field) for field in PROFILE_FIELDS}
+    profiles = {upstream: FaultProfile(**settings) for upstream in UPSTREAMS}
+    create_app(profiles, seed=args.seed).run(host=args.host, port=args.port, threaded=True)
+
+
+if __name__ == '__main__':
+    main()
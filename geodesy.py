@@ -0,0 +1,97 @@
+"""
+Geodesy helpers for Asteroid Impact Visualizer
+Vectorized great-circle distances and destination points on a spherical Earth
+
+Tüm ızgara ve arama yolları (nüfus ızgarası, en yakın şehir, kıyı segmentleri, tsunami
+rasteri) aynı çekirdeği kullanır. Fonksiyonlar skaler veya numpy dizisi alır ve
+yayınlama (broadcasting) kurallarına uyar. Boylam farkı sin²(Δλ/2) ile hesaplandığı için
+±180° geçişi kendiliğinden doğrudur; kutuplarda yuvarlama hataları kırpılır.
+
+Küre yaklaşımının (ortalama yarıçap) hatası elipsoide göre %0.5'in altındadır.
+"""
+
+import numpy as np
+
+EARTH_RADIUS_KM = 6371.0
+NEAREST_CHUNK_SIZE = 65536  # nearest() için satır bloğu - ara dizi chunk x referans sayısı
+
+
+def wrap_lng(lng):
+    """Boylamı [-180, 180) aralığına getir."""
+    return (np.asarray(lng, dtype=float) + 180.0) % 360.0 - 180.0
+
+
+def _haversine_term(lat1, lng1, lat2, lng2):
+    """a = sin²(Δφ/2) + cos φ1 cos φ2 sin²(Δλ/2) - mesafeyle monoton artar."""
+    phi1, phi2 = np.radians(lat1), np.radians(lat2)
+    dphi = phi2 - phi1
+    dlmb = np.radians(np.subtract(lng2, lng1))
+    return np.sin(dphi / 2) ** 2 + np.cos(phi1) * np.cos(phi2) * np.sin(dlmb / 2) ** 2
+
+
+def _term_to_km(a):
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+
+
+def haversine_km(lat1, lng1, lat2, lng2):
+    """Büyük daire mesafesi (km); girdiler birlikte yayınlanır."""
+    return _term_to_km(_haversine_term(lat1, lng1, lat2, lng2))
+
+
+def destination_points(lat, lng, north_km, east_km):
+    """
+    Merkezden yerel (kuzey, doğu) km ofsetlerine karşılık gelen noktalar.
+
+    Ofsetler azimutal eşit uzaklık izdüşümünde yorumlanır: nokta, merkezden
+    hypot(kuzey, doğu) km uzakta ve atan2(doğu, kuzey) yönündedir. Böylece ızgara
+    hücresinin merkeze mesafesi her enlemde tam olarak korunur; kutbu aşan ofsetler
+    kutbun öte tarafına, antimeridyeni aşanlar diğer yarıküreye düşer.
+
+    Returns:
+        (lat, lng) dizileri, boylam [-180, 180)
+    """
+    north_km = np.asarray(north_km, dtype=float)
+    east_km = np.asarray(east_km, dtype=float)
+    delta = np.hypot(north_km, east_km) / EARTH_RADIUS_KM
+    bearing = np.arctan2(east_km, north_km)
+    phi1 = np.radians(lat)
+
+    sin_phi2 = np.sin(phi1) * np.cos(delta) + np.cos(phi1) * np.sin(delta) * np.cos(bearing)
+    phi2 = np.arcsin(np.clip(sin_phi2, -1.0, 1.0))
+    dlmb = np.arctan2(
+        np.sin(bearing) * np.sin(delta) * np.cos(phi1),
+        np.cos(delta) - np.sin(phi1) * sin_phi2
+    )
+    return np.degrees(phi2), wrap_lng(lng + np.degrees(dlmb))
+
+
+def unit_vectors(lat, lng):
+    """Birim küre üzerinde (x, y, z) - son eksen."""
+    phi, lmb = np.radians(lat), np.radians(lng)
+    cos_phi = np.cos(phi)
+    return np.stack(np.broadcast_arrays(cos_phi * np.cos(lmb), cos_phi * np.sin(lmb), np.sin(phi)), axis=-1)
+
+
+def nearest(lats, lngs, ref_lats, ref_lngs):
+    """
+    Her nokta için en yakın referans noktası.
+
+    En yakın nokta birim vektörlerin iç çarpımı (tek matris çarpımı) en büyük olandır;
+    haversine yalnızca kazanan çift için hesaplanır. Büyük girdiler NEAREST_CHUNK_SIZE
+    satırlık bloklarla işlenir.
+
+    Returns:
+        (indeks, mesafe_km) - girdiyle aynı şekilde
+    """
+    lats = np.asarray(lats, dtype=float)
+    lngs = np.asarray(lngs, dtype=float)
+    ref_lats = np.asarray(ref_lats, dtype=float)
+    ref_lngs = np.asarray(ref_lngs, dtype=float)
+    points = unit_vectors(lats, lngs).reshape(-1, 3)
+    ref_t = unit_vectors(ref_lats, ref_lngs).T
+    index = np.empty(points.shape[0], dtype=np.intp)
+    for start in range(0, points.shape[0], NEAREST_CHUNK_SIZE):
+        block = slice(start, start + NEAREST_CHUNK_SIZE)
+        index[block] = np.argmax(points[block] @ ref_t, axis=1)
+    index = index.reshape(lats.shape)
+    return index, haversine_km(lats, lngs, ref_lats[index], ref_lngs[index])
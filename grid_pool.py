@@ -0,0 +1,76 @@
+"""
+Grid process pool for Asteroid Impact Visualizer
+Row-range partitioning of the streamed population grid across worker processes
+
+Çok ince çözünürlüklerde (ör. 0.5 km, 500 km yarıçap: ~3 milyon hücre) nüfus hesabı tek
+çekirdekte saniyeler sürer. Izgara hiçbir zaman bellekte oluşturulmaz: her işçi yalnızca bir
+(ilk, son) satır aralığı alır, kendi satırlarını bloklar halinde üretir ve mesafe anahtarı
+başına nüfus vektörünü döndürür. Ana süreç bu küçük vektörleri toplar.
+
+    even_bands  [0, uzunluk) aralığını eşit bitişik dilimlere böler (satır aralıkları)
+    map_tasks   Görevleri havuzda çalıştırır ve sonuçları sırayla döndürür
+
+İşçiler 'forkserver' bağlamında başlatılır: gunicorn gthread worker'ı gibi çok iş
+parçacıklı bir süreçten doğrudan fork edilmezler. Havuz ilk kullanımda oluşturulur.
+
+Ortam değişkenleri:
+    GRID_WORKERS            İşçi süreç sayısı; 0 = kapalı (varsayılan), 'auto' = CPU sayısı
+    GRID_PARALLEL_MIN_CELLS Havuzun devreye girdiği en küçük hücre sayısı (varsayılan: 500000)
+    GRID_BANDS_PER_WORKER   İşçi başına satır aralığı (yük dengesi için, varsayılan: 4)
+"""
+
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+
+def _configured_workers():
+    value = os.environ.get('GRID_WORKERS', '0').strip().lower()
+    if value == 'auto':
+        return os.cpu_count() or 1
+    return max(0, int(value))
+
+
+GRID_WORKERS = _configured_workers()
+GRID_PARALLEL_MIN_CELLS = int(os.environ.get('GRID_PARALLEL_MIN_CELLS', 500000))
+GRID_BANDS_PER_WORKER = int(os.environ.get('GRID_BANDS_PER_WORKER', 4))
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def pool_enabled_for(cell_count):
+    """Bu büyüklükteki grid havuzda mı değerlendirilmeli?"""
+    return GRID_WORKERS > 1 and cell_count >= GRID_PARALLEL_MIN_CELLS
+
+
+def even_bands(length, band_count):
+    """[0, length) aralığını yaklaşık eşit bitişik dilimlere böl."""
+    bounds = np.unique(np.linspace(0, length, band_count + 1).astype(int))
+    return list(zip(bounds[:-1].tolist(), bounds[1:].tolist()))
+
+
+def get_pool():
+    """Süreç havuzu (ilk çağrıda oluşturulur); havuz kapalıysa None."""
+    global _pool
+    if GRID_WORKERS <= 1:
+        return None
+    with _pool_lock:
+        if _pool is None:
+            method = 'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+            _pool = ProcessPoolExecutor(max_workers=GRID_WORKERS, mp_context=multiprocessing.get_context(method))
+        return _pool
+
+
+def map_tasks(task, argument_tuples):
+    """task(*argümanlar) her demet için havuzda; task modül düzeyinde tanımlı olmalıdır (pickle)."""
+    pool = get_pool()
+    futures = [pool.submit(task, *arguments) for arguments in argument_tuples]
+    return [future.result() for future in futures]
+
+
+def band_count():
+    return max(1, GRID_WORKERS * GRID_BANDS_PER_WORKER)
@@ -0,0 +1,61 @@
+"""
+Gunicorn production profile for Asteroid Impact Visualizer
+
+- preload_app: numpy, data modülleri ve warm-up önbellekleri master süreçte bir kez
+  yüklenir; fork edilen worker'lar bunları copy-on-write paylaşır.
+- gthread worker'lar: NASA / GeoNames çağrıları I/O bekler, thread'ler bu sürede
+  diğer istekleri karşılar. gevent kuruluysa GUNICORN_WORKER_CLASS=gevent ile seçilebilir.
+
+Ortam değişkenleri:
+    PORT                   Dinlenecek port (varsayılan: 5000)
+    WEB_CONCURRENCY        Worker sayısı (varsayılan: min(2 * CPU + 1, 8))
+    GUNICORN_WORKER_CLASS  gthread (varsayılan), gevent veya sync
+    GUNICORN_THREADS       gthread worker başına thread (varsayılan: 4)
+    GUNICORN_TIMEOUT       İstek zaman aşımı, saniye (varsayılan: 120)
+"""
+
+import gc
+import multiprocessing
+import os
+
+bind = f"0.0.0.0:{os.environ.get('PORT', '5000')}"
+
+workers = int(os.environ.get('WEB_CONCURRENCY', min(2 * multiprocessing.cpu_count() + 1, 8)))
+worker_class = os.environ.get('GUNICORN_WORKER_CLASS', 'gthread')
+threads = int(os.environ.get('GUNICORN_THREADS', 4))
+worker_connections = int(os.environ.get('GUNICORN_WORKER_CONNECTIONS', 200))  # sadece gevent
+
+preload_app = True
+
+# Uzun atmosferik giriş simülasyonları için geniş zaman aşımı
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', 120))
+graceful_timeout = 30
+keepalive = 5
+
+# Bellek sızıntılarına karşı worker'ları periyodik olarak yenile
+max_requests = int(os.environ.get('GUNICORN_MAX_REQUESTS', 2000))
+max_requests_jitter = 200
+
+accesslog = None
+errorlog = '-'
+loglevel = os.environ.get('LOG_LEVEL', 'info').lower()
+
+
+def when_ready(server):
+    """Master hazır, worker'lar henüz fork edilmedi: önbellekleri burada oluştur."""
+    if not server.cfg.preload_app:
+        return
+    from app import warm_up
+    timings = warm_up()
+    # Kalıcı nesneleri GC'nin dışında tut; aksi halde GC referans sayaçlarına
+    # dokunarak paylaşılan sayfaları kopyalar
+    gc.freeze()
+    server.log.info("Warm-up finished before fork: %s", timings)
+
+
+def post_worker_init(worker):
+    """preload_app kapalıysa her worker kendi warm-up'ını yapar."""
+    if worker.cfg.preload_app:
+        return
+    from app import warm_up
+    warm_up()
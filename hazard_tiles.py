@@ -0,0 +1,136 @@
+"""
+Hazard tiles for Asteroid Impact Visualizer
+Web Mercator XYZ tile geometry, indexed PNG encoding and a bounded LRU tile cache
+
+Bir senaryonun tehlike alanı (aşırı basınç, termal akı, rüzgar, kayıp yoğunluğu)
+256x256 piksellik XYZ karolar halinde çizilir. Her alan birkaç sınıfa ayrılır; piksel
+sınıf indeksi paletli PNG (renk tipi 3, şeffaflık tRNS) olarak kodlanır, bu yüzden
+karolar küçüktür ve ek bir görüntü kütüphanesi gerekmez.
+
+Ortam değişkenleri:
+    TILE_CACHE_SIZE    Bellekte tutulan en fazla karo sayısı (varsayılan: 4096)
+"""
+
+import hashlib
+import json
+import math
+import os
+import struct
+import threading
+import zlib
+from collections import OrderedDict
+
+import numpy as np
+
+TILE_SIZE = 256
+MAX_TILE_ZOOM = 18
+
+# Alan -> (birim, sınıf alt sınırları, RGBA renkleri). Sınıf 0 (ilk sınırın altı) şeffaftır.
+FIELD_STYLES = {
+    'overpressure': ('Pa', (1000, 3500, 20000, 50000, 140000), (
+        (255, 235, 59, 110), (255, 193, 7, 140), (255, 152, 0, 160), (244, 67, 54, 180), (136, 14, 79, 200)
+    )),
+    'thermal': ('J/m²', (1e5, 2.5e5, 4e5, 8e5, 2e6), (
+        (255, 224, 130, 110), (255, 183, 77, 140), (255, 112, 67, 160), (229, 57, 53, 180), (120, 20, 20, 200)
+    )),
+    'wind': ('m/s', (29, 38, 49, 60, 74, 90), (
+        (178, 235, 242, 100), (128, 203, 196, 120), (77, 182, 172, 140), (0, 137, 123, 160),
+        (0, 96, 100, 180), (0, 47, 60, 200)
+    )),
+    'casualty': ('kişi/km²', (0.1, 1, 10, 100, 1000), (
+        (206, 147, 216, 100), (171, 71, 188, 130), (142, 36, 170, 160), (106, 27, 154, 180), (49, 0, 90, 210)
+    )),
+}
+
+
+def tile_pixel_centers(z, x, y, size=TILE_SIZE):
+    """Karonun piksel merkezlerinin (lat, lng) dizileri, (size, size) şeklinde."""
+    n = 2 ** z
+    offsets = (np.arange(size) + 0.5) / size
+    lngs = (x + offsets) / n * 360.0 - 180.0
+    lats = np.degrees(np.arctan(np.sinh(math.pi * (1 - 2 * (y + offsets) / n))))
+    return np.broadcast_to(lats[:, None], (size, size)), np.broadcast_to(lngs[None, :], (size, size))
+
+
+def tile_bounds(z, x, y):
+    """(lat_min, lat_max, lng_min, lng_max)."""
+    n = 2 ** z
+    lng_min = x / n * 360.0 - 180.0
+    lng_max = (x + 1) / n * 360.0 - 180.0
+    lat_max = math.degrees(math.atan(math.sinh(math.pi * (1 - 2 * y / n))))
+    lat_min = math.degrees(math.atan(math.sinh(math.pi * (1 - 2 * (y + 1) / n))))
+    return lat_min, lat_max, lng_min, lng_max
+
+
+def valid_tile(z, x, y):
+    return 0 <= z <= MAX_TILE_ZOOM and 0 <= x < 2 ** z and 0 <= y < 2 ** z
+
+
+def classify(values, field):
+    """Değer dizisi -> sınıf indeksi (uint8); 0 = eşik altı (şeffaf)."""
+    _, thresholds, _ = FIELD_STYLES[field]
+    return np.searchsorted(np.asarray(thresholds, dtype=float), values, side='right').astype(np.uint8)
+
+
+def _png_chunk(kind, data):
+    return struct.pack('>I', len(data)) + kind + data + struct.pack('>I', zlib.crc32(kind + data) & 0xffffffff)
+
+
+def encode_indexed_png(indices, field):
+    """Sınıf indeksi dizisini FIELD_STYLES paletiyle 8 bit paletli PNG'ye kodla."""
+    _, _, colors = FIELD_STYLES[field]
+    palette = [(0, 0, 0, 0)] + list(colors)
+    height, width = indices.shape
+    raw = np.zeros((height, width + 1), dtype=np.uint8)  # Her satır başında filtre tipi 0
+    raw[:, 1:] = indices
+    return b''.join((
+        b'\x89PNG\r\n\x1a\n',
+        _png_chunk(b'IHDR', struct.pack('>IIBBBBB', width, height, 8, 3, 0, 0, 0)),
+        _png_chunk(b'PLTE', bytes(channel for color in palette for channel in color[:3])),
+        _png_chunk(b'tRNS', bytes(color[3] for color in palette)),
+        _png_chunk(b'IDAT', zlib.compress(raw.tobytes(), 6)),
+        _png_chunk(b'IEND', b'')
+    ))
+
+
+def empty_tile(field):
+    """Tamamen şeffaf karo (etki yarıçapı dışındaki karolar için)."""
+    return encode_indexed_png(np.zeros((TILE_SIZE, TILE_SIZE), dtype=np.uint8), field)
+
+
+def scenario_hash(params):
+    """Senaryo parametrelerinden kararlı kısa özet (önbellek anahtarı ve ETag için)."""
+    canonical = json.dumps(params, sort_keys=True, separators=(',', ':'))
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()[:16]
+
+
+class TileCache:
+    """İş parçacığı güvenli, boyutu sınırlı LRU karo önbelleği."""
+
+    def __init__(self, maxsize=None):
+        self.maxsize = maxsize or int(os.environ.get('TILE_CACHE_SIZE', 4096))
+        self._tiles = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        with self._lock:
+            tile = self._tiles.get(key)
+            if tile is None:
+                self.misses += 1
+                return None
+            self._tiles.move_to_end(key)
+            self.hits += 1
+            return tile
+
+    def put(self, key, tile):
+        with self._lock:
+            self._tiles[key] = tile
+            self._tiles.move_to_end(key)
+            while len(self._tiles) > self.maxsize:
+                self._tiles.popitem(last=False)
+
+    def info(self):
+        with self._lock:
+            return {'hits': self.hits, 'misses': self.misses, 'maxsize': self.maxsize, 'currsize': len(self._tiles)}
@@ -0,0 +1,279 @@
+"""
+Traffic replay load test for Asteroid Impact Visualizer
+Replays recorded JSONL request streams in-process or against a running server
+
+Kayıtlı istek akışı belirtilen eşzamanlılık ve hızda yeniden oynatılır; uç nokta başına
+p50/p95/p99 gecikme, verim ve hata oranları raporlanır.
+
+Kayıt biçimi (satır başına bir JSON nesnesi; traffic_capture.py de bu biçimde yazar):
+    method     HTTP yöntemi
+    path       Sorgu dizesi dahil yol (ör. /api/catalog?kind=asteroid)
+    body       İstek gövdesi - JSON nesnesi veya metin (isteğe bağlı)
+    headers    Ek başlıklar, ör. {"Accept": "application/msgpack"} (isteğe bağlı)
+    t          Akış başından saniye (isteğe bağlı; --replay-timing için)
+method/path içermeyen satırlar (ör. depodaki iş listesi requests.jsonl) atlanır ve sayılır.
+
+Zamanlama:
+    --rate R          Açık döngü: saniyede R istek. Gecikme planlanan başlangıçtan ölçülür
+                      (sunucu geride kalınca kuyrukta geçen süre de sayılır).
+    --replay-timing   Açık döngü: kayıttaki t aralıkları (--speed ile hızlandırılır)
+    (hiçbiri)         Kapalı döngü: her thread bir önceki yanıt gelince sıradakini gönderir
+
+Kullanım:
+    python load_test.py data/sample_traffic.jsonl [--target http://127.0.0.1:8000]
+        [--concurrency 8] [--rate 20 | --replay-timing [--speed 2]] [--requests 500 | --duration 60]
+        [--warmup 1] [--json] [--max-error-rate 0.01] [--max-p99-ms 2000]
+
+--target verilmezse uygulama süreç içinde Flask test istemcisiyle çalıştırılır (ağ ve
+gunicorn hariç; uygulama kodunun kendisi ölçülür). Eşik verilip aşılırsa çıkış kodu 1 olur.
+"""
+
+import argparse
+import itertools
+import json
+import os
+import re
+import sys
+import threading
+import time
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+PERCENTILES = (50, 95, 99)
+ALL_ENDPOINTS = 'ALL'
+NUMERIC_SEGMENT = re.compile(r'/-?\d+(?=/|\.|$)')
+
+
+def load_records(paths):
+    """JSONL dosyalarından oynatılabilir kayıtlar ve atlanan satır sayısı."""
+    records, skipped = [], 0
+    for path in paths:
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    skipped += 1
+                    continue
+                if not isinstance(record, dict) or 'method' not in record or 'path' not in record:
+                    skipped += 1
+                    continue
+                records.append(record)
+    return records, skipped
+
+
+def endpoint_of(method, path):
+    """Gruplama anahtarı: sorgu dizesi atılır, sayısal yol parçaları <n> olur (ör. karo koordinatları)."""
+    path = NUMERIC_SEGMENT.sub('/<n>', path.split('?', 1)[0])
+    return f'{method.upper()} {path}'
+
+
+def schedule(records, rate=0.0, replay_timing=False, speed=1.0):
+    """
+    Sonsuz (planlanan_başlangıç_s, kayıt) akışı; kayıtlar döngüsel tekrarlanır.
+    Kapalı döngüde planlanan başlangıç None'dır.
+    """
+    if replay_timing:
+        # Birden fazla worker dosyası birleştirildiğinde kayıtlar zamana göre sıralanır
+        records = sorted(records, key=lambda record: float(record.get('t', 0.0)))
+        offsets = [float(record.get('t', 0.0)) for record in records]
+        base = min(offsets)
+        # Tekrarlar arasında ortalama kayıt aralığı kadar boşluk bırakılır
+        span = (max(offsets) - base) * (len(offsets) / max(1, len(offsets) - 1)) or 1.0
+        for loop in itertools.count():
+            for offset, record in zip(offsets, records):
+                yield (loop * span + offset - base) / speed, record
+    elif rate > 0:
+        for index, record in zip(itertools.count(), itertools.cycle(records)):
+            yield index / rate, record
+    else:
+        for record in itertools.cycle(records):
+            yield None, record
+
+
+class InProcessSender:
+    """Flask test istemcisi (thread başına bir tane)."""
+
+    label = 'in-process'
+
+    def __init__(self):
+        sys.path.insert(0, ROOT)
+        import app as app_module
+        self.app = app_module.app
+        self._local = threading.local()
+
+    def send(self, method, path, body=None, headers=None):
+        client = getattr(self._local, 'client', None)
+        if client is None:
+            client = self._local.client = self.app.test_client()
+        kwargs = {'json': body} if isinstance(body, (dict, list)) else {'data': body}
+        response = client.open(path, method=method, headers=headers, **kwargs)
+        return response.status_code, len(response.get_data())
+
+
+class HttpSender:
+    """Çalışan bir sunucuya (gunicorn, flask run) HTTP; thread başına bir oturum."""
+
+    def __init__(self, base_url, timeout):
+        import requests
+        self._requests = requests
+        self.base_url = base_url.rstrip('/')
+        self.label = self.base_url
+        self.timeout = timeout
+        self._local = threading.local()
+
+    def send(self, method, path, body=None, headers=None):
+        session = getattr(self._local, 'session', None)
+        if session is None:
+            session = self._local.session = self._requests.Session()
+        kwargs = {'json': body} if isinstance(body, (dict, list)) else {'data': body}
+        response = session.request(method, self.base_url + path, headers=headers, timeout=self.timeout, **kwargs)
+        return response.status_code, len(response.content)
+
+
+def run(sender, records, concurrency, max_requests=None, duration_s=None, rate=0.0, replay_timing=False, speed=1.0):
+    """
+    Akışı oynat.
+
+    Returns:
+        ([(uç_nokta, gecikme_ms, durum_kodu veya None, yanıt_baytı), ...], geçen_süre_s)
+    """
+    stream = schedule(records, rate, replay_timing, speed)
+    stream_lock = threading.Lock()
+    results = []
+    results_lock = threading.Lock()
+    issued = itertools.count()
+    started = time.perf_counter()
+
+    def worker():
+        while True:
+            with stream_lock:
+                index = next(issued)
+                if max_requests is not None and index >= max_requests:
+                    return
+                offset, record = next(stream)
+            if duration_s is not None and (offset if offset is not None else time.perf_counter() - started) >= duration_s:
+                return
+            if offset is not None:
+                delay = started + offset - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+                request_start = started + offset
+            else:
+                request_start = time.perf_counter()
+            method = record['method'].upper()
+            try:
+                status, size = sender.send(method, record['path'], record.get('body'), record.get('headers'))
+            except Exception:
+                status, size = None, 0
+            latency_ms = (time.perf_counter() - request_start) * 1000
+            with results_lock:
+                results.append((endpoint_of(method, record['path']), latency_ms, status, size))
+
+    threads = [threading.Thread(target=worker, daemon=True) for _ in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results, time.perf_counter() - started
+
+
+def summarize(results, elapsed_s):
+    """Uç nokta başına (ve ALL) istek, hata, gecikme yüzdelikleri ve verim."""
+    groups = {}
+    for endpoint, latency_ms, status, size in results:
+        groups.setdefault(endpoint, []).append((latency_ms, status, size))
+        groups.setdefault(ALL_ENDPOINTS, []).append((latency_ms, status, size))
+
+    summary = {}
+    for endpoint, rows in sorted(groups.items(), key=lambda item: (item[0] == ALL_ENDPOINTS, item[0])):
+        latencies = np.array([row[0] for row in rows])
+        statuses = [row[1] for row in rows]
+        errors = sum(1 for status in statuses if status is None or status >= 500)
+        client_errors = sum(1 for status in statuses if status is not None and 400 <= status < 500)
+        entry = {
+            'requests': len(rows),
+            'throughput_rps': round(len(rows) / elapsed_s, 2) if elapsed_s > 0 else None,
+            'errors': errors,
+            'client_errors': client_errors,
+            'error_rate': round(errors / len(rows), 4),
+            'mean_response_bytes': int(np.mean([row[2] for row in rows]))
+        }
+        for percentile, value in zip(PERCENTILES, np.percentile(latencies, PERCENTILES)):
+            entry[f'p{percentile}_ms'] = round(float(value), 1)
+        entry['max_ms'] = round(float(latencies.max()), 1)
+        summary[endpoint] = entry
+    return summary
+
+
+def print_table(summary, elapsed_s, label):
+    columns = ('requests', 'throughput_rps', 'p50_ms', 'p95_ms', 'p99_ms', 'max_ms', 'error_rate', 'client_errors')
+    width = max(len(endpoint) for endpoint in summary)
+    print(f"Hedef: {label}  Süre: {elapsed_s:.1f} s")
+    print(f"{'endpoint':<{width}}  " + '  '.join(f'{column:>14}' for column in columns))
+    for endpoint, entry in summary.items():
+        print(f'{endpoint:<{width}}  ' + '  '.join(f'{entry[column]:>14}' for column in columns))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Kayıtlı istek akışını yeniden oynatarak yük testi')
+    parser.add_argument('traffic', nargs='+', help='JSONL istek akışı dosyaları')
+    parser.add_argument('--target', default=None, help='Sunucu adresi (ör. http://127.0.0.1:8000); yoksa süreç içi')
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--rate', type=float, default=0.0, help='Saniyede istek (0 = kapalı döngü)')
+    parser.add_argument('--replay-timing', action='store_true', help="Kayıttaki 't' zamanlamasını kullan")
+    parser.add_argument('--speed', type=float, default=1.0, help='--replay-timing hız çarpanı')
+    parser.add_argument('--requests', type=int, default=None, help='Toplam istek (varsayılan: akış bir kez)')
+    parser.add_argument('--duration', type=float, default=None, help='Süre, saniye (akış döngüsel tekrarlanır)')
+    parser.add_argument('--warmup', type=int, default=0, help='Ölçümden önce akışın sıralı oynatılma sayısı')
+    parser.add_argument('--timeout', type=float, default=60.0, help='HTTP istek zaman aşımı, saniye')
+    parser.add_argument('--json', action='store_true', help='Raporu JSON olarak yazdır')
+    parser.add_argument('--max-error-rate', type=float, default=None)
+    parser.add_argument('--max-p99-ms', type=float, default=None)
+    args = parser.parse_args()
+
+    records, skipped = load_records(args.traffic)
+    if not records:
+        print(f'Oynatılabilir kayıt yok ({skipped} satır atlandı)', file=sys.stderr)
+        return 2
+    if skipped:
+        print(f'{skipped} satır atlandı (method/path yok)', file=sys.stderr)
+
+    sender = HttpSender(args.target, args.timeout) if args.target else InProcessSender()
+    for _ in range(args.warmup):
+        run(sender, records, concurrency=1, max_requests=len(records))
+
+    max_requests = args.requests
+    if max_requests is None and args.duration is None:
+        max_requests = len(records)
+    results, elapsed_s = run(
+        sender, records, args.concurrency, max_requests=max_requests, duration_s=args.duration,
+        rate=args.rate, replay_timing=args.replay_timing, speed=args.speed
+    )
+    if not results:
+        print('Hiç istek gönderilmedi', file=sys.stderr)
+        return 2
+    summary = summarize(results, elapsed_s)
+
+    if args.json:
+        print(json.dumps({'target': sender.label, 'elapsed_s': round(elapsed_s, 2), 'endpoints': summary}, indent=2))
+    else:
+        print_table(summary, elapsed_s, sender.label)
+
+    overall = summary[ALL_ENDPOINTS]
+    failed = []
+    if args.max_error_rate is not None and overall['error_rate'] > args.max_error_rate:
+        failed.append(f"hata oranı {overall['error_rate']} > {args.max_error_rate}")
+    if args.max_p99_ms is not None and overall['p99_ms'] > args.max_p99_ms:
+        failed.append(f"p99 {overall['p99_ms']} ms > {args.max_p99_ms} ms")
+    for message in failed:
+        print(f'EŞİK AŞILDI: {message}', file=sys.stderr)
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,189 @@
+"""
+Structured logging for Asteroid Impact Visualizer
+Queue-based, off-thread log writing with per-endpoint sampling and request IDs
+
+Ortam değişkenleri (kod değişikliği gerekmeden ayarlanabilir):
+    LOG_LEVEL          Minimum seviye (varsayılan: INFO)
+    LOG_FORMAT         'json' veya 'text' (varsayılan: json)
+    LOG_SAMPLE_RATE    Tüm endpoint'ler için varsayılan örnekleme oranı 0-1 (varsayılan: 1.0)
+    LOG_SAMPLE_RATES   Endpoint bazlı oranlar, ör. "simulate_entry=0.1,calculate_advanced_impact=0.5"
+    LOG_QUEUE_SIZE     Kuyruk kapasitesi; dolduğunda kayıtlar atılır (varsayılan: 10000)
+
+Örnekleme yalnızca INFO ve altını etkiler; WARNING ve üstü her zaman yazılır.
+"""
+
+import atexit
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import random
+import sys
+import uuid
+
+from flask import g, has_request_context, request
+
+LOGGER_NAME = 'impact'
+REQUEST_ID_HEADER = 'X-Request-ID'
+
+_listener = None
+_queue_handler = None
+
+
+def get_logger(name=None):
+    """Return the application logger (or a child of it)."""
+    return logging.getLogger(f"{LOGGER_NAME}.{name}" if name else LOGGER_NAME)
+
+
+def _parse_sample_rates(raw):
+    """Parse "endpoint=rate,endpoint=rate" into a dict, ignoring malformed entries."""
+    rates = {}
+    for item in (raw or '').split(','):
+        if '=' not in item:
+            continue
+        endpoint, _, rate = item.partition('=')
+        try:
+            rates[endpoint.strip()] = max(0.0, min(1.0, float(rate)))
+        except ValueError:
+            continue
+    return rates
+
+
+class RequestContextFilter(logging.Filter):
+    """
+    Kayda request_id/endpoint ekler ve örneklenmemiş isteklerin düşük seviyeli kayıtlarını atar.
+
+    QueueHandler üzerinde çalışır, yani istek thread'inde (flask.g erişilebilirken) değerlendirilir.
+    """
+
+    def filter(self, record):
+        if has_request_context():
+            record.request_id = g.get('request_id', '-')
+            record.endpoint = request.endpoint or request.path
+            if record.levelno < logging.WARNING and not g.get('log_sampled', True):
+                return False
+        else:
+            record.request_id = getattr(record, 'request_id', '-')
+            record.endpoint = getattr(record, 'endpoint', '-')
+        if not hasattr(record, 'fields'):
+            record.fields = {}
+        return True
+
+
+class DroppingQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler that never blocks: records are dropped when the queue is full."""
+
+    def __init__(self, log_queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line."""
+
+    def format(self, record):
+        payload = {
+            'ts': round(record.created, 3),
+            'level': record.levelname,
+            'logger': record.name,
+            'msg': record.getMessage(),
+            'request_id': getattr(record, 'request_id', '-'),
+            'endpoint': getattr(record, 'endpoint', '-'),
+        }
+        fields = getattr(record, 'fields', None)
+        if fields:
+            payload.update(fields)
+        return json.dumps(payload, ensure_ascii=False, default=str)
+
+
+class TextFormatter(logging.Formatter):
+    """Human-readable single-line format for local development."""
+
+    def __init__(self):
+        super().__init__('%(asctime)s %(levelname)s [%(request_id)s] %(name)s: %(message)s')
+
+    def format(self, record):
+        line = super().format(record)
+        fields = getattr(record, 'fields', None)
+        if fields:
+            line += ' ' + ' '.join(f"{k}={v}" for k, v in fields.items())
+        return line
+
+
+def _start_listener():
+    """(Re)start the background writer thread."""
+    global _listener
+    stream_handler = logging.StreamHandler(sys.stdout)
+    if os.environ.get('LOG_FORMAT', 'json').lower() == 'text':
+        stream_handler.setFormatter(TextFormatter())
+    else:
+        stream_handler.setFormatter(JsonFormatter())
+    _listener = logging.handlers.QueueListener(_queue_handler.queue, stream_handler, respect_handler_level=False)
+    _listener.start()
+
+
+def _stop_listener():
+    if _listener is not None:
+        try:
+            _listener.stop()
+        except Exception:
+            pass
+
+
+def _restart_listener_after_fork():
+    # Thread'ler fork sonrası çocuk süreçte yaşamaz (gunicorn preload_app)
+    global _listener
+    if _queue_handler is None:
+        return
+    _queue_handler.queue = queue.Queue(_queue_handler.queue.maxsize)
+    _listener = None
+    _start_listener()
+
+
+def configure_logging(app):
+    """
+    Kök 'impact' logger'ını kuyruk tabanlı handler ile yapılandır ve Flask'a
+    request ID / örnekleme kancalarını bağla. Birden fazla çağrılması güvenlidir.
+    """
+    global _queue_handler
+
+    logger = get_logger()
+    logger.setLevel(os.environ.get('LOG_LEVEL', 'INFO').upper())
+    logger.propagate = False
+
+    if _queue_handler is None:
+        queue_size = int(os.environ.get('LOG_QUEUE_SIZE', 10000))
+        _queue_handler = DroppingQueueHandler(queue.Queue(queue_size))
+        _queue_handler.addFilter(RequestContextFilter())
+        logger.addHandler(_queue_handler)
+        _start_listener()
+        atexit.register(_stop_listener)
+        if hasattr(os, 'register_at_fork'):
+            os.register_at_fork(after_in_child=_restart_listener_after_fork)
+
+    default_rate = max(0.0, min(1.0, float(os.environ.get('LOG_SAMPLE_RATE', 1.0))))
+    endpoint_rates = _parse_sample_rates(os.environ.get('LOG_SAMPLE_RATES'))
+    app.config.setdefault('LOG_SAMPLE_RATE', default_rate)
+    app.config.setdefault('LOG_SAMPLE_RATES', endpoint_rates)
+
+    @app.before_request
+    def _assign_request_id():
+        g.request_id = request.headers.get(REQUEST_ID_HEADER) or uuid.uuid4().hex[:16]
+        rate = app.config['LOG_SAMPLE_RATES'].get(request.endpoint, app.config['LOG_SAMPLE_RATE'])
+        g.log_sampled = rate >= 1.0 or random.random() < rate
+
+    @app.after_request
+    def _attach_request_id(response):
+        request_id = g.get('request_id')
+        if request_id:
+            response.headers[REQUEST_ID_HEADER] = request_id
+        return response
+
+    return logger
@@ -0,0 +1,181 @@
+"""
+Response encoding for Asteroid Impact Visualizer
+Content negotiation for compressed (gzip/brotli) and binary (MessagePack) API responses
+
+JSON varsayılan olarak kalır. İstemciler iki şekilde katılabilir:
+    Accept: application/msgpack         Dizi ağırlıklı yanıtlar MessagePack olarak döner;
+                                        float listeleri ham little-endian float32 (ext tip 1)
+    Accept-Encoding: br, gzip           1 KiB üstü JSON/MessagePack gövdeleri sıkıştırılır
+                                        (brotli yalnızca 'Brotli' paketi kuruluysa)
+
+Deterministik yanıtlar (PrecomputedResponse) başlangıçta bir kez serileştirilip tüm
+format/kodlama kombinasyonları için sıkıştırılır; güçlü ETag, Cache-Control ve 304 ile sunulur.
+
+Ortam değişkenleri:
+    COMPRESS_MIN_BYTES       Sıkıştırma eşiği (varsayılan: 1024)
+    COMPRESS_LEVEL           gzip seviyesi 1-9 (varsayılan: 6); brotli kalitesi buna göre seçilir
+    PRECOMPUTED_MAX_AGE      Sabit yanıtlar için Cache-Control max-age, saniye (varsayılan: 3600)
+"""
+
+import gzip
+import hashlib
+import os
+
+import numpy as np
+from flask import current_app, jsonify, request
+
+try:
+    import msgpack
+except ImportError:  # MessagePack opsiyonel - yoksa JSON döner
+    msgpack = None
+
+try:
+    import brotli
+except ImportError:  # Brotli opsiyonel - yoksa gzip kullanılır
+    brotli = None
+
+MSGPACK_MIMETYPE = 'application/msgpack'
+FLOAT32_EXT_TYPE = 1
+FLOAT32_MIN_LENGTH = 8  # Kısa listeler için ext başlığı kazanç sağlamaz
+
+COMPRESSIBLE_MIMETYPES = {'application/json', MSGPACK_MIMETYPE}
+
+
+def _is_float_list(value):
+    return (
+        len(value) >= FLOAT32_MIN_LENGTH
+        and all(isinstance(item, (float, np.floating)) for item in value)
+    )
+
+
+def pack_arrays(value):
+    """
+    Yükü MessagePack için hazırla: float listeleri / numpy float dizileri -> float32 ext,
+    numpy skalerleri -> Python tipleri. Diğer her şey olduğu gibi kalır.
+    """
+    if isinstance(value, dict):
+        return {key: pack_arrays(item) for key, item in value.items()}
+    if isinstance(value, np.ndarray):
+        if value.ndim == 1 and value.dtype.kind == 'f' and len(value) >= FLOAT32_MIN_LENGTH:
+            return msgpack.ExtType(FLOAT32_EXT_TYPE, value.astype('<f4').tobytes())
+        return pack_arrays(value.tolist())
+    if isinstance(value, (list, tuple)):
+        if _is_float_list(value):
+            return msgpack.ExtType(FLOAT32_EXT_TYPE, np.asarray(value, dtype='<f4').tobytes())
+        return [pack_arrays(item) for item in value]
+    if isinstance(value, np.generic):
+        return value.item()
+    return value
+
+
+def wants_msgpack():
+    """İstemci MessagePack'i JSON'a tercih ediyor mu (Accept başlığı)?"""
+    if msgpack is None:
+        return False
+    best = request.accept_mimetypes.best_match(['application/json', MSGPACK_MIMETYPE])
+    return best == MSGPACK_MIMETYPE
+
+
+def negotiated_response(payload, status=200):
+    """
+    jsonify yerine kullanılır: Accept başlığına göre JSON veya MessagePack yanıt.
+    """
+    if wants_msgpack():
+        response = current_app.response_class(
+            msgpack.packb(pack_arrays(payload), use_bin_type=True),
+            status=status,
+            mimetype=MSGPACK_MIMETYPE
+        )
+    else:
+        response = jsonify(payload)
+        response.status_code = status
+    response.vary.add('Accept')
+    return response
+
+
+class PrecomputedResponse:
+    """
+    Bir kez serileştirilen ve sıkıştırılan sabit yanıt.
+
+    Her temsil (JSON/MessagePack x identity/gzip/br) ayrı bir güçlü ETag taşır;
+    If-None-Match eşleşirse gövdesiz 304 döner. Uygulama bağlamında oluşturulmalıdır.
+    """
+
+    def __init__(self, payload):
+        formats = {'application/json': current_app.json.dumps(payload).encode('utf-8')}
+        if msgpack is not None:
+            formats[MSGPACK_MIMETYPE] = msgpack.packb(pack_arrays(payload), use_bin_type=True)
+
+        self.variants = {}
+        for mimetype, body in formats.items():
+            digest = hashlib.sha256(body).hexdigest()[:32]
+            encodings = {None: body, 'gzip': gzip.compress(body, compresslevel=9, mtime=0)}
+            if brotli is not None:
+                encodings['br'] = brotli.compress(body, quality=11)
+            for encoding, data in encodings.items():
+                etag = f"{digest}-{encoding}" if encoding else digest
+                self.variants[(mimetype, encoding)] = (data, etag)
+
+    def serve(self):
+        mimetype = MSGPACK_MIMETYPE if wants_msgpack() else 'application/json'
+        encoding = _choose_encoding(request.accept_encodings)
+        body, etag = self.variants[(mimetype, encoding)]
+
+        if request.if_none_match.contains_weak(etag):
+            response = current_app.response_class(status=304)
+        else:
+            response = current_app.response_class(body, mimetype=mimetype)
+            if encoding:
+                response.headers['Content-Encoding'] = encoding
+        response.set_etag(etag)
+        response.headers['Cache-Control'] = f"public, max-age={current_app.config['PRECOMPUTED_MAX_AGE']}"
+        response.vary.update(('Accept', 'Accept-Encoding'))
+        return response
+
+
+def _choose_encoding(accept_encodings):
+    """Accept-Encoding'e göre 'br', 'gzip' veya None."""
+    if brotli is not None and accept_encodings['br']:
+        return 'br'
+    if accept_encodings['gzip']:
+        return 'gzip'
+    return None
+
+
+def configure_response_encoding(app):
+    """Uygun yanıtları Accept-Encoding'e göre sıkıştıran after_request kancasını bağla."""
+    app.config.setdefault('COMPRESS_MIN_BYTES', int(os.environ.get('COMPRESS_MIN_BYTES', 1024)))
+    app.config.setdefault('COMPRESS_LEVEL', max(1, min(9, int(os.environ.get('COMPRESS_LEVEL', 6)))))
+    app.config.setdefault('PRECOMPUTED_MAX_AGE', int(os.environ.get('PRECOMPUTED_MAX_AGE', 3600)))
+
+    @app.after_request
+    def _compress_response(response):
+        if (
+            response.direct_passthrough
+            or response.status_code != 200
+            or 'Content-Encoding' in response.headers
+            or response.mimetype not in COMPRESSIBLE_MIMETYPES
+        ):
+            return response
+
+        response.vary.add('Accept-Encoding')
+        body = response.get_data()
+        if len(body) < app.config['COMPRESS_MIN_BYTES']:
+            return response
+
+        encoding = _choose_encoding(request.accept_encodings)
+        if encoding is None:
+            return response
+
+        level = app.config['COMPRESS_LEVEL']
+        if encoding == 'br':
+            # Brotli kalite 0-11; dinamik yanıtlar için orta seviye hız/oran dengesi iyi
+            compressed = brotli.compress(body, quality=min(11, level - 1))
+        else:
+            compressed = gzip.compress(body, compresslevel=level, mtime=0)
+
+        response.set_data(compressed)
+        response.headers['Content-Encoding'] = encoding
+        return response
+
+    return app
@@ -0,0 +1,248 @@
+"""
+Single-flight request coalescing for Asteroid Impact Visualizer
+Identical concurrent computations and outbound lookups run once and share the result
+
+Aynı senaryo (ör. haberlerdeki bir asteroidin İstanbul'a çarpması) aynı anda çok sayıda
+istemciden istendiğinde her istek grid'i ve GeoNames/NASA çağrılarını ayrı ayrı çalıştırır.
+SingleFlight aynı anahtarlı eşzamanlı çağrıları birleştirir:
+
+- Worker içinde: ilk çağrı (lider) hesaplar, diğer thread'ler bekler ve aynı sonucu
+  (veya aynı istisnayı) alır.
+- Worker'lar arasında: lider, anahtara ait kilit dosyasını (fcntl.flock) hesaplama
+  süresince tutar. Başka bir worker kilidi bekler; beklediğini bir işaret dosyasıyla
+  bildirir ve lider sonucu (veya hata mesajını, SharedFlightError) JSON olarak yazar.
+  Sonuç JSON'a çevrilemiyorsa bekleyen worker kendisi hesaplar.
+
+Bu bir önbellek değildir: sonuç yalnızca hesaplama sürerken bekleyenlerle paylaşılır
+(dosya sonuçları SINGLE_FLIGHT_TTL saniye geçerlidir).
+
+Ortam değişkenleri:
+    SINGLE_FLIGHT_DIR     Kilit/sonuç dosyalarının dizini (varsayılan: <tmp>/asteroid-impact-single-flight);
+                          'off' worker'lar arası birleştirmeyi kapatır
+    SINGLE_FLIGHT_TTL     Worker'lar arası sonuç dosyasının geçerlilik süresi, saniye (varsayılan: 10)
+    SINGLE_FLIGHT_WAIT    Başka bir worker'ın sonucunu en fazla bekleme süresi, saniye (varsayılan: 120)
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+
+try:
+    import fcntl
+except ImportError:  # Windows - yalnızca worker içi birleştirme
+    fcntl = None
+
+SWEEP_INTERVAL = 256           # Bu kadar lider çağrısında bir eski dosyalar temizlenir
+LOCK_POLL_SECONDS = 0.02
+
+_MISSING = object()
+
+
+def _default_directory():
+    configured = os.environ.get('SINGLE_FLIGHT_DIR', '')
+    if configured.lower() == 'off' or fcntl is None:
+        return None
+    return configured or os.path.join(tempfile.gettempdir(), 'asteroid-impact-single-flight')
+
+
+class SharedFlightError(RuntimeError):
+    """Başka bir worker'daki liderin hesaplaması hata verdi (mesajı taşır)."""
+
+
+def flight_key(*parts):
+    """Anahtar parçalarından kararlı özet (JSON'a çevrilemeyen parçalar str ile)."""
+    canonical = json.dumps(parts, sort_keys=True, separators=(',', ':'), default=str)
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()[:32]
+
+
+class _Call:
+    __slots__ = ('done', 'result', 'error', 'waiters')
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+        self.waiters = 0
+
+
+class SingleFlight:
+    """Anahtar başına tek uçuş: eşzamanlı aynı çağrılar tek hesaplamayı paylaşır."""
+
+    def __init__(self, directory=_MISSING, ttl=None, wait_timeout=None):
+        self.directory = _default_directory() if directory is _MISSING else directory
+        self.ttl = ttl if ttl is not None else float(os.environ.get('SINGLE_FLIGHT_TTL', 10))
+        self.wait_timeout = wait_timeout if wait_timeout is not None else float(os.environ.get('SINGLE_FLIGHT_WAIT', 120))
+        self._calls = {}
+        self._lock = threading.Lock()
+        self._stats = {'leaders': 0, 'shared': 0, 'shared_across_workers': 0}
+        if self.directory:
+            try:
+                os.makedirs(self.directory, exist_ok=True)
+            except OSError:
+                self.directory = None
+
+    def do(self, namespace, key, compute, across_workers=True):
+        """
+        compute() sonucunu döndür; aynı (namespace, key) için süren bir hesaplama varsa onu bekle.
+
+        key JSON'a çevrilebilir olmalıdır (tuple, sayı, str...). across_workers=True ise
+        sonuç JSON ile diğer worker'lara aktarılabilir olmalıdır; değilse birleştirme yalnızca
+        worker içinde kalır.
+        """
+        digest = flight_key(namespace, key)
+        with self._lock:
+            call = self._calls.get(digest)
+            leader = call is None
+            if leader:
+                call = self._calls[digest] = _Call()
+                self._stats['leaders'] += 1
+                sweep = self._stats['leaders'] % SWEEP_INTERVAL == 0
+            else:
+                call.waiters += 1
+                self._stats['shared'] += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            if across_workers and self.directory:
+                call.result = self._across_workers(digest, compute)
+            else:
+                call.result = compute()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[digest]
+            call.done.set()
+            if sweep and self.directory:
+                self._sweep()
+
+    # ------------------------------------------------------------------
+    # Worker'lar arası
+    # ------------------------------------------------------------------
+
+    def _across_workers(self, digest, compute):
+        base = os.path.join(self.directory, digest)
+        try:
+            lock_file = open(base + '.lock', 'a+')
+        except OSError:
+            return compute()
+        with lock_file:
+            if not self._try_lock(lock_file):
+                # Başka bir worker hesaplıyor: beklediğimizi bildir, kilidi bekle, sonucu oku
+                self._touch(base + '.wait')
+                acquired = self._wait_lock(lock_file)
+                try:
+                    result = self._read_result(base + '.json')
+                except SharedFlightError:
+                    if acquired:
+                        fcntl.flock(lock_file, fcntl.LOCK_UN)
+                    raise
+                if result is not _MISSING:
+                    if acquired:
+                        fcntl.flock(lock_file, fcntl.LOCK_UN)
+                    with self._lock:
+                        self._stats['shared_across_workers'] += 1
+                    return result
+                if not acquired:
+                    return compute()
+                # Kilit bizde ama sonuç yok (lider işareti görmeden bitirdi): lider olarak hesapla
+            try:
+                result = compute()
+            except Exception as e:
+                # Bekleyen worker'lar aynı hatayı alır (ör. zaman aşımını tekrar beklemezler)
+                if os.path.exists(base + '.wait'):
+                    self._write_record(base + '.json', {'error': f'{type(e).__name__}: {e}'})
+                    self._remove(base + '.wait')
+                raise
+            else:
+                if os.path.exists(base + '.wait'):
+                    self._write_record(base + '.json', {'value': result})
+                    self._remove(base + '.wait')
+                return result
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    @staticmethod
+    def _try_lock(lock_file):
+        try:
+            fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            return True
+        except BlockingIOError:
+            return False
+
+    def _wait_lock(self, lock_file):
+        deadline = time.monotonic() + self.wait_timeout
+        while time.monotonic() < deadline:
+            if self._try_lock(lock_file):
+                return True
+            time.sleep(LOCK_POLL_SECONDS)
+        return False
+
+    def _read_result(self, path):
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                record = json.load(f)
+        except (OSError, ValueError):
+            return _MISSING
+        if time.time() - record.get('created', 0) > self.ttl:
+            return _MISSING
+        if 'error' in record:
+            raise SharedFlightError(record['error'])
+        return record['value']
+
+    @staticmethod
+    def _write_record(path, record):
+        try:
+            payload = json.dumps(dict(record, created=time.time()), separators=(',', ':'))
+        except (TypeError, ValueError):
+            return  # JSON'a çevrilemeyen sonuç: bekleyen worker kendisi hesaplar
+        tmp_path = f'{path}.{os.getpid()}.tmp'
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                f.write(payload)
+            os.replace(tmp_path, path)
+        except OSError:
+            SingleFlight._remove(tmp_path)
+
+    @staticmethod
+    def _touch(path):
+        try:
+            with open(path, 'a'):
+                pass
+        except OSError:
+            pass
+
+    @staticmethod
+    def _remove(path):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+    def _sweep(self):
+        """TTL'in çok ötesinde kalmış sonuç/işaret/kilit dosyalarını sil."""
+        cutoff = time.time() - max(10 * self.ttl, 300)
+        try:
+            entries = list(os.scandir(self.directory))
+        except OSError:
+            return
+        for entry in entries:
+            try:
+                if entry.stat().st_mtime < cutoff:
+                    os.remove(entry.path)
+            except OSError:
+                pass
+
+    def info(self):
+        with self._lock:
+            return dict(self._stats, in_flight=len(self._calls), across_workers=bool(self.directory))
@@ -0,0 +1,94 @@
+"""
+Byte-bounded stage cache for Asteroid Impact Visualizer
+LRU memoization limited by the memory held by cached numpy arrays
+
+functools.lru_cache girdi sayısıyla sınırlanır; değerlendirme aşamalarında ise bir girdinin
+boyutu çözünürlük ve yarıçapla yüzlerce kat değişir (5 km'de birkaç KB, 0.5 km'de MB'lar).
+byte_bounded_cache sonuçtaki numpy dizilerinin baytlarını sayar ve toplam sınırı aşınca en
+eski kullanılan girdileri atar. Sınırdan büyük tek bir sonuç önbelleğe alınmaz.
+
+Sarmalanan fonksiyon lru_cache ile aynı arayüzü sunar (cache_info()._asdict(), cache_clear()),
+böylece aşama listelerinde birbirinin yerine kullanılabilir. Hesaplama kilit dışında yapılır;
+aynı anahtar için eşzamanlı iki ıskalama iki kez hesaplar ve sonuncusu saklanır.
+
+Ortam değişkenleri (MB; app.py'deki aşamalar):
+    RADIUS_KEYS_CACHE_MB        Izgara mesafe anahtarları (varsayılan: 32)
+    RADIUS_RATES_CACHE_MB       Mesafe başına kayıp oranları (varsayılan: 64)
+    RADIUS_POPULATION_CACHE_MB  Konum başına mesafe anahtarlı nüfus (varsayılan: 128)
+"""
+
+import functools
+import os
+import sys
+import threading
+from collections import OrderedDict, namedtuple
+
+import numpy as np
+
+CacheInfo = namedtuple('CacheInfo', ['hits', 'misses', 'maxsize', 'currsize', 'nbytes', 'max_bytes'])
+
+MB = 1024 * 1024
+
+
+def nbytes_of(value):
+    """Bir sonucun yaklaşık bellek boyutu: diziler nbytes ile, kapsayıcılar özyinelemeli."""
+    if isinstance(value, np.ndarray):
+        return value.nbytes
+    if isinstance(value, dict):
+        return sum(nbytes_of(item) for item in value.values())
+    if isinstance(value, (tuple, list)):
+        return sum(nbytes_of(item) for item in value)
+    return sys.getsizeof(value)
+
+
+def byte_bounded_cache(env_var, default_mb):
+    """
+    Toplam boyutu env_var MB (varsayılan default_mb) ile sınırlı LRU önbellek dekoratörü.
+
+    Yalnızca hashlenebilir konumsal argümanlar desteklenir (aşama fonksiyonları gibi).
+    """
+    max_bytes = int(float(os.environ.get(env_var, default_mb)) * MB)
+
+    def decorator(func):
+        entries = OrderedDict()
+        lock = threading.Lock()
+        stats = {'hits': 0, 'misses': 0, 'nbytes': 0}
+
+        @functools.wraps(func)
+        def wrapper(*args):
+            with lock:
+                entry = entries.get(args)
+                if entry is not None:
+                    entries.move_to_end(args)
+                    stats['hits'] += 1
+                    return entry[0]
+                stats['misses'] += 1
+            value = func(*args)
+            size = nbytes_of(value)
+            if size > max_bytes:
+                return value
+            with lock:
+                previous = entries.pop(args, None)
+                if previous is not None:
+                    stats['nbytes'] -= previous[1]
+                entries[args] = (value, size)
+                stats['nbytes'] += size
+                while stats['nbytes'] > max_bytes:
+                    _, (_, evicted) = entries.popitem(last=False)
+                    stats['nbytes'] -= evicted
+            return value
+
+        def cache_info():
+            with lock:
+                return CacheInfo(stats['hits'], stats['misses'], None, len(entries), stats['nbytes'], max_bytes)
+
+        def cache_clear():
+            with lock:
+                entries.clear()
+                stats.update(hits=0, misses=0, nbytes=0)
+
+        wrapper.cache_info = cache_info
+        wrapper.cache_clear = cache_clear
+        return wrapper
+
+    return decorator
@@ -0,0 +1,137 @@
+"""
+Cold-start measurement and startup budget check
+Soğuk başlangıç ölçümü ve başlangıç süresi bütçesi
+
+Her ölçüm temiz bir Python sürecinde yapılır (modül önbellekleri paylaşılmaz):
+    import_ms          `import app` süresi (worker'ın uygulamayı yüklemesi)
+    warmup_ms          app.warm_up() süresi (gunicorn preload ile fork öncesi)
+    first_request_ms   warm-up sonrası ilk GET / ve /api/get_asteroid_data
+
+Ayrıca başlangıçta yüklenmemesi gereken ağır modüllerin (LAZY_MODULES) gerçekten
+tembel kaldığı kontrol edilir.
+
+Kullanım:
+    python startup_check.py [--runs 5] [--import-budget-ms 600] [--warmup-budget-ms 5000]
+    python startup_check.py --importtime     # en yavaş doğrudan import'ları listele
+
+Medyan süre bütçeyi aşarsa veya tembel bir modül başlangıçta yüklenirse çıkış kodu 1 olur.
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+# Yalnızca canlı dış API isteklerinde gerekir (get_http_session)
+LAZY_MODULES = ('requests', 'certifi', 'urllib3')
+
+MARKER = 'STARTUP_CHECK '
+
+PROBE = f'''
+import json, sys, time
+preloaded = set(sys.modules)  # site/.pth kancalarının yüklediklerini sayma
+started = time.perf_counter()
+import app
+imported = time.perf_counter()
+app.warm_up()
+warmed = time.perf_counter()
+client = app.app.test_client()
+first_request_ms = {{}}
+for path in ('/', '/api/get_asteroid_data'):
+    t = time.perf_counter()
+    client.get(path)
+    first_request_ms[path] = round((time.perf_counter() - t) * 1000, 2)
+print({MARKER!r} + json.dumps({{
+    'import_ms': round((imported - started) * 1000, 1),
+    'warmup_ms': round((warmed - imported) * 1000, 1),
+    'first_request_ms': first_request_ms,
+    'lazy_modules_loaded': [m for m in {LAZY_MODULES!r} if m in sys.modules and m not in preloaded]
+}}), flush=True)
+'''
+
+
+def _probe_env():
+    env = dict(os.environ)
+    env['LOG_LEVEL'] = 'WARNING'  # Uygulama logları ölçüm çıktısına karışmasın
+    return env
+
+
+def measure_once():
+    """Temiz bir süreçte bir soğuk başlangıç ölç."""
+    output = subprocess.run(
+        [sys.executable, '-c', PROBE], cwd=ROOT, env=_probe_env(),
+        capture_output=True, text=True, check=True
+    ).stdout
+    for line in reversed(output.splitlines()):
+        if line.startswith(MARKER):
+            return json.loads(line[len(MARKER):])
+    raise RuntimeError('Probe produced no measurement')
+
+
+def slowest_imports(limit=15):
+    """`python -X importtime` ile app'in doğrudan import'ları, kümülatif süreye göre."""
+    stderr = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', 'import app'], cwd=ROOT, env=_probe_env(),
+        capture_output=True, text=True, check=True
+    ).stderr
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative_us, name = line[len('import time:'):].split('|')
+        if name.startswith('    '):
+            continue  # İç içe import; yalnızca en üst seviye listelenir
+        rows.append((int(cumulative_us) / 1000, name.strip()))
+    return sorted(rows, reverse=True)[:limit]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Cold-start measurement and startup budget check')
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--import-budget-ms', type=float,
+                        default=float(os.environ.get('STARTUP_IMPORT_BUDGET_MS', 600)))
+    parser.add_argument('--warmup-budget-ms', type=float,
+                        default=float(os.environ.get('STARTUP_WARMUP_BUDGET_MS', 5000)))
+    parser.add_argument('--importtime', action='store_true', help='List the slowest direct imports and exit')
+    args = parser.parse_args()
+
+    if args.importtime:
+        for cumulative_ms, name in slowest_imports():
+            print(f"  {cumulative_ms:8.1f} ms  {name}")
+        return 0
+
+    runs = [measure_once() for _ in range(args.runs)]
+    import_ms = statistics.median(run['import_ms'] for run in runs)
+    warmup_ms = statistics.median(run['warmup_ms'] for run in runs)
+    first_request_ms = {
+        path: statistics.median(run['first_request_ms'][path] for run in runs)
+        for path in runs[0]['first_request_ms']
+    }
+    lazy_loaded = sorted({module for run in runs for module in run['lazy_modules_loaded']})
+
+    print(f"import:   {import_ms:8.1f} ms  (budget {args.import_budget_ms:.0f} ms)")
+    print(f"warm-up:  {warmup_ms:8.1f} ms  (budget {args.warmup_budget_ms:.0f} ms)")
+    for path, ms in first_request_ms.items():
+        print(f"first {path}: {ms:.2f} ms")
+
+    failures = []
+    if import_ms > args.import_budget_ms:
+        failures.append(f"import time {import_ms:.1f} ms exceeds budget {args.import_budget_ms:.0f} ms")
+    if warmup_ms > args.warmup_budget_ms:
+        failures.append(f"warm-up time {warmup_ms:.1f} ms exceeds budget {args.warmup_budget_ms:.0f} ms")
+    if lazy_loaded:
+        failures.append(f"modules expected to load lazily were imported at startup: {', '.join(lazy_loaded)}")
+
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    if not failures:
+        print("OK: startup within budget")
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
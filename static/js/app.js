@@ -275,6 +275,112 @@ function updateUIWithAsteroidData(asteroid) {
     updateSliderValues();
 }
 
+// ============================================================================
+// API Yanıtları: MessagePack (float32 diziler) / JSON
+// ============================================================================
+
+// Dizi ağırlıklı endpoint'lerde ikili yanıt istenir; sunucu desteklemiyorsa JSON döner
+const API_ACCEPT = 'application/msgpack, application/json;q=0.9';
+const MSGPACK_FLOAT32_EXT = 1;
+
+function decodeMsgpack(buffer) {
+    const view = new DataView(buffer);
+    const bytes = new Uint8Array(buffer);
+    const textDecoder = new TextDecoder();
+    let pos = 0;
+
+    function readString(length) {
+        const value = textDecoder.decode(bytes.subarray(pos, pos + length));
+        pos += length;
+        return value;
+    }
+
+    function readArray(length) {
+        const items = new Array(length);
+        for (let i = 0; i < length; i++) items[i] = read();
+        return items;
+    }
+
+    function readMap(length) {
+        const obj = {};
+        for (let i = 0; i < length; i++) {
+            const key = read();
+            obj[key] = read();
+        }
+        return obj;
+    }
+
+    function readExt(length) {
+        const type = view.getInt8(pos);
+        pos += 1;
+        if (type === MSGPACK_FLOAT32_EXT) {
+            // Ham little-endian float32 dizi -> normal Array (JSON ile aynı kullanım)
+            const values = new Array(length / 4);
+            for (let i = 0; i < values.length; i++) values[i] = view.getFloat32(pos + i * 4, true);
+            pos += length;
+            return values;
+        }
+        const data = bytes.slice(pos, pos + length);
+        pos += length;
+        return { type, data };
+    }
+
+    function read() {
+        const byte = bytes[pos++];
+        if (byte <= 0x7f) return byte;
+        if (byte >= 0xe0) return byte - 0x100;
+        if ((byte & 0xf0) === 0x80) return readMap(byte & 0x0f);
+        if ((byte & 0xf0) === 0x90) return readArray(byte & 0x0f);
+        if ((byte & 0xe0) === 0xa0) return readString(byte & 0x1f);
+
+        let value;
+        switch (byte) {
+            case 0xc0: return null;
+            case 0xc2: return false;
+            case 0xc3: return true;
+            case 0xc4: value = bytes.slice(pos + 1, pos + 1 + bytes[pos]); pos += 1 + bytes[pos]; return value;
+            case 0xc5: { const n = view.getUint16(pos); pos += 2; value = bytes.slice(pos, pos + n); pos += n; return value; }
+            case 0xc6: { const n = view.getUint32(pos); pos += 4; value = bytes.slice(pos, pos + n); pos += n; return value; }
+            case 0xc7: { const n = bytes[pos]; pos += 1; return readExt(n); }
+            case 0xc8: { const n = view.getUint16(pos); pos += 2; return readExt(n); }
+            case 0xc9: { const n = view.getUint32(pos); pos += 4; return readExt(n); }
+            case 0xca: value = view.getFloat32(pos); pos += 4; return value;
+            case 0xcb: value = view.getFloat64(pos); pos += 8; return value;
+            case 0xcc: value = view.getUint8(pos); pos += 1; return value;
+            case 0xcd: value = view.getUint16(pos); pos += 2; return value;
+            case 0xce: value = view.getUint32(pos); pos += 4; return value;
+            case 0xcf: value = Number(view.getBigUint64(pos)); pos += 8; return value;
+            case 0xd0: value = view.getInt8(pos); pos += 1; return value;
+            case 0xd1: value = view.getInt16(pos); pos += 2; return value;
+            case 0xd2: value = view.getInt32(pos); pos += 4; return value;
+            case 0xd3: value = Number(view.getBigInt64(pos)); pos += 8; return value;
+            case 0xd4: return readExt(1);
+            case 0xd5: return readExt(2);
+            case 0xd6: return readExt(4);
+            case 0xd7: return readExt(8);
+            case 0xd8: return readExt(16);
+            case 0xd9: { const n = bytes[pos]; pos += 1; return readString(n); }
+            case 0xda: { const n = view.getUint16(pos); pos += 2; return readString(n); }
+            case 0xdb: { const n = view.getUint32(pos); pos += 4; return readString(n); }
+            case 0xdc: { const n = view.getUint16(pos); pos += 2; return readArray(n); }
+            case 0xdd: { const n = view.getUint32(pos); pos += 4; return readArray(n); }
+            case 0xde: { const n = view.getUint16(pos); pos += 2; return readMap(n); }
+            case 0xdf: { const n = view.getUint32(pos); pos += 4; return readMap(n); }
+            default: throw new Error(`Geçersiz MessagePack baytı: 0x${byte.toString(16)}`);
+        }
+    }
+
+    return read();
+}
+
+async function readApiResponse(response) {
+    const contentType = response.headers.get('Content-Type') || '';
+    if (contentType.includes('application/msgpack')) {
+        return decodeMsgpack(await response.arrayBuffer());
+    }
+    return response.json();
+}
+
 // ============================================================================
 // ADIM 2.2 & 2.3: Simülasyon Çalıştırma
 // ============================================================================
@@ -374,7 +480,7 @@ async function runBasicSimulation(params) {
 async function runRumpfSimulation(params) {
     const response = await fetch('/api/calculate_advanced_impact', {
         method: 'POST',
-        headers: { 'Content-Type': 'application/json' },
+        headers: { 'Content-Type': 'application/json', 'Accept': API_ACCEPT },
         body: JSON.stringify({
             ...params,
             grid_resolution_km: 10,  // Hızlı hesaplama için
@@ -382,7 +488,7 @@ async function runRumpfSimulation(params) {
         })
     });
 
-    const result = await response.json();
+    const result = await readApiResponse(response);
 
     if (!result.success) {
         throw new Error(result.error || 'Rumpf simülasyonu başarısız');
@@ -400,7 +506,7 @@ async function runAtmosphericSimulation(params) {
 
     const response = await fetch('/api/simulate_atmospheric_entry', {
         method: 'POST',
-        headers: { 'Content-Type': 'application/json' },
+        headers: { 'Content-Type': 'application/json', 'Accept': API_ACCEPT },
         body: JSON.stringify({
             diameter_m: params.diameter_m,
             velocity_ms: params.velocity_ms,
@@ -410,7 +516,7 @@ async function runAtmosphericSimulation(params) {
         })
     });
 
-    const result = await response.json();
+    const result = await readApiResponse(response);
 
     if (!result.success) {
         throw new Error(result.error || 'Atmosferik simülasyon başarısız');
@@ -426,6 +532,7 @@ function updateMapAndVisualization(impactData, params) {
         try {
             if (window.impactMap && impactMap.map) {
                 impactMap.updateDamageZones(impactData);
+                impactMap.showHazardTiles(params, Boolean(impactData.tsunami_data?.is_ocean_impact));
                 
                 // USGS haritasını da güncelle
                 if (typeof updateUSGSMapLocation === 'function') {
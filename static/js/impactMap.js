@@ -8,6 +8,8 @@ class ImpactMapVisualizer {
         this.map = null;
         this.impactMarker = null;
         this.damageCircles = [];
+        this.hazardTileLayers = {};
+        this.hazardLayerControl = null;
         this.impactLocation = { lat: 28.5729, lng: -80.6490 }; // Varsayılan: NASA Kennedy Space Center, Florida
         
         this.init();
@@ -391,6 +393,55 @@ class ImpactMapVisualizer {
         this.damageCircles = [];
     }
 
+    showHazardTiles(params, isOcean = false) {
+        // Sunucu tarafında çizilen tehlike alanı karoları (yakınlaştırma/kaydırmada yalnızca küçük karolar indirilir)
+        // isOcean: okyanus çarpmalarında kayıp karoları kara tehlikelerini (sismik, ejecta, krater) içermez
+        this.clearHazardTiles();
+        if (!this.map) return;
+
+        const query = new URLSearchParams({
+            diameter_m: params.diameter_m,
+            velocity_ms: params.velocity_ms,
+            density_kg_m3: params.density_kg_m3 || 3000,
+            angle_deg: params.angle_deg || 45,
+            impact_lat: this.impactLocation.lat,
+            impact_lng: this.impactLocation.lng,
+            is_ocean: isOcean ? 'true' : 'false'
+        }).toString();
+
+        const lang = window.appState?.currentLanguage || 'en';
+        const fields = [
+            { key: 'overpressure', name: 'Overpressure', nameTr: 'Aşırı Basınç' },
+            { key: 'thermal', name: 'Thermal Flux', nameTr: 'Termal Akı' },
+            { key: 'wind', name: 'Wind Blast', nameTr: 'Rüzgar' },
+            { key: 'casualty', name: 'Casualty Density', nameTr: 'Kayıp Yoğunluğu' }
+        ];
+
+        const overlays = {};
+        fields.forEach(field => {
+            const layer = L.tileLayer(`/api/hazard_tiles/${field.key}/{z}/{x}/{y}.png?${query}`, {
+                opacity: 0.75,
+                maxZoom: 18,
+                zIndex: 400
+            });
+            this.hazardTileLayers[field.key] = layer;
+            overlays[lang === 'tr' ? field.nameTr : field.name] = layer;
+        });
+
+        this.hazardLayerControl = L.control.layers(null, overlays, { collapsed: true, position: 'topright' }).addTo(this.map);
+    }
+
+    clearHazardTiles() {
+        if (this.map) {
+            Object.values(this.hazardTileLayers).forEach(layer => this.map.removeLayer(layer));
+            if (this.hazardLayerControl) {
+                this.map.removeControl(this.hazardLayerControl);
+            }
+        }
+        this.hazardTileLayers = {};
+        this.hazardLayerControl = null;
+    }
+
     showDeflectionPath(originalPath, deflectedPath) {
         // Yörünge sapması görselleştirmesi
         // Orijinal yörünge (kırmızı)
@@ -0,0 +1,156 @@
+"""
+Traffic capture for Asteroid Impact Visualizer
+Opt-in sampling of API requests into rotating, replayable JSONL files
+
+Örneklenen her /api/ isteği load_test.py'nin oynatabileceği biçimde bir satır olarak yazılır:
+    {"t": ..., "method": "POST", "path": "/api/...?...", "body": {...}, "headers": {...},
+     "status": 200, "latency_ms": 12.3, "response_bytes": 4567}
+
+İstek thread'i yalnızca örnekleme kararını verir ve kaydı kuyruğa koyar (kuyruk doluysa kayıt
+atılır, istek asla beklemez). JSON'a çevirme ve dosyaya yazma arka plan thread'indedir
+(logging_config ile aynı QueueListener düzeni). Her süreç kendi dosyasına yazar
+(traffic-<pid>.jsonl); dosyalar TRAFFIC_CAPTURE_MAX_BYTES'ı aşınca döndürülür.
+
+Ortam değişkenleri:
+    TRAFFIC_CAPTURE_DIR          Kayıt dizini; verilmezse yakalama kapalıdır
+    TRAFFIC_CAPTURE_SAMPLE_RATE  Örneklenen istek oranı 0-1 (varsayılan: 0.1)
+    TRAFFIC_CAPTURE_MAX_BYTES    Dosya başına boyut sınırı (varsayılan: 50 MB)
+    TRAFFIC_CAPTURE_BACKUPS      Süreç başına saklanan eski dosya sayısı (varsayılan: 5)
+    TRAFFIC_CAPTURE_MAX_BODY     Bundan büyük gövdeler yazılmaz, bayt (varsayılan: 65536)
+"""
+
+import atexit
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import random
+import time
+
+from flask import g, request
+
+CAPTURED_HEADERS = ('Accept', 'Accept-Encoding')
+QUEUE_SIZE = 10000
+
+_listener = None
+_queue = None
+_settings = {}
+_stats = {'captured': 0, 'dropped': 0}
+
+
+class _LineFormatter(logging.Formatter):
+    """Kaydın msg alanındaki sözlük -> tek satır JSON (arka plan thread'inde)."""
+
+    def format(self, record):
+        return json.dumps(record.msg, ensure_ascii=False, separators=(',', ':'), default=str)
+
+
+def _start_listener():
+    global _listener
+    handler = logging.handlers.RotatingFileHandler(
+        os.path.join(_settings['directory'], f'traffic-{os.getpid()}.jsonl'),
+        maxBytes=_settings['max_bytes'],
+        backupCount=_settings['backups'],
+        encoding='utf-8',
+        delay=True  # Yalnızca istek karşılayan süreçler (worker'lar) dosya açar
+    )
+    handler.setFormatter(_LineFormatter())
+    _listener = logging.handlers.QueueListener(_queue, handler)
+    _listener.start()
+
+
+def _stop_listener():
+    if _listener is not None:
+        try:
+            _listener.stop()
+        except Exception:
+            pass
+
+
+def _restart_listener_after_fork():
+    # Yeni süreç: yeni kuyruk, yeni thread ve kendi pid'li dosyası
+    global _queue, _listener
+    _queue = queue.Queue(QUEUE_SIZE)
+    _listener = None
+    _start_listener()
+
+
+def capture_info():
+    """Bu süreçte yakalanan / kuyruk dolduğu için atılan kayıt sayıları."""
+    return dict(_stats, enabled=bool(_settings), **({'directory': _settings['directory']} if _settings else {}))
+
+
+def _request_body():
+    if request.content_length and request.content_length > _settings['max_body']:
+        return None
+    if request.is_json:
+        body = request.get_json(silent=True)  # Uç nokta zaten ayrıştırdıysa önbellekten döner
+        if body is not None:
+            return body
+    text = request.get_data(cache=True, as_text=True)
+    return text or None
+
+
+def configure_traffic_capture(app):
+    """
+    TRAFFIC_CAPTURE_DIR verilmişse örnekleme kancalarını bağla.
+
+    Diğer after_request kancalarından (ör. sıkıştırma) önce çağrılmalıdır: Flask kancaları ters
+    sırada çalıştırır, böylece gecikme ve yanıt boyutu istemcinin gördüğü son hali yansıtır.
+    """
+    global _queue
+    directory = os.environ.get('TRAFFIC_CAPTURE_DIR')
+    if not directory:
+        return app
+    if _queue is None:
+        os.makedirs(directory, exist_ok=True)
+        _settings.update(
+            directory=directory,
+            max_bytes=int(os.environ.get('TRAFFIC_CAPTURE_MAX_BYTES', 50 * 1024 * 1024)),
+            backups=int(os.environ.get('TRAFFIC_CAPTURE_BACKUPS', 5)),
+            max_body=int(os.environ.get('TRAFFIC_CAPTURE_MAX_BODY', 65536))
+        )
+        _queue = queue.Queue(QUEUE_SIZE)
+        _start_listener()
+        atexit.register(_stop_listener)
+        if hasattr(os, 'register_at_fork'):
+            os.register_at_fork(after_in_child=_restart_listener_after_fork)
+    app.config.setdefault(
+        'TRAFFIC_CAPTURE_SAMPLE_RATE',
+        max(0.0, min(1.0, float(os.environ.get('TRAFFIC_CAPTURE_SAMPLE_RATE', 0.1))))
+    )
+
+    @app.before_request
+    def _start_capture():
+        if request.path.startswith('/api/') and random.random() < app.config['TRAFFIC_CAPTURE_SAMPLE_RATE']:
+            g.capture_started = time.perf_counter()
+
+    @app.after_request
+    def _capture(response):
+        started = g.get('capture_started')
+        if started is None:
+            return response
+        path = request.full_path
+        record = {
+            't': round(time.time(), 3),
+            'method': request.method,
+            'path': path[:-1] if path.endswith('?') else path,
+            'status': response.status_code,
+            'latency_ms': round((time.perf_counter() - started) * 1000, 2),
+            'response_bytes': response.content_length
+        }
+        body = _request_body()
+        if body is not None:
+            record['body'] = body
+        headers = {name: request.headers[name] for name in CAPTURED_HEADERS if name in request.headers}
+        if headers:
+            record['headers'] = headers
+        try:
+            _queue.put_nowait(logging.makeLogRecord({'msg': record}))
+            _stats['captured'] += 1
+        except queue.Full:
+            _stats['dropped'] += 1
+        return response
+
+    return app
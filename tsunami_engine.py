@@ -0,0 +1,307 @@
+"""
+Tsunami Propagation Engine
+Arrival time and propagation path length over a coarse global bathymetry raster
+
+Okyanus hücrelerinde sığ su dalga hızı c = sqrt(g * h) ile eikonal denklemi
+|∇T| = 1 / c, 8 komşulu ızgara üzerinde vektörel "fast sweeping" yöntemiyle çözülür:
+her turda dört yönde (G→K, K→G, B→D, D→B) satır/sütun bazında numpy güncellemeleri
+yapılır, değişiklik kalmayınca durulur. Kara hücreleri geçilemez; boylam sarmalıdır.
+Her kaynak hücresi için kıyı hücrelerine varış süresi ve yol uzunluğu önbelleğe alınır.
+
+Raster oluşturma (global_land_mask yalnızca oluşturma sırasında gerekir):
+    python tsunami_engine.py build [--resolution 0.5] [--elevation grid.npz] [--output ...]
+
+--elevation verilmezse derinlik, GLOBE kara maskesinden hesaplanan kıyıya uzaklıkla
+şelf-yamaç-abisal profil olarak tahmin edilir. Gerçek bir yükseklik ızgarası (ör. ETOPO,
+'lat', 'lon', 'elevation' dizileriyle .npz) verilirse blok ortalaması kullanılır.
+"""
+
+import argparse
+import os
+import time
+from functools import lru_cache
+
+import numpy as np
+
+from geodesy import haversine_km, wrap_lng
+
+DEFAULT_RASTER_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'bathymetry_raster.npz')
+
+GRAVITY_MS2 = 9.81
+MIN_DEPTH_M = 10.0               # Kıyı hücrelerinde sıfıra bölünmeyi önle
+OCEAN_FRACTION_THRESHOLD = 50    # Hücrenin en az %50'si su ise okyanus hücresi
+MAX_TRAVEL_HOURS = 24.0
+SOURCE_SEARCH_CELLS = 2          # Kara hücresine düşen kaynak için en yakın okyanus hücresi arama yarıçapı
+
+# Kara maskesinden derinlik tahmini: kıyıda şelf, açıkta abisal düzlük
+SHELF_DEPTH_M = 100.0
+ABYSSAL_DEPTH_M = 4000.0
+SLOPE_SCALE_KM = 150.0
+
+# 8 komşu (satır, sütun) ofsetleri
+DIRECTIONS = ((-1, -1), (-1, 0), (-1, 1), (0, -1), (0, 1), (1, -1), (1, 0), (1, 1))
+
+
+def _shift(array, di, dj, fill=np.inf):
+    """out[i, j] = array[i + di, j + dj]; boylam sarmal, enlem sınırında fill."""
+    out = np.full_like(array, fill)
+    if di > 0:
+        out[:-di] = array[di:]
+    elif di < 0:
+        out[-di:] = array[:di]
+    else:
+        out[:] = array
+    return np.roll(out, -dj, axis=1) if dj else out
+
+
+def _edge_lengths_km(lat_deg, lng_step_deg, lat_step_deg):
+    """Her yön için hücre merkezleri arası büyük daire mesafesi (satır vektörü, km)."""
+    return {
+        (di, dj): haversine_km(lat_deg, 0.0, lat_deg + di * lat_step_deg, dj * lng_step_deg)
+        for di, dj in DIRECTIONS
+    }
+
+
+def sweep_solve(times, distances, edge_times, edge_lengths, max_rounds=64):
+    """
+    Vektörel fast sweeping: times/distances yerinde güncellenir.
+
+    edge_times[(di, dj)][i, j]: (i, j) ile (i+di, j+dj) arasındaki kenarın süresi (s, geçilemezse inf)
+    edge_lengths[(di, dj)][i]: aynı kenarın uzunluğu (km)
+    """
+    nlat, _ = times.shape
+    for _ in range(max_rounds):
+        changed = False
+
+        # Satır taramaları: önceki satırdaki üç komşudan güncelle
+        for rows, di in ((range(1, nlat), -1), (range(nlat - 2, -1, -1), 1)):
+            for i in rows:
+                prev_t = times[i + di]
+                prev_d = distances[i + di]
+                best_t = times[i]
+                best_d = distances[i]
+                for dj in (-1, 0, 1):
+                    cand_t = (np.roll(prev_t, -dj) if dj else prev_t) + edge_times[(di, dj)][i]
+                    better = cand_t < best_t
+                    if better.any():
+                        cand_d = (np.roll(prev_d, -dj) if dj else prev_d) + edge_lengths[(di, dj)][i]
+                        best_t = np.where(better, cand_t, best_t)
+                        best_d = np.where(better, cand_d, best_d)
+                        changed = True
+                times[i] = best_t
+                distances[i] = best_d
+
+        # Sütun taramaları: önceki sütundaki üç komşudan güncelle (boylam sarmal)
+        ncols = times.shape[1]
+        for cols, dj in ((range(ncols), -1), (range(ncols - 1, -1, -1), 1)):
+            for j in cols:
+                prev = (j + dj) % ncols
+                prev_t = times[:, prev]
+                prev_d = distances[:, prev]
+                best_t = times[:, j]
+                best_d = distances[:, j]
+                for di in (-1, 0, 1):
+                    shifted_t = _shift(prev_t[:, None], di, 0)[:, 0]
+                    cand_t = shifted_t + edge_times[(di, dj)][:, j]
+                    better = cand_t < best_t
+                    if better.any():
+                        cand_d = _shift(prev_d[:, None], di, 0)[:, 0] + edge_lengths[(di, dj)]
+                        best_t = np.where(better, cand_t, best_t)
+                        best_d = np.where(better, cand_d, best_d)
+                        changed = True
+                times[:, j] = best_t
+                distances[:, j] = best_d
+
+        if not changed:
+            break
+    return times, distances
+
+
+class TsunamiEngine:
+    """Bathimetri rasteri üzerinde kaynak noktası başına önbellekli varış süresi alanı."""
+
+    def __init__(self, lat, lng, ocean_fraction, depth_m, field_cache_size=64):
+        self.lat = np.asarray(lat, dtype=float)
+        self.lng = np.asarray(lng, dtype=float)
+        self.lat_step = float(self.lat[1] - self.lat[0])
+        self.lng_step = float(self.lng[1] - self.lng[0])
+        self.ocean = np.asarray(ocean_fraction) >= OCEAN_FRACTION_THRESHOLD
+        self.depth_m = np.where(self.ocean, np.maximum(np.asarray(depth_m, dtype=float), MIN_DEPTH_M), 0.0)
+
+        slowness = np.where(self.ocean, 1.0 / np.sqrt(GRAVITY_MS2 * np.maximum(self.depth_m, MIN_DEPTH_M)), np.inf)
+        self.edge_lengths = _edge_lengths_km(self.lat, self.lng_step, self.lat_step)
+        self.edge_times = {
+            d: self.edge_lengths[d][:, None] * 1000 * 0.5 * (slowness + _shift(slowness, *d))
+            for d in DIRECTIONS
+        }
+
+        # Kıyı hücreleri: en az bir kara komşusu olan okyanus hücreleri
+        land_neighbour = np.zeros_like(self.ocean)
+        for d in DIRECTIONS:
+            land_neighbour |= ~_shift(self.ocean, *d, fill=True)
+        coast = self.ocean & land_neighbour
+        self.coast_index = np.flatnonzero(coast)
+        rows, cols = np.divmod(self.coast_index, self.ocean.shape[1])
+        self.coast_lat = self.lat[rows]
+        self.coast_lng = self.lng[cols]
+
+        self._travel_field = lru_cache(maxsize=field_cache_size)(self._solve)
+
+    @classmethod
+    def load(cls, path=DEFAULT_RASTER_PATH):
+        with np.load(path, allow_pickle=False) as data:
+            return cls(data['lat'], data['lng'], data['ocean_fraction'], data['depth_m'])
+
+    def cell_of(self, lat, lng):
+        lng = float(wrap_lng(lng))
+        i = int(np.clip(round((lat - self.lat[0]) / self.lat_step), 0, len(self.lat) - 1))
+        j = int(round((lng - self.lng[0]) / self.lng_step)) % len(self.lng)
+        return i, j
+
+    def source_cell(self, lat, lng):
+        """Kaynağa en yakın okyanus hücresi (kıyıya çok yakın çarpmalar için); yoksa None."""
+        i, j = self.cell_of(lat, lng)
+        if self.ocean[i, j]:
+            return i, j
+        best = None
+        for di in range(-SOURCE_SEARCH_CELLS, SOURCE_SEARCH_CELLS + 1):
+            for dj in range(-SOURCE_SEARCH_CELLS, SOURCE_SEARCH_CELLS + 1):
+                ni, nj = i + di, (j + dj) % len(self.lng)
+                if 0 <= ni < len(self.lat) and self.ocean[ni, nj]:
+                    score = di * di + dj * dj
+                    if best is None or score < best[0]:
+                        best = (score, ni, nj)
+        return None if best is None else best[1:]
+
+    def _solve(self, i, j):
+        times = np.full(self.ocean.shape, np.inf)
+        distances = np.full(self.ocean.shape, np.inf)
+        times[i, j] = 0.0
+        distances[i, j] = 0.0
+        sweep_solve(times, distances, self.edge_times, self.edge_lengths)
+
+        arrival_s = times.ravel()[self.coast_index]
+        path_km = distances.ravel()[self.coast_index]
+        reached = arrival_s <= MAX_TRAVEL_HOURS * 3600
+        result = (
+            np.flatnonzero(reached),
+            arrival_s[reached].astype(np.float32),
+            path_km[reached].astype(np.float32)
+        )
+        for array in result:
+            array.setflags(write=False)
+        return result
+
+    def propagate(self, lat, lng):
+        """
+        Kaynaktan kıyı hücrelerine yayılım.
+
+        Returns:
+            None (kaynak karada) veya dict: source_depth_m, coast_lat, coast_lng, coast_cell (düz raster indeksi),
+            arrival_s, path_km (yalnızca MAX_TRAVEL_HOURS içinde ulaşılan kıyı hücreleri)
+        """
+        cell = self.source_cell(lat, lng)
+        if cell is None:
+            return None
+        coast, arrival_s, path_km = self._travel_field(*cell)
+        return {
+            'source_depth_m': float(self.depth_m[cell]),
+            'coast_lat': self.coast_lat[coast],
+            'coast_lng': self.coast_lng[coast],
+            'coast_cell': self.coast_index[coast],
+            'arrival_s': arrival_s,
+            'path_km': path_km
+        }
+
+    def cache_info(self):
+        return self._travel_field.cache_info()
+
+
+# ============================================================================
+# RASTER OLUŞTURMA
+# ============================================================================
+
+def land_mask_ocean_fraction(resolution_deg):
+    """GLOBE kara maskesini (1/120°) blok ortalamasıyla kaba rastere indir; satırlar güneyden kuzeye."""
+    from global_land_mask import globe  # Sadece oluşturma bağımlılığı
+
+    mask, mask_lat = globe._mask, globe._lat
+    block = int(round(resolution_deg / abs(mask_lat[1] - mask_lat[0])))
+    nlat, nlng = mask.shape[0] // block, mask.shape[1] // block
+    fraction = np.empty((nlat, nlng), dtype=float)
+    for r in range(nlat):
+        band = mask[r * block:(r + 1) * block]
+        fraction[r] = band.reshape(block, nlng, block).mean(axis=(0, 2))
+    if mask_lat[0] > mask_lat[-1]:
+        fraction = fraction[::-1]
+    return fraction * 100
+
+
+def _block_mean(grid, lat, lon, resolution_deg):
+    """Düzenli bir enlem/boylam ızgarasını hedef çözünürlüğe blok ortalaması ile indir."""
+    if lat[0] > lat[-1]:
+        grid, lat = grid[::-1], lat[::-1]
+    if lon[0] > lon[-1]:
+        grid, lon = grid[:, ::-1], lon[::-1]
+    block = int(round(resolution_deg / abs(lat[1] - lat[0])))
+    nlat, nlng = grid.shape[0] // block, grid.shape[1] // block
+    trimmed = grid[:nlat * block, :nlng * block]
+    return trimmed.reshape(nlat, block, nlng, block)
+
+
+def _shelf_model_depth(ocean_fraction, lat, lng_step, lat_step):
+    """Kıyıya uzaklıktan (km) şelf-yamaç-abisal derinlik profili."""
+    land = ocean_fraction < OCEAN_FRACTION_THRESHOLD
+    lengths = _edge_lengths_km(lat, lng_step, lat_step)
+    unit_times = {d: np.broadcast_to(lengths[d][:, None], land.shape) for d in DIRECTIONS}
+    distance_km = np.where(land, 0.0, np.inf)
+    sweep_solve(distance_km, np.zeros_like(distance_km), unit_times, lengths)
+    distance_km = np.where(np.isfinite(distance_km), distance_km, 20000.0)
+    return SHELF_DEPTH_M + (ABYSSAL_DEPTH_M - SHELF_DEPTH_M) * (1 - np.exp(-distance_km / SLOPE_SCALE_KM))
+
+
+def build_raster(resolution_deg=0.5, elevation_path=None, output_path=DEFAULT_RASTER_PATH):
+    nlat, nlng = int(round(180 / resolution_deg)), int(round(360 / resolution_deg))
+    lat = -90 + resolution_deg * (np.arange(nlat) + 0.5)
+    lng = -180 + resolution_deg * (np.arange(nlng) + 0.5)
+
+    if elevation_path:
+        with np.load(elevation_path, allow_pickle=False) as data:
+            blocks = _block_mean(data['elevation'].astype(float), data['lat'], data['lon'], resolution_deg)
+        water = blocks < 0
+        ocean_fraction = water.mean(axis=(1, 3)) * 100
+        depth_sum = np.where(water, -blocks, 0).sum(axis=(1, 3))
+        depth_m = depth_sum / np.maximum(water.sum(axis=(1, 3)), 1)
+        depth_source = 'elevation grid'
+    else:
+        ocean_fraction = land_mask_ocean_fraction(resolution_deg)
+        depth_m = _shelf_model_depth(ocean_fraction, lat, resolution_deg, resolution_deg)
+        depth_source = 'GLOBE land mask + shelf/slope/abyssal depth profile'
+
+    np.savez_compressed(
+        output_path,
+        lat=lat, lng=lng,
+        ocean_fraction=np.round(ocean_fraction).astype(np.uint8),
+        depth_m=np.clip(np.round(depth_m), 0, 11000).astype(np.int16),
+        resolution_deg=np.array(resolution_deg),
+        depth_source=np.array(depth_source)
+    )
+    return output_path
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Tsunami bathymetry raster builder')
+    parser.add_argument('command', choices=['build'])
+    parser.add_argument('--resolution', type=float, default=0.5, help='Cell size in degrees')
+    parser.add_argument('--elevation', default=None, help='Optional .npz with lat, lon, elevation (m)')
+    parser.add_argument('--output', default=DEFAULT_RASTER_PATH)
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    path = build_raster(args.resolution, args.elevation, args.output)
+    print(f"Bathymetry raster written to {path} ({os.path.getsize(path) / 1024:.1f} KiB, "
+          f"{time.perf_counter() - started:.0f} s)")
+
+
+if __name__ == '__main__':
+    main()
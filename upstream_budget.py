@@ -0,0 +1,221 @@
+"""
+Upstream request budget for Asteroid Impact Visualizer
+Token buckets for the NASA NeoWs and GeoNames quotas, shared across workers
+
+NASA_API_KEY varsayılanı DEMO_KEY (IP başına saatte 30, günde 50 istek), GEONAMES_USERNAME
+varsayılanı 'demo'dur (herkesin paylaştığı, çoğu zaman tükenmiş bir hesap). Kota aşıldıktan
+sonra her istek önce dış servisin hatasını veya zaman aşımını bekler, sonra yedek veriye
+döner. Bütçe tükendiğinde çağrı hiç yapılmaz: fetch BudgetExhausted fırlatır ve çağıran
+doğrudan önbellek/yedek veriye geçer.
+
+Her dış servis için saatlik ve (varsa) günlük bir token kovası tutulur. Kovalar sürekli
+dolar (kapasite / dönem hızıyla). gunicorn worker'ları aynı API anahtarını paylaştığı için
+kova durumu, kilitli (fcntl.flock) küçük bir JSON dosyasında worker'lar arasında ortaktır.
+Servisin bildirdiği kalan hak (X-RateLimit-Remaining) ve kota hataları (HTTP 429,
+GeoNames 18/19/20 durum kodları) kovayı buna göre azaltır veya boşaltır.
+
+Ortam değişkenleri:
+    NASA_QUOTA_PER_HOUR / NASA_QUOTA_PER_DAY            (varsayılan: DEMO_KEY ile 30 / 50,
+                                                         kendi anahtarla 1000 / sınırsız)
+    GEONAMES_QUOTA_PER_HOUR / GEONAMES_QUOTA_PER_DAY    (varsayılan: 'demo' ile 20 / 100,
+                                                         kendi hesapla 1000 / 10000)
+    UPSTREAM_BUDGET_DIR   Ortak kova durumu dizini (varsayılan: <tmp>/asteroid-impact-upstream-budget);
+                          'off' her worker'a ayrı, bellek içi kovalar verir
+    0 değeri ilgili sınırı kapatır.
+"""
+
+import json
+import os
+import tempfile
+import threading
+import time
+
+try:
+    import fcntl
+except ImportError:  # Windows - worker başına bellek içi kovalar
+    fcntl = None
+
+HOUR_S = 3600
+DAY_S = 86400
+RATE_LIMIT_REMAINING_HEADER = 'X-RateLimit-Remaining'
+GEONAMES_LIMIT_CODES = {18, 19, 20}   # Günlük / saatlik / haftalık kredi sınırı aşıldı
+GEONAMES_NO_RESULT_CODE = 15         # Hata değil: sorgu sonuç döndürmedi
+
+
+class BudgetExhausted(RuntimeError):
+    """Dış servis bütçesi tükendi; çağrı yapılmadı."""
+
+    def __init__(self, upstream):
+        super().__init__(f'{upstream} request budget exhausted')
+        self.upstream = upstream
+
+
+class UpstreamQuotaError(RuntimeError):
+    """Dış servis yanıt gövdesinde hata bildirdi (GeoNames durum kodları; 18-20 kota aşımı)."""
+
+
+def _default_directory():
+    configured = os.environ.get('UPSTREAM_BUDGET_DIR', '')
+    if configured.lower() == 'off' or fcntl is None:
+        return None
+    return configured or os.path.join(tempfile.gettempdir(), 'asteroid-impact-upstream-budget')
+
+
+class TokenBucket:
+    """Sürekli dolan token kovası; durum isteğe bağlı olarak kilitli bir dosyada tutulur."""
+
+    def __init__(self, name, capacity, period_s, state_path=None):
+        self.name = name
+        self.capacity = float(capacity)
+        self.period_s = period_s
+        self.rate = self.capacity / period_s
+        self.state_path = state_path
+        self._tokens = self.capacity
+        self._updated = time.time()
+        self._lock = threading.Lock()
+
+    def _refilled(self, tokens, updated, now):
+        return min(self.capacity, tokens + max(0.0, now - updated) * self.rate)
+
+    def _update(self, change):
+        """change(tokens) -> (yeni_tokens, sonuç); okuma-değiştirme-yazma atomiktir."""
+        now = time.time()
+        with self._lock:
+            if self.state_path is None:
+                self._tokens, result = change(self._refilled(self._tokens, self._updated, now))
+                self._updated = now
+                return result
+            with open(self.state_path, 'a+', encoding='utf-8') as f:
+                fcntl.flock(f, fcntl.LOCK_EX)
+                try:
+                    f.seek(0)
+                    try:
+                        state = json.loads(f.read() or '{}')
+                    except ValueError:
+                        state = {}
+                    tokens = self._refilled(state.get('tokens', self.capacity), state.get('updated', now), now)
+                    tokens, result = change(tokens)
+                    f.seek(0)
+                    f.truncate()
+                    f.write(json.dumps({'tokens': tokens, 'updated': now}))
+                    f.flush()
+                    return result
+                finally:
+                    fcntl.flock(f, fcntl.LOCK_UN)
+
+    def try_acquire(self):
+        return self._update(lambda tokens: (tokens - 1, True) if tokens >= 1 else (tokens, False))
+
+    def refund(self):
+        self._update(lambda tokens: (min(self.capacity, tokens + 1), None))
+
+    def limit(self, remaining):
+        """Servisin bildirdiği kalan hakkın üstüne çıkma."""
+        self._update(lambda tokens: (min(tokens, float(remaining)), None))
+
+    def drain(self):
+        self._update(lambda tokens: (0.0, None))
+
+    def remaining(self):
+        return self._update(lambda tokens: (tokens, tokens))
+
+
+class UpstreamBudget:
+    """Dış servis adı -> kovalar; çağrı öncesi izin, yanıt sonrası gözlem ve rapor."""
+
+    def __init__(self, directory=None):
+        self.directory = directory
+        self.buckets = {}
+        self._counters = {}
+        self._lock = threading.Lock()
+        if self.directory:
+            try:
+                os.makedirs(self.directory, exist_ok=True)
+            except OSError:
+                self.directory = None
+
+    def register(self, upstream, per_hour, per_day=0):
+        buckets = []
+        for label, capacity, period_s in (('hourly', per_hour, HOUR_S), ('daily', per_day, DAY_S)):
+            if capacity > 0:
+                path = os.path.join(self.directory, f'{upstream}-{label}.json') if self.directory else None
+                buckets.append(TokenBucket(label, capacity, period_s, path))
+        self.buckets[upstream] = buckets
+        self._counters[upstream] = {'allowed': 0, 'skipped': 0, 'quota_errors': 0}
+
+    def try_acquire(self, upstream):
+        """Tüm kovalarda hak varsa bir token harca ve True döndür."""
+        taken = []
+        for bucket in self.buckets.get(upstream, ()):
+            if not bucket.try_acquire():
+                for previous in taken:
+                    previous.refund()
+                self._count(upstream, 'skipped')
+                return False
+            taken.append(bucket)
+        self._count(upstream, 'allowed')
+        return True
+
+    def acquire(self, upstream):
+        if not self.try_acquire(upstream):
+            raise BudgetExhausted(upstream)
+
+    def observe(self, upstream, status_code, headers=None):
+        """Yanıttan kota bilgisini al: 429 kovaları boşaltır, kalan hak başlığı saatlik kovayı sınırlar."""
+        if status_code == 429:
+            self.exhausted(upstream)
+            return
+        remaining = (headers or {}).get(RATE_LIMIT_REMAINING_HEADER)
+        if remaining is not None:
+            try:
+                remaining = float(remaining)
+            except ValueError:
+                return
+            for bucket in self.buckets.get(upstream, ())[:1]:
+                bucket.limit(remaining)
+
+    def exhausted(self, upstream):
+        """Servis kotanın aştığını bildirdi: kovalar kendiliğinden dolana kadar çağrı yapılmaz."""
+        self._count(upstream, 'quota_errors')
+        for bucket in self.buckets.get(upstream, ()):
+            bucket.drain()
+
+    def _count(self, upstream, counter):
+        with self._lock:
+            self._counters[upstream][counter] += 1
+
+    def report(self):
+        """Her servis için kalan hak, kapasite ve bu worker'daki sayaçlar."""
+        report = {}
+        for upstream, buckets in self.buckets.items():
+            entry = {
+                bucket.name: {'capacity': int(bucket.capacity), 'remaining': int(bucket.remaining())}
+                for bucket in buckets
+            }
+            entry['available'] = all(values['remaining'] >= 1 for values in entry.values())
+            with self._lock:
+                entry.update(self._counters[upstream])
+            report[upstream] = entry
+        return report
+
+
+def _quota(name, default):
+    return int(os.environ.get(name, default))
+
+
+def configure_budget(nasa_api_key, geonames_username, directory=None):
+    """Varsayılan kotalarla NASA ve GeoNames kovalarını oluştur."""
+    budget = UpstreamBudget(_default_directory() if directory is None else directory)
+    demo_nasa = nasa_api_key == 'DEMO_KEY'
+    demo_geonames = geonames_username == 'demo'
+    budget.register(
+        'nasa',
+        _quota('NASA_QUOTA_PER_HOUR', 30 if demo_nasa else 1000),
+        _quota('NASA_QUOTA_PER_DAY', 50 if demo_nasa else 0)
+    )
+    budget.register(
+        'geonames',
+        _quota('GEONAMES_QUOTA_PER_HOUR', 20 if demo_geonames else 1000),
+        _quota('GEONAMES_QUOTA_PER_DAY', 100 if demo_geonames else 10000)
+    )
+    return budget
@@ -0,0 +1,339 @@
+"""
+Validation and performance regression corpus
+Historical impact events plus a synthetic large comet, with expected output ranges and runtime budgets
+
+Her olay için atmosferik giriş simülatörü (simulate_atmospheric_entry_advanced) ve
+Rumpf değerlendirmesi (calculate_advanced_impact_assessment) çalıştırılır:
+
+    expected   Modelin referans çıktı aralıkları. Dışına çıkılması fizik kayması sayılır
+               (bir model değişikliği bilerek yapıldıysa aralıklar aynı commit'te güncellenir).
+    observed   Literatürdeki gözlem aralıkları. Model-gözlem farkı raporlanır; yalnızca
+               --require-observed ile başarısızlık sayılır (bazı olaylarda model bilinen
+               şekilde sapar, ör. Çelyabinsk infilak irtifası).
+    budget_ms  Simülatör ve soğuk değerlendirme (aşama önbellekleri boş) medyan süre bütçesi.
+
+Kara/okyanus tespiti ağdan bağımsız olsun diye GeoNames çağrıları süreç içinde başlatılan
+fake_upstreams sunucusuna yönlendirilir (bathimetri rasteri); sonuçlar deterministiktir.
+
+Kullanım:
+    python validation_corpus.py [--runs 5] [--events tunguska,chicxulub] [--budget-scale 2]
+                                [--require-observed] [--json]
+
+Bir aralık veya bütçe aşılırsa çıkış kodu 1 olur.
+"""
+
+import argparse
+import json
+import logging
+import os
+import statistics
+import sys
+import threading
+import time
+
+from data import CHICXULUB_IMPACTOR
+from data.catalog import DENSITY_KG_M3
+
+SIMULATOR_DT = 0.01
+GRID_RESOLUTION_KM = 5
+
+EVENTS = {
+    'chelyabinsk': {
+        'name': 'Chelyabinsk superbolide (2013)',
+        'inputs': {
+            'diameter_m': 19, 'density_kg_m3': 3300, 'velocity_ms': 19000, 'angle_deg': 18,
+            'material_type': 'chondrite', 'impact_lat': 54.8, 'impact_lng': 61.1
+        },
+        'expected': {
+            'simulator': {
+                'airburst_altitude_km': (10.0, 12.0),
+                'tnt_equivalent_kilotons': (385, 425),
+                'fragmented': True
+            },
+            'assessment': {
+                'impact_type': 'Airburst',
+                'kinetic_energy_mt': (0.50, 0.52),
+                'airburst_altitude_km': (11.5, 13.8),
+                'seismic_magnitude': (6.9, 7.15),
+                'total_casualties': (16600, 22500)
+            }
+        },
+        'observed': {
+            'simulator.airburst_altitude_km': (27, 30),
+            'simulator.tnt_equivalent_kilotons': (400, 500)
+        },
+        'references': ['Brown et al. (2013)', 'Popova et al. (2013)', 'Borovička et al. (2013)'],
+        'budget_ms': {'simulator': 100, 'assessment': 60}
+    },
+    'tunguska': {
+        'name': 'Tunguska airburst (1908)',
+        'inputs': {
+            'diameter_m': 60, 'density_kg_m3': 3000, 'velocity_ms': 15000, 'angle_deg': 45,
+            'material_type': 'chondrite', 'impact_lat': 60.886, 'impact_lng': 101.894
+        },
+        'expected': {
+            'simulator': {
+                'airburst_altitude_km': (1.2, 1.6),
+                'tnt_equivalent_kilotons': (4400, 4900),
+                'fragmented': True
+            },
+            'assessment': {
+                'impact_type': 'Airburst',
+                'kinetic_energy_mt': (9.0, 9.25),
+                'airburst_altitude_km': (1.35, 1.65),
+                'seismic_magnitude': (7.75, 7.95),
+                'total_casualties': (23800, 32200)
+            }
+        },
+        'observed': {
+            'simulator.airburst_altitude_km': (5, 10),
+            'simulator.tnt_equivalent_kilotons': (3000, 15000)
+        },
+        'references': ['Chyba et al. (1993)', 'Boslough & Crawford (2008)'],
+        'budget_ms': {'simulator': 60, 'assessment': 60}
+    },
+    'kamchatka_2018': {
+        'name': 'Bering Sea / Kamchatka fireball (2018-12-18)',
+        'inputs': {
+            'diameter_m': 10, 'density_kg_m3': 3000, 'velocity_ms': 32000, 'angle_deg': 68,
+            'material_type': 'chondrite', 'impact_lat': 56.9, 'impact_lng': 172.4
+        },
+        'expected': {
+            'simulator': {
+                'airburst_altitude_km': (23.8, 26.3),
+                'tnt_equivalent_kilotons': (175, 193),
+                'fragmented': True
+            },
+            'assessment': {
+                'impact_type': 'Airburst',
+                'kinetic_energy_mt': (0.189, 0.196),
+                'airburst_altitude_km': (18.2, 22.3),
+                'seismic_magnitude': (6.64, 6.84),
+                'total_casualties': (16400, 22300)
+            }
+        },
+        'observed': {
+            'simulator.airburst_altitude_km': (24, 27),
+            'simulator.tnt_equivalent_kilotons': (150, 200)
+        },
+        'references': ['CNEOS Fireball Database (2018-12-18 23:48:20 UT)'],
+        'budget_ms': {'simulator': 30, 'assessment': 60}
+    },
+    'meteor_crater': {
+        'name': 'Meteor Crater / Barringer (~50 ka)',
+        'inputs': {
+            'diameter_m': 50, 'density_kg_m3': 7800, 'velocity_ms': 12800, 'angle_deg': 45,
+            'material_type': 'iron', 'impact_lat': 35.027, 'impact_lng': -111.022
+        },
+        'expected': {
+            'simulator': {
+                'airburst_altitude_km': (0.0, 0.5),
+                'tnt_equivalent_kilotons': (1680, 1860),
+                'fragmented': False
+            },
+            'assessment': {
+                'impact_type': 'Surface Impact',
+                'kinetic_energy_mt': (9.8, 10.2),
+                'crater_diameter_m': (970, 1180),
+                'seismic_magnitude': (7.78, 7.98),
+                'total_casualties': (790000, 1070000)
+            }
+        },
+        'observed': {
+            'assessment.crater_diameter_m': (1100, 1300)
+        },
+        'references': ['Melosh & Collins (2005)', 'Kring (2007)'],
+        'budget_ms': {'simulator': 60, 'assessment': 60}
+    },
+    'large_comet': {
+        'name': 'Large comet, 2 km at 50 km/s (hypothetical)',
+        'inputs': {
+            'diameter_m': 2000, 'density_kg_m3': DENSITY_KG_M3['cometary'], 'velocity_ms': 50000,
+            'angle_deg': 45, 'material_type': 'cometary', 'impact_lat': 39.0, 'impact_lng': 33.0
+        },
+        'expected': {
+            'simulator': {
+                'airburst_altitude_km': (8.5, 10.5),
+                'tnt_equivalent_kilotons': (1.18e9, 1.31e9),
+                'fragmented': True
+            },
+            'assessment': {
+                # Enerjinin ~%97'si atmosferde, ama 8 km'de (4 çap) - krater, sismik ve ejecta dahil
+                'impact_type': 'Surface Impact',
+                'kinetic_energy_mt': (1.24e6, 1.26e6),
+                'crater_diameter_m': (70400, 86000),
+                'seismic_magnitude': (11.18, 11.38),
+                'total_casualties': (8.33e7, 1.127e8)
+            }
+        },
+        'observed': {},
+        'references': ['Collins et al. (2005)'],
+        'budget_ms': {'simulator': 60, 'assessment': 300}
+    },
+    'chicxulub': {
+        'name': 'Chicxulub impactor (66 Ma)',
+        'inputs': {
+            'diameter_m': CHICXULUB_IMPACTOR['diameter_m'], 'density_kg_m3': DENSITY_KG_M3['chondrite'],
+            'velocity_ms': CHICXULUB_IMPACTOR['velocity_ms'], 'angle_deg': 60,
+            'material_type': 'chondrite', 'impact_lat': 21.3, 'impact_lng': -89.5
+        },
+        'expected': {
+            'simulator': {
+                'airburst_altitude_km': (0.0, 0.5),
+                'tnt_equivalent_kilotons': (4.65e8, 5.14e8),
+                'fragmented': True
+            },
+            'assessment': {
+                'impact_type': 'Surface Impact',
+                'kinetic_energy_mt': (7.4e7, 7.6e7),
+                'crater_diameter_m': (250900, 306700),
+                'seismic_magnitude': (12.36, 12.56),
+                'total_casualties': (5.1e7, 6.9e7)
+            }
+        },
+        'observed': {
+            'assessment.crater_diameter_m': (150000, 200000),
+            'assessment.kinetic_energy_mt': (2.4e7, 1.2e8)
+        },
+        'references': ['Hildebrand et al. (1991)', 'Morgan et al. (2016)', 'Collins et al. (2020)'],
+        'budget_ms': {'simulator': 40, 'assessment': 300}
+    }
+}
+
+
+def start_offline_upstreams():
+    """fake_upstreams'i süreç içinde başlat ve uygulamayı ona yönlendir (app import edilmeden önce)."""
+    from werkzeug.serving import make_server
+    import fake_upstreams
+
+    logging.getLogger('werkzeug').setLevel(logging.ERROR)
+    server = make_server('127.0.0.1', 0, fake_upstreams.create_app(seed=0), threaded=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    os.environ.update(
+        GEONAMES_API_URL=f'http://127.0.0.1:{server.server_port}',
+        NASA_NEO_API_URL=f'http://127.0.0.1:{server.server_port}/neo/rest/v1',
+        GEONAMES_QUOTA_PER_HOUR='0', GEONAMES_QUOTA_PER_DAY='0',
+        UPSTREAM_BUDGET_DIR='off', SINGLE_FLIGHT_DIR='off'
+    )
+    os.environ.setdefault('LOG_LEVEL', 'WARNING')
+    return server
+
+
+def outputs_of(app, inputs):
+    """Simülatör ve değerlendirme çıktıları ile süreleri (ms)."""
+    started = time.perf_counter()
+    entry = app.simulate_atmospheric_entry_advanced(
+        inputs['diameter_m'], inputs['velocity_ms'], inputs['angle_deg'], inputs['material_type'],
+        dt=SIMULATOR_DT
+    )
+    simulator_ms = (time.perf_counter() - started) * 1000
+
+    app.clear_assessment_caches()
+    started = time.perf_counter()
+    assessment = app.calculate_advanced_impact_assessment(
+        inputs['diameter_m'], inputs['density_kg_m3'], inputs['velocity_ms'], inputs['angle_deg'],
+        inputs['impact_lat'], inputs['impact_lng'], grid_resolution_km=GRID_RESOLUTION_KM
+    )
+    assessment_ms = (time.perf_counter() - started) * 1000
+
+    outputs = {
+        'simulator': dict(entry['key_results']),
+        'assessment': dict(
+            assessment['parameters'],
+            impact_type=assessment['impact_type'],
+            kinetic_energy_mt=assessment['kinetic_energy_mt'],
+            total_casualties=assessment['total_casualties']
+        )
+    }
+    return outputs, {'simulator': simulator_ms, 'assessment': assessment_ms}
+
+
+def within(value, expected):
+    if isinstance(expected, tuple):
+        low, high = expected
+        return value is not None and low <= value <= high
+    return value == expected
+
+
+def run_event(app, key, event, runs, budget_scale):
+    timings = {'simulator': [], 'assessment': []}
+    for _ in range(runs):
+        outputs, elapsed = outputs_of(app, event['inputs'])
+        for part, ms in elapsed.items():
+            timings[part].append(ms)
+
+    checks = []
+    for part, metrics in event['expected'].items():
+        for metric, expected in metrics.items():
+            value = outputs[part].get(metric)
+            checks.append({'check': f'{part}.{metric}', 'value': value, 'expected': expected, 'ok': within(value, expected)})
+    for part, samples in timings.items():
+        median_ms = statistics.median(samples)
+        budget = event['budget_ms'][part] * budget_scale
+        checks.append({'check': f'{part}.runtime_ms', 'value': round(median_ms, 2), 'expected': (0, budget), 'ok': median_ms <= budget})
+
+    observed = []
+    for name, expected in event['observed'].items():
+        part, metric = name.split('.', 1)
+        value = outputs[part].get(metric)
+        observed.append({'check': name, 'value': value, 'expected': expected, 'ok': within(value, expected)})
+    return {'event': key, 'name': event['name'], 'checks': checks, 'observed': observed}
+
+
+def _format(value):
+    if isinstance(value, float):
+        return f'{value:.4g}'
+    return str(value)
+
+
+def print_report(reports):
+    for report in reports:
+        print(f"\n{report['name']} [{report['event']}]")
+        for label, rows in (('', report['checks']), ('observed ', report['observed'])):
+            for row in rows:
+                expected = row['expected']
+                expected = f'{_format(expected[0])} .. {_format(expected[1])}' if isinstance(expected, tuple) else _format(expected)
+                status = 'ok' if row['ok'] else 'FAIL' if not label else 'off'
+                print(f"  {status:>4}  {label}{row['check']:<40} {_format(row['value']):>12}   ({expected})")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Validation and performance regression corpus')
+    parser.add_argument('--runs', type=int, default=5, help='Süre medyanı için tekrar sayısı')
+    parser.add_argument('--events', default=None, help='Virgülle olay listesi (varsayılan: tümü)')
+    parser.add_argument('--budget-scale', type=float,
+                        default=float(os.environ.get('VALIDATION_BUDGET_SCALE', 1.0)),
+                        help='Süre bütçesi çarpanı (yavaş makineler için)')
+    parser.add_argument('--require-observed', action='store_true', help='Gözlem aralıkları dışı da başarısızlık')
+    parser.add_argument('--json', action='store_true')
+    args = parser.parse_args()
+
+    selected = args.events.split(',') if args.events else list(EVENTS)
+    unknown = [key for key in selected if key not in EVENTS]
+    if unknown:
+        parser.error(f"Bilinmeyen olay: {', '.join(unknown)} (geçerli: {', '.join(EVENTS)})")
+
+    start_offline_upstreams()
+    import app
+    app.warm_up()  # Tembel tablolar/rasterler ölçüme karışmasın
+
+    reports = [run_event(app, key, EVENTS[key], args.runs, args.budget_scale) for key in selected]
+    failed = [
+        f"{report['event']}: {row['check']}"
+        for report in reports
+        for row in report['checks'] + (report['observed'] if args.require_observed else [])
+        if not row['ok']
+    ]
+
+    if args.json:
+        print(json.dumps({'reports': reports, 'failed': failed}, indent=2, default=str))
+    else:
+        print_report(reports)
+        print(f"\n{len(reports)} olay, {len(failed)} başarısız kontrol")
+    for name in failed:
+        print(f'FAIL: {name}', file=sys.stderr)
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())